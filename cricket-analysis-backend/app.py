@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
@@ -6,7 +6,12 @@ import pymysql
 
 # Import Models (මේ නම් models.py එකේ තියෙන්න ඕනේ)
 from models import db, ODIPerformance, T20Performance, TestPerformance, BestXIPlayer
-import data_loader
+import player_aggregates
+import bulk_import
+import query_plans
+import startup
+import metrics
+from config import Config
 
 # Import Blueprints
 from routes.home import home_bp
@@ -14,6 +19,9 @@ from routes.batting import batting_bp
 from routes.bowling import bowling_bp
 from routes.dataset import dataset_bp
 from routes.best_xi import best_xi_bp
+from routes.jobs import jobs_bp
+from routes.health import health_bp
+from routes.career import career_bp
 
 pymysql.install_as_MySQLdb()
 load_dotenv()
@@ -21,9 +29,8 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
-# Database Config
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Database Config (engine profile + pool settings, see config.py)
+app.config.from_object(Config)
 
 # Initialize DB
 db.init_app(app)
@@ -34,15 +41,39 @@ app.register_blueprint(batting_bp)
 app.register_blueprint(bowling_bp)
 app.register_blueprint(dataset_bp)
 app.register_blueprint(best_xi_bp)
+app.register_blueprint(jobs_bp)
+app.register_blueprint(health_bp)
+app.register_blueprint(career_bp)
 
-# Tables Create කිරීම
-with app.app_context():
-    try:
-        db.create_all()
-        print("✓ Database tables created/verified successfully")
-    except Exception as e:
-        print(f"✗ Database Error: {e}")
+# CLI: flask rebuild-aggregates / flask check-aggregates / flask import-data
+player_aggregates.register_commands(app)
+bulk_import.register_commands(app)
+query_plans.register_commands(app)
+
+# Per-route latency, SQL counts / timing, slow-query log -> /api/metrics
+metrics.init_app(app)
+
+# Tables Create කිරීම - in the background (warm-up / first request), never inside a request
+@app.before_request
+def ensure_database():
+    if request.blueprint == 'health' or startup.database_available(app):
+        return None
+    response = jsonify({"error": "Database not ready", "database": startup.readiness()['database']})
+    response.headers['Retry-After'] = str(int(startup.DB_RETRY_SECONDS))
+    return response, 503
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create missing tables and indexes and build the player/ground aggregates."""
+    if startup.init_database(app):
+        created = query_plans.ensure_indexes()
+        if created:
+            print(f"✓ Created indexes: {', '.join(created)}")
+
+if startup.WARMUP_ON_START:
+    startup.start_warmup(app)
 
 if __name__ == '__main__':
     print("🏏 Cricket Analysis System Running...")
+    startup.start_warmup(app)
     app.run(debug=True, port=5000)
\ No newline at end of file
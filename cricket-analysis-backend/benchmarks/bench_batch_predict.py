@@ -0,0 +1,97 @@
+"""
+Benchmark: per-player latency of squad scoring in data_loader.
+
+Compares N single-player calls (the old one-row DataFrame path) with one
+predict_player_scores_batch call at batch sizes 1, 15, 100 and 1,000.
+
+Uses best_xi_model.joblib / best_xi_model_encoders.joblib when present,
+otherwise fits a small stand-in model on the bundled ODI CSV.
+
+    python benchmarks/bench_batch_predict.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+BATCH_SIZES = [1, 15, 100, 1000]
+FEATURE_COLUMNS = [
+    'main_role_encoded', 'opposition_encoded', 'pitch_type_encoded', 'weather_encoded', 'batting_style_encoded',
+    'runs', 'strike_rate', 'wickets', 'economy', 'average', 'balls_faced', 'fours', 'sixes'
+]
+
+
+def fit_stand_in_model():
+    """Multi-output forest + label encoders shaped like the production artifacts"""
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import LabelEncoder
+
+    df = pd.read_csv(common.CSV_SOURCES['ODI'], encoding='latin1')
+    df['batting_style'] = df['bowling_style']
+    encoders = {}
+    features = pd.DataFrame(index=df.index)
+    for column in ['main_role', 'opposition', 'pitch_type', 'weather', 'batting_style']:
+        encoders[column] = LabelEncoder().fit(df[column].astype(str))
+        features[f'{column}_encoded'] = encoders[column].transform(df[column].astype(str))
+    for column in FEATURE_COLUMNS[5:]:
+        features[column] = np.random.default_rng(0).random(len(df))
+    targets = df[['batting_runs', 'wicket_taken']].to_numpy(dtype=float)
+    model = RandomForestRegressor(n_estimators=50, max_depth=8, random_state=0).fit(features[FEATURE_COLUMNS], targets)
+    return model, {'encoders': encoders, 'feature_columns': FEATURE_COLUMNS}
+
+
+def legacy_predict(data_loader, opposition, pitch_type, weather, player_role):
+    """The previous single-player body: five transforms + one-row DataFrame"""
+    import pandas as pd
+    encoders = data_loader.model_info['encoders']
+    feature_columns = data_loader.model_info['feature_columns']
+    row = {
+        'main_role_encoded': [encoders['main_role'].transform([player_role])[0] if player_role in encoders['main_role'].classes_ else 0],
+        'opposition_encoded': [encoders['opposition'].transform([opposition])[0] if opposition in encoders['opposition'].classes_ else 0],
+        'pitch_type_encoded': [encoders['pitch_type'].transform([pitch_type])[0] if pitch_type in encoders['pitch_type'].classes_ else 0],
+        'weather_encoded': [encoders['weather'].transform([weather])[0] if weather in encoders['weather'].classes_ else 0],
+        'batting_style_encoded': [encoders['batting_style'].transform(['No_Bowling'])[0]],
+    }
+    row.update({column: [0] for column in feature_columns[5:]})
+    return data_loader.model.predict(pd.DataFrame(row)[feature_columns])[0]
+
+
+def best_of(repeats, fn):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    common.use_backend_dir()
+    import data_loader
+    data_loader.ensure_ml_loaded()
+    if data_loader.model is None or data_loader.model_info is None:
+        print("Production model not found - fitting a stand-in model on the ODI CSV")
+        data_loader.model, data_loader.model_info = fit_stand_in_model()
+
+    roles = list(data_loader.model_info['encoders']['main_role'].classes_)
+    conditions = ('India', 'Batting Friendly', 'dry')
+
+    print(f"{'batch':>6} {'loop us/player':>15} {'batch us/player':>16} {'speed-up':>9}")
+    for size in BATCH_SIZES:
+        squad = [(f'player_{i}', roles[i % len(roles)]) for i in range(size)]
+        loop = best_of(args.repeats, lambda: [legacy_predict(data_loader, *conditions, role) for _, role in squad])
+        batch = best_of(args.repeats, lambda: data_loader.predict_player_scores_batch(squad, *conditions))
+        print(f"{size:>6} {loop / size * 1e6:>15.1f} {batch / size * 1e6:>16.1f} {loop / batch:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: bulk import vs. one /api/dataset/add-record POST per row.
+
+Writes a CSV of --rows rows (the bundled T20 CSV repeated), imports it with
+bulk_import.import_file into a throw-away SQLite database, and times a
+sample of the same rows through the per-row endpoint for comparison.
+
+    python benchmarks/bench_bulk_import.py --rows 100000 --sample 500
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+
+def build_csv(rows):
+    """Path of a CSV with `rows` rows in the bundled T20 layout"""
+    import pandas as pd
+    source = pd.read_csv(common.CSV_SOURCES['T20'], encoding='latin1', dtype=str)
+    repeats = -(-rows // len(source))
+    path = os.path.join(tempfile.mkdtemp(prefix='cricket-bench-import-'), 't20_bulk.csv')
+    pd.concat([source] * repeats, ignore_index=True).head(rows).to_csv(path, index=False)
+    return path
+
+
+def add_record_payload(record):
+    """bulk_import record -> the JSON the ManageDatasetPage posts"""
+    payload = {k: v for k, v in record.items() if v is not None}
+    payload['date'] = record['date'].isoformat() if record.get('date') else None
+    payload['match_type'] = 'T20'
+    return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--sample', type=int, default=500, help='rows sent through add-record')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = common.temp_sqlite_url()
+    common.use_backend_dir()
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app
+        import bulk_import
+        import startup
+        startup.init_database(app)
+
+    path = build_csv(args.rows)
+    with app.app_context(), common.Timer() as bulk:
+        report = bulk_import.import_file(path, 'T20', chunk_size=args.chunk_size)
+    print(f"bulk import: {report['inserted']} rows inserted, {report['rejected']} rejected "
+          f"in {bulk.elapsed:.2f}s ({report['inserted'] / bulk.elapsed:,.0f} rows/s)")
+
+    records = common.read_format_records('T20')[:args.sample]
+    client = app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()), common.Timer() as per_row:
+        for record in records:
+            client.post('/api/dataset/add-record', json=add_record_payload(record))
+    rate = len(records) / per_row.elapsed
+    print(f"add-record:  {len(records)} rows in {per_row.elapsed:.2f}s ({rate:,.0f} rows/s), "
+          f"~{args.rows / rate / 60:.1f} min for {args.rows} rows")
+    print(f"speed-up:    {report['inserted'] / bulk.elapsed / rate:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: /api/career's per-format queries vs. one UNION ALL query over
+every format and the old endpoint-by-endpoint way of building the same
+profile.
+
+Seeds a throw-away SQLite database with the bundled CSVs (--scale times),
+picks the player with the most records and reports, per call:
+
+    per format       career_query for each format, in series (what /api/career runs)
+    union            the same aggregation as one UNION ALL query grouped by match_type
+    endpoint         a full GET /api/career (query + NumPy reduction + JSON)
+    old endpoints    grounds-for-player, then player-ground-stats and the
+                     bowling stats for every ground, in every format
+
+    python benchmarks/bench_career.py --scale 50 --repeats 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+
+def busiest_player(db):
+    from sqlalchemy import func, select, union_all
+    from performance_view import FORMAT_MODELS, format_select
+    performance = union_all(*[format_select(m) for m in FORMAT_MODELS]).subquery('performance_all')
+    return db.session.execute(
+        select(performance.c.player_name).group_by(performance.c.player_name)
+        .order_by(func.count().desc()).limit(1)
+    ).scalar()
+
+
+def old_profile(client, player):
+    """The calls a client had to make before /api/career"""
+    for match_type in ('ODI', 'T20', 'TEST'):
+        for prefix in ('/api', '/api/bowling'):
+            grounds = client.get(f'{prefix}/grounds-for-player?player={player}&matchType={match_type}').json
+            for ground in grounds:
+                client.get(f'{prefix}/player-ground-stats?player={player}&ground={ground}&matchType={match_type}')
+
+
+def mean_ms(fn, repeats):
+    fn()  # warm the page cache and connection pool
+    with common.Timer() as timer:
+        for _ in range(repeats):
+            fn()
+    return timer.elapsed / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=50, help='times each bundled CSV is inserted')
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = common.temp_sqlite_url()
+    common.use_backend_dir()
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app, db
+        import query_plans
+        import startup
+        from routes import career
+        with app.app_context():
+            counts = common.seed_database(db, scale=args.scale)
+            startup.init_database(app)
+            query_plans.ensure_indexes()
+
+    with app.app_context():
+        player = busiest_player(db)
+    print(f"Seeded at {args.scale}x: {counts}; player: {player}")
+
+    def union():
+        """career_query's aggregation over all three formats in a single statement"""
+        from sqlalchemy import union_all
+        from performance_view import format_select
+        perf = union_all(*[format_select(m) for m in career.FORMAT_MODELS]).subquery('performance_all')
+        db.session.execute(career.aggregate_query(perf, player)).all()
+
+    client = app.test_client()
+    with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        timings = {
+            'per format': mean_ms(lambda: [db.session.execute(career.career_query(player, m)).all()
+                                           for m in career.FORMAT_MODELS], args.repeats),
+            'union': mean_ms(union, args.repeats),
+            'endpoint': mean_ms(lambda: client.get(f'/api/career?player={player}'), args.repeats),
+            'old endpoints': mean_ms(lambda: old_profile(client, player), max(1, args.repeats // 5)),
+        }
+
+    for name, ms in timings.items():
+        print(f"{name:<15} {ms:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: columnar loader vs. the old per-row ORM path.
+
+Seeds a SQLite database with the bundled ODI, T20 and Test CSVs scaled up
+(100x by default) and loads all three tables with each path in a fresh
+subprocess, reporting wall time and peak RSS.
+
+    python benchmarks/bench_columnar_loader.py --scale 100
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+
+def legacy_load(db, model_map):
+    """The previous load_data_by_match_type body: ORM objects -> dicts -> frames"""
+    import pandas as pd
+    frames = {}
+    for match_type, model_class in model_map.items():
+        records = db.session.query(model_class).all()
+        data = [record.to_dict() for record in records]
+        batting_data = [d for d in data if d.get('runs', 0) > 0]
+        bowling_data = [d for d in data if d.get('wickets', 0) > 0]
+        frames[match_type] = (pd.DataFrame(batting_data), pd.DataFrame(bowling_data))
+    return frames
+
+
+def run_worker(path):
+    """Load every table once with `path` and print a JSON result line"""
+    common.use_backend_dir()
+    from app import app, db
+    from models import ODIPerformance, T20Performance, TestPerformance
+    import data_loader
+
+    model_map = {'ODI': ODIPerformance, 'T20': T20Performance, 'Test': TestPerformance}
+    with app.app_context():
+        rss_before = common.peak_rss_mb()
+        with common.Timer() as timer:
+            if path == 'legacy':
+                legacy_load(db, model_map)
+            else:
+                data_loader.load_data_by_match_type()
+        rss_after = common.peak_rss_mb()
+
+    print(json.dumps({
+        'path': path,
+        'seconds': round(timer.elapsed, 3),
+        'peak_rss_mb': round(rss_after, 1),
+        'load_rss_mb': round(rss_after - rss_before, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=100, help='times each bundled CSV is inserted')
+    parser.add_argument('--worker', choices=['legacy', 'columnar'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    db_url = common.temp_sqlite_url()
+    env = dict(os.environ, DATABASE_URL=db_url)
+    os.environ['DATABASE_URL'] = db_url
+
+    common.use_backend_dir()
+    from app import app, db
+    with app.app_context():
+        counts = common.seed_database(db, scale=args.scale)
+    print(f"Seeded {db_url} at {args.scale}x: {counts}")
+
+    results = []
+    for path in ('legacy', 'columnar'):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', path],
+            env=env, capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'path':<10} {'seconds':>9} {'peak RSS MB':>12} {'load RSS MB':>12}")
+    for r in results:
+        print(f"{r['path']:<10} {r['seconds']:>9} {r['peak_rss_mb']:>12} {r['load_rss_mb']:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: CSV parsing vs. the Parquet cache (columnar_cache.py).
+
+Writes the bundled CSVs scaled --scale times (synthetic.py) to a temp
+directory and times, per call:
+
+    plain csv     pd.read_csv of every column (the loaders before the cache)
+    convert       first cached load: projected/typed parse + Parquet write
+    cached        later loads, read from Parquet
+
+for load_data_from_csv (all three files) and load_ml_dataset (ODI file),
+plus the deep memory of the loaded frames.
+
+    python benchmarks/bench_csv_cache.py --scale 100 --repeats 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+
+def frames_mb(frames):
+    return sum(df.memory_usage(deep=True).sum() for df in frames) / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=100, help='size multiplier of the bundled CSVs')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    import pandas as pd
+    from synthetic import write_scaled_tree
+
+    work_dir = tempfile.mkdtemp(prefix='cricket-bench-csv-')
+    try:
+        counts = write_scaled_tree(work_dir, args.scale)
+        common.use_backend_dir()
+        import columnar_cache
+        import data_loader
+        real_read_csv = columnar_cache.read_csv
+
+        def plain_read_csv(path, encoding='latin1'):
+            return pd.read_csv(path, encoding=encoding)
+
+        def load_all():
+            data_loader.load_data_from_csv()
+            data_loader.load_ml_dataset()
+            frames = [entry['frame'] for entry in data_loader.datasets.values()]
+            return frames + [data_loader.df_players_ml]
+
+        def timed(loader):
+            with common.Timer() as timer:
+                loader()
+            return timer.elapsed * 1000
+
+        print(f"{args.scale}x rows: {counts}")
+        os.chdir(work_dir)  # The loaders read data/... relative to the working directory
+        with contextlib.redirect_stdout(io.StringIO()):
+            columnar_cache.read_csv = plain_read_csv
+            plain = [timed(load_all) for _ in range(args.repeats)]
+            plain_mb = frames_mb(load_all())
+
+            columnar_cache.read_csv = real_read_csv
+            convert = timed(load_all)
+            cached = [timed(load_all) for _ in range(args.repeats)]
+            cached_mb = frames_mb(load_all())
+
+        print(f"{'load_data_from_csv + load_ml_dataset':<40} {'ms':>9} {'frames MB':>10}")
+        print(f"{'plain csv (best)':<40} {min(plain):>9.1f} {plain_mb:>10.1f}")
+        print(f"{'convert (first load)':<40} {convert:>9.1f} {cached_mb:>10.1f}")
+        print(f"{'cached (best)':<40} {min(cached):>9.1f} {cached_mb:>10.1f}")
+        print(f"speed-up {min(plain) / min(cached):.1f}x, memory {plain_mb / cached_mb:.1f}x smaller")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: cold `import app` time, checked against import_time_budget.json.
+
+Runs `python -X importtime -c "import app"` in fresh subprocesses (against a
+throw-away SQLite URL), reports the median total and the slowest top-level
+imports, and fails when the total exceeds the budget or a module that must
+stay lazy (xgboost, sklearn, ...) shows up at import time.
+
+    python benchmarks/bench_import_time.py --runs 5
+    python benchmarks/bench_import_time.py --save-profile   # refresh import_time_profile.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_PATH = os.path.join(BENCH_DIR, 'import_time_budget.json')
+PROFILE_PATH = os.path.join(BENCH_DIR, 'import_time_profile.json')
+
+
+def parse_importtime(stderr):
+    """-X importtime output -> [(module, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_once(db_url):
+    env = dict(os.environ, DATABASE_URL=db_url, WARMUP_ON_START='0')
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=common.BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(out.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='slowest direct imports of app to show')
+    parser.add_argument('--save-profile', action='store_true', help='write the median run to import_time_profile.json')
+    args = parser.parse_args()
+
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+
+    db_url = common.temp_sqlite_url()
+    runs = [profile_once(db_url) for _ in range(args.runs)]
+    totals = [next(cum for name, _, cum, _ in rows if name == 'app') / 1000 for rows in runs]
+    median_ms = statistics.median(totals)
+    rows = runs[totals.index(sorted(totals)[len(totals) // 2])]
+
+    # Direct children of `app` (depth 1), slowest first
+    children = sorted((r for r in rows if r[3] == 1), key=lambda r: -r[2])[:args.top]
+    print(f"import app: median {median_ms:.0f} ms over {args.runs} runs (min {min(totals):.0f}, max {max(totals):.0f})")
+    print(f"{'module':<32} {'cumulative ms':>14}")
+    for name, _, cumulative, _ in children:
+        print(f"{name:<32} {cumulative / 1000:>14.1f}")
+
+    if args.save_profile:
+        with open(PROFILE_PATH, 'w') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'median_ms': round(median_ms, 1),
+                'top_imports_ms': {name: round(cumulative / 1000, 1) for name, _, cumulative, _ in children}
+            }, f, indent=2)
+            f.write('\n')
+        print(f"Saved profile to {PROFILE_PATH}")
+
+    imported = {name for name, _, _, _ in rows}
+    eager = sorted(m for m in budget['lazy_modules'] if m in imported)
+    failures = []
+    if median_ms > budget['max_import_ms']:
+        failures.append(f"median {median_ms:.0f} ms > budget {budget['max_import_ms']} ms")
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        raise SystemExit(1)
+    print(f"✓ Within budget ({budget['max_import_ms']} ms, lazy: {', '.join(budget['lazy_modules'])})")
+
+
+if __name__ == '__main__':
+    main()
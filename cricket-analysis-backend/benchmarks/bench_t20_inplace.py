@@ -0,0 +1,100 @@
+"""
+Benchmark: T20 in-place predictor vs. the previous DMatrix path.
+
+Times `booster.predict(xgb.DMatrix(df[NUM_FEATURES]))` against
+`InplacePredictor.predict(df)` for several squad sizes, single-threaded and
+with concurrent threads, and checks both paths return the same scores.
+Uses t20_model.json when present, otherwise a stand-in booster.
+
+    python benchmarks/bench_t20_inplace.py --repeats 200 --threads 4
+"""
+import argparse
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+SQUAD_SIZES = (15, 30, 100, 1000, 20000)
+
+
+def load_booster():
+    import numpy as np
+    import pandas as pd
+    import xgboost as xgb
+    from routes.best_xi import NUM_FEATURES, T20_MODEL_PATH
+
+    if os.path.exists(T20_MODEL_PATH):
+        booster = xgb.Booster()
+        booster.load_model(T20_MODEL_PATH)
+        return booster
+    print("t20_model.json not found - training a stand-in booster")
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(rng.random((20000, len(NUM_FEATURES))) * 50, columns=NUM_FEATURES)
+    return xgb.train({'max_depth': 6, 'eta': 0.1}, xgb.DMatrix(features, label=features.sum(axis=1)), num_boost_round=200)
+
+
+def feature_frame(n_rows, seed=1):
+    """Same dtypes build_feature_frame produces (float64 numeric columns)"""
+    import numpy as np
+    import pandas as pd
+    from routes.best_xi import NUM_FEATURES
+
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((n_rows, len(NUM_FEATURES))) * 50, columns=NUM_FEATURES)
+    df['Player_Name'] = [f'Player {i}' for i in range(n_rows)]
+    return df
+
+
+def per_call_us(fn, repeats, threads=1):
+    """Mean wall time per call in microseconds with `threads` callers in parallel"""
+    def worker():
+        for _ in range(repeats):
+            fn()
+
+    fn()  # warm buffers / caches
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    with common.Timer() as timer:
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    return timer.elapsed / (repeats * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    common.use_backend_dir()
+    import numpy as np
+    import xgboost as xgb
+    from routes.best_xi import NUM_FEATURES
+    from t20_inference import InplacePredictor
+
+    booster = load_booster()
+    predictor = InplacePredictor(booster, NUM_FEATURES)
+
+    print(f"{'squad':>6} {'threads':>7} {'DMatrix us':>11} {'inplace us':>11} {'speed-up':>9} {'max diff':>9}")
+    for size in SQUAD_SIZES:
+        df = feature_frame(size)
+        repeats = max(5, args.repeats * 100 // size) if size > 100 else args.repeats
+
+        def dmatrix_path():
+            return booster.predict(xgb.DMatrix(df[NUM_FEATURES]))
+
+        def inplace_path():
+            return predictor.predict(df)
+
+        diff = float(np.max(np.abs(dmatrix_path() - inplace_path())))
+        for threads in sorted({1, args.threads}):
+            old = per_call_us(dmatrix_path, repeats, threads)
+            new = per_call_us(inplace_path, repeats, threads)
+            print(f"{size:>6} {threads:>7} {old:>11.1f} {new:>11.1f} {old / new:>8.1f}x {diff:>9.2g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark: per-worker memory with 1, 4 and 8 forked workers.
+
+Mirrors gunicorn's process model without needing gunicorn: a master imports
+the app, then forks N workers that each serve the same request mix and
+use the loaded models / ML dataset. Two modes are compared:
+
+    preload     master runs startup.prepare_for_fork() (gunicorn.conf.py):
+                everything loaded once, memory-mapped, GC frozen, then fork
+    per-worker  every worker loads models and the ML dataset itself after fork
+
+Reported per mode and worker count: mean unique set size (USS, memory only
+that worker owns), mean RSS, and total PSS of master + workers. Stand-in
+models are fitted when the real model files are not present.
+
+    python benchmarks/bench_worker_memory.py --scale 20 --workers 1 4 8
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+MODES = ('preload', 'per-worker')
+
+
+def build_stand_in_models(directory):
+    """Fit the best XI stand-in (see bench_batch_predict) and a T20 booster; return file paths"""
+    import joblib
+    import numpy as np
+    import xgboost as xgb
+    from bench_batch_predict import fit_stand_in_model
+
+    paths = {'best_xi': os.path.join(directory, 'best_xi_stand_in.joblib'),
+             't20': os.path.join(directory, 't20_stand_in.json')}
+    joblib.dump(fit_stand_in_model(), paths['best_xi'])
+
+    rng = np.random.default_rng(0)
+    features = rng.random((20000, 6))
+    target = features @ rng.random(6) * 50
+    booster = xgb.train({'max_depth': 8, 'eta': 0.1}, xgb.DMatrix(features, label=target), num_boost_round=300)
+    booster.save_model(paths['t20'])
+    return paths
+
+
+def install_models(paths):
+    """Load the models the way the app does (T20 via load_models, best XI via joblib)"""
+    import joblib
+    import data_loader
+    from routes import best_xi
+
+    if paths:
+        data_loader.model, data_loader.model_info = joblib.load(paths['best_xi'])
+        best_xi.T20_MODEL_PATH = paths['t20']
+    best_xi.load_models()
+    data_loader.load_ml_dataset()
+    data_loader._ml_loaded = True
+
+
+def serve_requests(app):
+    """The request mix each worker handles before it is measured"""
+    import data_loader
+    client = app.test_client()
+    client.get('/api/homepage-stats')
+    for match_type in ('ODI', 'T20', 'TEST'):
+        client.post('/api/predict-team', json={'match_type': match_type, 'pitch_type': 'Green'})
+    players = [('Player', 'Batsman')] * 15
+    data_loader.predict_player_scores_batch(players, 'India', 'Green', 'Clear')
+
+
+def run_master(mode, workers, paths):
+    """Fork `workers` children, measure them once they have served requests"""
+    import contextlib
+    import io
+    import psutil
+
+    common.use_backend_dir()
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app
+        import startup
+        startup.init_database(app)
+        if mode == 'preload':
+            install_models(paths)
+            startup.prepare_for_fork(app)
+
+    pids = []
+    ready_r, ready_w = os.pipe()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if mode == 'preload':
+                        startup.reset_after_fork(app)
+                    else:
+                        install_models(paths)
+                    serve_requests(app)
+                os.write(ready_w, b'1')
+                signal.pause()
+            finally:
+                os._exit(0)
+        pids.append(pid)
+
+    for _ in range(workers):
+        os.read(ready_r, 1)
+
+    stats = [psutil.Process(pid).memory_full_info() for pid in pids]
+    master = psutil.Process().memory_full_info()
+    for pid in pids:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+
+    mb = 1024 * 1024
+    print(json.dumps({
+        'mode': mode,
+        'workers': workers,
+        'uss_mb': round(sum(s.uss for s in stats) / workers / mb, 1),
+        'rss_mb': round(sum(s.rss for s in stats) / workers / mb, 1),
+        'total_pss_mb': round((sum(s.pss for s in stats) + master.pss) / mb, 1),
+        'master_rss_mb': round(master.rss / mb, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=20, help='times each bundled CSV is inserted')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--run', nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument('--models', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_master(args.run[0], int(args.run[1]), json.loads(args.models) if args.models else None)
+        return
+
+    db_url = common.temp_sqlite_url()
+    os.environ['DATABASE_URL'] = db_url
+    common.use_backend_dir()
+    from app import app, db
+    with app.app_context():
+        counts = common.seed_database(db, scale=args.scale)
+    print(f"Seeded {db_url} at {args.scale}x: {counts}")
+
+    paths = None
+    if not (os.path.exists('best_xi_model.joblib') and os.path.exists('t20_model.json')):
+        print("Model files not found - fitting stand-in models")
+        paths = build_stand_in_models(tempfile.mkdtemp(prefix='cricket-bench-models-'))
+
+    env = dict(os.environ, DATABASE_URL=db_url, WARMUP_ON_START='0',
+               ARTIFACT_DIR=tempfile.mkdtemp(prefix='cricket-bench-artifacts-'))
+    print(f"{'mode':<11} {'workers':>7} {'USS/worker MB':>14} {'RSS/worker MB':>14} {'total PSS MB':>13}")
+    for mode in args.modes:
+        for workers in args.workers:
+            command = [sys.executable, os.path.abspath(__file__), '--run', mode, str(workers)]
+            if paths:
+                command += ['--models', json.dumps(paths)]
+            out = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{r['mode']:<11} {r['workers']:>7} {r['uss_mb']:>14} {r['rss_mb']:>14} {r['total_pss_mb']:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Shared helpers for the backend benchmarks.
+
+Benchmarks run against a throw-away SQLite database seeded from the bundled
+CSVs in data/ODI, data/T20 and data/Test, so no MySQL server is needed.
+"""
+import os
+import sys
+import time
+import tempfile
+
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CSV_SOURCES = {
+    'ODI': os.path.join(BACKEND_DIR, 'data', 'ODI', 'odi_performance.csv'),
+    'T20': os.path.join(BACKEND_DIR, 'data', 'T20', 't20_performance.csv'),
+    'Test': os.path.join(BACKEND_DIR, 'data', 'Test', 'test_performance.csv'),
+}
+
+
+def use_backend_dir():
+    """Make the backend modules importable and relative data paths resolve"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+
+
+def temp_sqlite_url(name='bench.db'):
+    """A file-backed SQLite URL inside a fresh temp directory"""
+    path = os.path.join(tempfile.mkdtemp(prefix='cricket-bench-'), name)
+    return f'sqlite:///{path}'
+
+
+def read_format_records(match_type):
+    """Bundled CSV for one format as insert-ready dicts (via the bulk importer's coercion)"""
+    import bulk_import
+    df = pd.read_csv(CSV_SOURCES[match_type], encoding='latin1', dtype=str)
+    records, rejections = bulk_import.coerce_chunk(df, match_type.upper())
+    if rejections:
+        print(f"⚠ {len(rejections)} {match_type} CSV rows rejected, e.g. {rejections[0]}")
+    return records
+
+
+def seed_database(db, scale=1, batch_size=5000):
+    """Insert every bundled CSV `scale` times into the bound database"""
+    from models import ODIPerformance, T20Performance, TestPerformance
+
+    db.create_all()
+    counts = {}
+    for match_type, model_class in (('ODI', ODIPerformance), ('T20', T20Performance), ('Test', TestPerformance)):
+        table = model_class.__table__
+        records = read_format_records(match_type)
+        total = 0
+        for _ in range(scale):
+            for start in range(0, len(records), batch_size):
+                db.session.execute(table.insert(), records[start:start + batch_size])
+                total += len(records[start:start + batch_size])
+        db.session.commit()
+        counts[match_type] = total
+    return counts
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Timer:
+    """Context manager that records wall time in seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
@@ -0,0 +1,406 @@
+"""
+Load generator: replays the frontend's user journeys against a running app.
+
+Each virtual user keeps its own HTTP connection (like a browser tab) and
+loops over journeys picked by --mix, pausing for an exponentially
+distributed think time between steps. The journeys follow the page code
+in cricket-analysis-frontend/src/pages:
+
+    home      HomePage               homepage-stats
+    batting   BattingPerformancePage players -> grounds-for-player -> player-ground-stats
+    bowling   BowlingPerformancePage the same under /api/bowling
+    best_xi   BestXISelectionPage    the four dropdown lists (in parallel, as
+                                     Promise.all does) -> predict-team
+    dataset   ManageDatasetPage      dataset/check-condition
+
+Reported per endpoint and per journey: requests, errors, throughput and
+p50 / p95 / p99 / max latency. A journey's latency is its time waiting on
+the server (think time excluded). Several --users values run one after
+another, and a drop in throughput as users are added is flagged.
+
+    python benchmarks/loadgen.py --users 1 4 16 --duration 30
+    python benchmarks/loadgen.py --start --workers 4 --users 8 32 --think-time 0.5 --json out.json
+
+--start launches the app itself (gunicorn -c gunicorn.conf.py when gunicorn
+is installed, otherwise the threaded Flask server) with the current
+environment's database settings, and waits for /api/health/ready. The
+generator needs CPU too: on a small machine run it from another host.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MATCH_TYPES = ['ODI', 'T20', 'TEST']
+DEFAULT_MIX = 'home=3,batting=3,bowling=2,best_xi=1,dataset=1'
+DROPDOWNS = {'matchTypes': '/api/ml/match-types', 'oppositions': '/api/ml/oppositions',
+             'pitchTypes': '/api/ml/pitch-types', 'weatherTypes': '/api/ml/weather-conditions'}
+COLLAPSE_RATIO = 0.9  # Throughput below this share of an earlier level's is flagged
+
+
+class RequestFailed(Exception):
+    """An error status or connection failure; ends the current journey"""
+
+
+# ==========================================
+# Virtual user
+# ==========================================
+class VirtualUser:
+    """One browser tab: persistent connection(s), think time, its own samples"""
+
+    def __init__(self, base_url, rng, think_time, timeout, stop):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.rng = rng
+        self.think_time = think_time
+        self.timeout = timeout
+        self.stop = stop
+        self.local = threading.local()  # One connection per thread (parallel dropdown calls)
+        self.side_pool = None
+        self.samples = []   # (endpoint, seconds, ok)
+        self.journeys = []  # (journey, seconds, ok)
+        self.active = 0.0   # Server time of the current journey
+
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _send(self, method, path, body):
+        headers = {'Accept': 'application/json'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, payload, headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # Server closed an idle keep-alive connection: reconnect once
+                conn.close()
+                if attempt == 2:
+                    raise
+
+    def request(self, method, path, params=None, body=None):
+        """Timed request; parsed JSON body, RequestFailed on an error"""
+        endpoint = f"{method} {path}"
+        url = f"{path}?{urlencode(params)}" if params else path
+        start = time.perf_counter()
+        try:
+            status, data = self._send(method, url, body)
+        except (OSError, http.client.HTTPException) as e:
+            self._record(endpoint, time.perf_counter() - start, False)
+            self._connection().close()  # Reopened on the next request
+            raise RequestFailed(f"{endpoint}: {e}")
+        self._record(endpoint, time.perf_counter() - start, status < 400)
+        if status >= 400:
+            raise RequestFailed(f"{endpoint} -> {status}")
+        return json.loads(data) if data else None
+
+    def _record(self, endpoint, seconds, ok):
+        self.samples.append((endpoint, seconds, ok))
+
+    def get(self, path, **params):
+        start = time.perf_counter()
+        try:
+            return self.request('GET', path, params)
+        finally:
+            self.active += time.perf_counter() - start
+
+    def post(self, path, body):
+        start = time.perf_counter()
+        try:
+            return self.request('POST', path, body=body)
+        finally:
+            self.active += time.perf_counter() - start
+
+    def get_all(self, paths):
+        """GET several paths at once (Promise.all); {key: body}"""
+        if self.side_pool is None:
+            self.side_pool = ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix='loadgen-side')
+        start = time.perf_counter()
+        try:
+            futures = {key: self.side_pool.submit(self.request, 'GET', path) for key, path in paths.items()}
+            return {key: future.result() for key, future in futures.items()}
+        finally:
+            self.active += time.perf_counter() - start
+
+    def think(self):
+        """Pause like a user reading the page (exponential, capped at 4x the mean)"""
+        if self.think_time > 0:
+            self.stop.wait(min(self.rng.expovariate(1 / self.think_time), 4 * self.think_time))
+
+    def run_journey(self, name, journey, pools):
+        self.active = 0.0
+        ok = True
+        try:
+            journey(self, pools)
+        except RequestFailed:
+            ok = False
+        self.journeys.append((name, self.active, ok))
+
+    def close(self):
+        if self.side_pool is not None:
+            self.side_pool.shutdown()
+
+
+# ==========================================
+# Journeys (one per frontend page)
+# ==========================================
+def home_journey(user, pools):
+    user.get('/api/homepage-stats')
+
+
+def performance_journey(prefix):
+    def journey(user, pools):
+        match_type = user.rng.choice(MATCH_TYPES)
+        players = user.get(f'{prefix}/players', matchType=match_type)
+        if not players:
+            return
+        user.think()
+        player = user.rng.choice(players)
+        grounds = user.get(f'{prefix}/grounds-for-player', player=player, matchType=match_type)
+        if not grounds:
+            return
+        user.think()
+        user.get(f'{prefix}/player-ground-stats', player=player, ground=user.rng.choice(grounds),
+                 matchType=match_type)
+    return journey
+
+
+def best_xi_journey(user, pools):
+    options = user.get_all(DROPDOWNS)
+    user.think()
+    user.post('/api/predict-team', {
+        'match_type': user.rng.choice(options['matchTypes']),
+        'opposition': user.rng.choice(options['oppositions']),
+        'pitch_type': user.rng.choice(options['pitchTypes']),
+        'weather': user.rng.choice(options['weatherTypes'])
+    })
+
+
+def dataset_journey(user, pools):
+    # The page has free-text inputs: use a real player and opposition
+    match_type = user.rng.choice(MATCH_TYPES)
+    user.get('/api/dataset/check-condition', player_name=user.rng.choice(pools['players'][match_type]),
+             opposition=user.rng.choice(pools['oppositions']), match_type=match_type)
+
+
+JOURNEYS = {
+    'home': home_journey,
+    'batting': performance_journey('/api'),
+    'bowling': performance_journey('/api/bowling'),
+    'best_xi': best_xi_journey,
+    'dataset': dataset_journey,
+}
+
+
+def parse_mix(text):
+    """'home=3,batting=1' -> {'home': 3.0, 'batting': 1.0}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in JOURNEYS:
+            raise SystemExit(f"Unknown journey '{name}' (choose from {', '.join(JOURNEYS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_pools(base_url, timeout):
+    """Player names / oppositions for the free-text dataset journey (not measured)"""
+    user = VirtualUser(base_url, random.Random(0), 0, timeout, threading.Event())
+    return {
+        'players': {m: user.request('GET', '/api/players', {'matchType': m}) or ['Unknown'] for m in MATCH_TYPES},
+        'oppositions': user.request('GET', DROPDOWNS['oppositions']) or ['India']
+    }
+
+
+# ==========================================
+# Running one concurrency level
+# ==========================================
+def run_level(base_url, users, duration, think_time, mix, ramp_up, timeout, seed, pools):
+    """Run `users` virtual users for `duration` seconds; the level's summary"""
+    stop = threading.Event()
+    names, weights = list(mix), list(mix.values())
+    virtual_users = [VirtualUser(base_url, random.Random(seed * 1000 + i), think_time, timeout, stop)
+                     for i in range(users)]
+
+    def loop(index, user):
+        # Stagger the start so users do not arrive in lock-step
+        if stop.wait(ramp_up * index / users):
+            return
+        while not stop.is_set():
+            name = user.rng.choices(names, weights)[0]
+            user.run_journey(name, JOURNEYS[name], pools)
+            user.think()
+
+    threads = [threading.Thread(target=loop, args=(i, u), name=f'loadgen-{i}', daemon=True)
+               for i, u in enumerate(virtual_users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()  # In-flight journeys finish (bounded by --timeout per request)
+    elapsed = time.perf_counter() - start
+    for user in virtual_users:
+        user.close()
+
+    samples = [s for u in virtual_users for s in u.samples]
+    journeys = [j for u in virtual_users for j in u.journeys]
+    return {
+        'users': users,
+        'seconds': round(elapsed, 3),
+        'requests': len(samples),
+        'errors': sum(1 for _, _, ok in samples if not ok),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'endpoints': summarize(samples, elapsed),
+        'journeys': summarize(journeys, elapsed)
+    }
+
+
+def summarize(samples, elapsed):
+    """{name: count / errors / rate / percentiles in ms}, busiest first"""
+    groups = {}
+    for name, seconds, ok in samples:
+        groups.setdefault(name, ([], [0]))
+        groups[name][0].append(seconds)
+        groups[name][1][0] += 0 if ok else 1
+    summary = {}
+    for name, (seconds, errors) in sorted(groups.items(), key=lambda item: -len(item[1][0])):
+        ms = np.asarray(seconds) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        summary[name] = {
+            'count': len(ms), 'errors': errors[0], 'rate_per_s': round(len(ms) / elapsed, 2),
+            'p50_ms': round(float(p50), 2), 'p95_ms': round(float(p95), 2), 'p99_ms': round(float(p99), 2),
+            'max_ms': round(float(ms.max()), 2)
+        }
+    return summary
+
+
+def print_level(level):
+    print(f"\n{level['users']} user(s): {level['requests']} requests in {level['seconds']:.1f} s "
+          f"({level['throughput_rps']} req/s), {level['errors']} error(s)")
+    print(f"  {'':<44} {'count':>6} {'err':>4} {'per s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for title, rows in (('endpoint', level['endpoints']), ('journey', level['journeys'])):
+        for name, r in rows.items():
+            print(f"  {title + ' ' + name:<44} {r['count']:>6} {r['errors']:>4} {r['rate_per_s']:>7.2f} "
+                  f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+def check_collapse(levels):
+    """Warn when adding users lowered throughput or produced errors"""
+    best = None
+    for level in levels:
+        if level['errors']:
+            print(f"⚠ {level['users']} users: {level['errors']} of {level['requests']} requests failed")
+        if best and level['throughput_rps'] < best['throughput_rps'] * COLLAPSE_RATIO:
+            print(f"⚠ Throughput fell from {best['throughput_rps']} req/s ({best['users']} users) "
+                  f"to {level['throughput_rps']} req/s ({level['users']} users)")
+        if best is None or level['throughput_rps'] > best['throughput_rps']:
+            best = level
+
+
+# ==========================================
+# Optional: start the app locally
+# ==========================================
+def start_server(port, workers):
+    """gunicorn with the repo config when installed, else the threaded Flask server"""
+    env = dict(os.environ, WARMUP_ON_START='1')
+    try:
+        import gunicorn  # noqa: F401
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app']
+        env.update(GUNICORN_BIND=f'127.0.0.1:{port}', WEB_CONCURRENCY=str(workers))
+    except ImportError:
+        print("gunicorn not installed - using the threaded Flask server (--workers ignored)")
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--host', '127.0.0.1',
+                   '--port', str(port), '--with-threads', '--no-reload', '--no-debugger']
+    log = tempfile.NamedTemporaryFile(prefix='cricket-loadgen-server-', suffix='.log', delete=False)
+    print(f"Starting: {' '.join(command[1:])} (log: {log.name})")
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(base_url, timeout, server=None):
+    """Poll /api/health/ready until it answers 200"""
+    parts = urlsplit(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"✗ Server exited with code {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=5)
+            conn.request('GET', '/api/health/ready')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"✗ {base_url} not ready after {timeout} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='app base URL')
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 4, 16], help='concurrency level(s) to run')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per level')
+    parser.add_argument('--think-time', type=float, default=1.0, help='mean pause between steps, 0 for none')
+    parser.add_argument('--ramp-up', type=float, default=2.0, help='seconds over which users start')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'journey weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--timeout', type=float, default=60, help='per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--start', action='store_true', help='start the app on --url\'s port first')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers with --start')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    server = start_server(urlsplit(args.url).port or 80, args.workers) if args.start else None
+    try:
+        wait_ready(args.url, 300 if server else 10, server)
+        pools = load_pools(args.url, args.timeout)
+        print(f"Target {args.url}: mix {mix}, think time {args.think_time} s, {args.duration:g} s per level")
+
+        levels = []
+        for users in args.users:
+            level = run_level(args.url, users, args.duration, args.think_time, mix, args.ramp_up,
+                              args.timeout, args.seed, pools)
+            print_level(level)
+            levels.append(level)
+
+        if len(levels) > 1:
+            print(f"\n{'users':>6} {'req/s':>8} {'errors':>7}  p95 ms by journey")
+            for level in levels:
+                p95 = ', '.join(f"{name} {r['p95_ms']:.0f}" for name, r in level['journeys'].items())
+                print(f"{level['users']:>6} {level['throughput_rps']:>8.2f} {level['errors']:>7}  {p95}")
+        check_collapse(levels)
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump({'url': args.url, 'mix': mix, 'think_time': args.think_time,
+                           'duration': args.duration, 'levels': levels}, f, indent=2)
+            print(f"✓ Results saved to {args.json}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+"""
+Benchmark suite: every backend hot path at several data scales, one command.
+
+For each scale, the bundled CSVs are grown with synthetic.py, imported into
+a fresh SQLite database through the bulk importer, and then timed in a
+separate process (clean module state per scale):
+
+    functions   data_loader.load_data_by_match_type / load_data_from_csv /
+                predict_player_scores (+ the 15-player batch),
+                best_xi.get_player_data_from_db / score_players /
+                select_best_11, home.get_stats_for_match_type (per format)
+    routes      every read endpoint through the Flask test client (per
+                format where it takes one); predict-team and homepage-stats
+                with their caches cleared before each call
+
+Each case reports min / median / p95 / mean ms over --repeats calls (after
+one warm-up call). Results are saved as JSON (benchmarks/results/) and can
+be compared with an earlier run; a case regresses when its median grows by
+more than --threshold and --min-delta-ms. Stand-in models are fitted when
+the real model files are not present.
+
+    python benchmarks/run_all.py                              # 1x, 10x, 100x
+    python benchmarks/run_all.py --scales 1000 --repeats 3    # ~3.8M rows
+    python benchmarks/run_all.py --baseline benchmarks/results/<earlier>.json --fail-on-regression
+    python benchmarks/run_all.py --compare OLD.json NEW.json
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+FORMATS = ('ODI', 'T20', 'TEST')
+HOME_KEYS = {'ODI': 'ODI', 'T20': 'T20', 'TEST': 'Test'}
+CONDITIONS = {'pitch_type': 'Green', 'weather': 'Clear', 'opposition': 'India'}
+EXPORT_ROWS = 10000  # Rows per NDJSON export case (same size at every scale)
+
+
+# ==========================================
+# Timing
+# ==========================================
+def measure(fn, repeats, setup=None):
+    """min / median / p95 / mean ms of `repeats` calls after one warm-up call"""
+    if setup:
+        setup()
+    fn()
+    samples = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples = np.asarray(samples)
+    return {
+        'min_ms': round(float(samples.min()), 3),
+        'median_ms': round(float(np.median(samples)), 3),
+        'p95_ms': round(float(np.percentile(samples, 95)), 3),
+        'mean_ms': round(float(samples.mean()), 3),
+        'repeats': repeats
+    }
+
+
+def get(client, url):
+    """GET that fails the case on an error status (the body is read, streamed or not)"""
+    response = client.get(url)
+    response.get_data()
+    if response.status_code >= 400:
+        raise RuntimeError(f"GET {url} -> {response.status_code}")
+    return response
+
+
+def post(client, url, body):
+    response = client.post(url, json=body)
+    if response.status_code >= 400:
+        raise RuntimeError(f"POST {url} -> {response.status_code}")
+    return response
+
+
+# ==========================================
+# Cases
+# ==========================================
+def pick_subjects(db):
+    """Per format: the busiest batter / bowler, their most played ground and opposition"""
+    from sqlalchemy import func, select
+    from performance_view import relation
+
+    def most_common(column, where):
+        return db.session.execute(
+            select(column).where(where).group_by(column).order_by(func.count().desc(), column).limit(1)
+        ).scalar()
+
+    subjects = {}
+    for match_type in FORMATS:
+        perf = relation(match_type)
+        batter = most_common(perf.c.player_name, perf.c.runs > 0)
+        bowler = most_common(perf.c.player_name, perf.c.wickets > 0)
+        subjects[match_type] = {
+            'batter': batter,
+            'bowler': bowler,
+            'ground': most_common(perf.c.ground, perf.c.player_name == batter),
+            'bowling_ground': most_common(perf.c.ground, perf.c.player_name == bowler),
+            'opposition': most_common(perf.c.opposition, perf.c.player_name == batter)
+        }
+    return subjects
+
+
+def function_cases(app, data_dir):
+    """(name, fn, setup) for the module-level hot paths"""
+    import data_loader
+    from routes import best_xi, home
+
+    def in_app(fn):
+        def run():
+            with app.app_context():
+                return fn()
+        return run
+
+    def from_csv():
+        # load_data_from_csv reads data/... relative to the working directory
+        with contextlib.chdir(data_dir):
+            data_loader.load_data_from_csv()
+
+    cases = [
+        ('data_loader.load_data_by_match_type', in_app(data_loader.load_data_by_match_type), None),
+        ('data_loader.load_data_from_csv', from_csv, None),
+    ]
+
+    roles = list(data_loader.model_info['encoders']['main_role'].classes_)
+    squad = [(f'player_{i}', roles[i % len(roles)]) for i in range(15)]
+    conditions = (CONDITIONS['opposition'], CONDITIONS['pitch_type'], CONDITIONS['weather'])
+    cases += [
+        ('data_loader.predict_player_scores',
+         lambda: data_loader.predict_player_scores(*conditions, 'player_0', roles[0]), None),
+        ('data_loader.predict_player_scores_batch[15]',
+         lambda: data_loader.predict_player_scores_batch(squad, *conditions), None),
+    ]
+
+    with app.app_context():
+        for match_type in FORMATS:
+            raw = best_xi.get_player_data_from_db(match_type)
+            features = best_xi.build_feature_frame(
+                raw.copy(), CONDITIONS['pitch_type'], CONDITIONS['weather'], CONDITIONS['opposition'])
+            scored = best_xi.score_players(features.copy(), match_type)
+            cases += [
+                (f'best_xi.get_player_data_from_db[{match_type}]',
+                 in_app(lambda m=match_type: best_xi.get_player_data_from_db(m)), None),
+                (f'best_xi.score_players[{match_type}]',
+                 lambda m=match_type, f=features: best_xi.score_players(f.copy(), m), None),
+                (f'best_xi.select_best_11[{match_type}]',
+                 lambda m=match_type, s=scored: best_xi.select_best_11(s, CONDITIONS['pitch_type'], m), None),
+                (f'home.get_stats_for_match_type[{match_type}]',
+                 in_app(lambda k=HOME_KEYS[match_type]: home.get_stats_for_match_type(k)), None),
+            ]
+    return cases
+
+
+def route_cases(app, subjects):
+    """(name, fn, setup) for every read endpoint through the test client"""
+    from urllib.parse import urlencode
+    from prediction_cache import prediction_cache
+    from routes import home
+
+    client = app.test_client()
+
+    def url(path, **params):
+        return f"{path}?{urlencode(params)}" if params else path
+
+    def clear_home_snapshot():
+        home._snapshot = {'version': None, 'payload': None, 'etag': None}
+
+    cases = [('GET /api/homepage-stats (cold cache)',
+              lambda: get(client, '/api/homepage-stats'), clear_home_snapshot)]
+
+    for match_type in FORMATS:
+        s = subjects[match_type]
+        batter = {'player': s['batter'], 'matchType': match_type}
+        bowler = {'player': s['bowler'], 'matchType': match_type}
+        urls = {
+            'GET /api/players': url('/api/players', matchType=match_type),
+            'GET /api/grounds-for-player': url('/api/grounds-for-player', **batter),
+            'GET /api/player-ground-stats': url('/api/player-ground-stats', ground=s['ground'], **batter),
+            'GET /api/player-ground-chart-data': url('/api/player-ground-chart-data', ground=s['ground'], **batter),
+            'GET /api/bowling/players': url('/api/bowling/players', matchType=match_type),
+            'GET /api/bowling/grounds-for-player': url('/api/bowling/grounds-for-player', **bowler),
+            'GET /api/bowling/player-ground-stats':
+                url('/api/bowling/player-ground-stats', ground=s['bowling_ground'], **bowler),
+            'GET /api/dataset/check-condition': url('/api/dataset/check-condition', player_name=s['batter'],
+                                                    opposition=s['opposition'], match_type=match_type),
+            'GET /api/dataset/records (first page)': url('/api/dataset/records', match_type=match_type, limit=100),
+            f'GET /api/dataset/records (ndjson, {EXPORT_ROWS} rows)':
+                url('/api/dataset/records', match_type=match_type, limit=EXPORT_ROWS, stream='ndjson'),
+        }
+        cases += [(f'{name}[{match_type}]', lambda u=u: get(client, u), None) for name, u in urls.items()]
+        cases.append((f'POST /api/predict-team (cold cache)[{match_type}]',
+                      lambda m=match_type: post(client, '/api/predict-team', {'match_type': m, **CONDITIONS}),
+                      prediction_cache.clear))
+
+    cases += [
+        ('GET /api/career', lambda: get(client, url('/api/career', player=subjects['ODI']['batter'])), None),
+        ('GET /api/health/ready', lambda: get(client, '/api/health/ready'), None),
+        ('GET /api/health/pool', lambda: get(client, '/api/health/pool'), None),
+        ('GET /api/metrics', lambda: get(client, '/api/metrics'), None),
+    ]
+    return cases
+
+
+def run_scale(scale, data_dir, repeats, paths):
+    """Seed, then time every case; prints the result as JSON (subprocess entry point)"""
+    common.use_backend_dir()
+    real_stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        from app import app, db
+        import bulk_import
+        import startup
+        from bench_worker_memory import install_models
+        from synthetic import RELATIVE_PATHS
+
+        startup.init_database(app)
+        seed = {}
+        with app.app_context():
+            for match_type, relative in RELATIVE_PATHS.items():
+                report = bulk_import.import_file(os.path.join(data_dir, relative), match_type)
+                seed[match_type] = {'rows': report['inserted'], 'seconds': report['seconds']}
+            subjects = pick_subjects(db)
+        install_models(paths)
+
+        results = {}
+        for name, fn, setup in function_cases(app, data_dir) + route_cases(app, subjects):
+            results[name] = measure(fn, repeats, setup)
+
+    print(json.dumps({'seed': seed, 'subjects': subjects, 'cases': results}), file=real_stdout)
+
+
+# ==========================================
+# Saved runs: metadata + comparison
+# ==========================================
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=common.BACKEND_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold, min_delta_ms):
+    """Print per-case median changes; returns the regressions as (scale, case, old, new)"""
+    regressions, improvements, missing = [], [], []
+    for scale, run in current['scales'].items():
+        old_cases = baseline.get('scales', {}).get(scale, {}).get('cases')
+        if old_cases is None:
+            print(f"⚠ Baseline has no {scale}x run - skipped")
+            continue
+        for name, stats in run['cases'].items():
+            if name not in old_cases:
+                missing.append((scale, name))
+                continue
+            old, new = old_cases[name]['median_ms'], stats['median_ms']
+            if new > old * threshold and new - old > min_delta_ms:
+                regressions.append((scale, name, old, new))
+            elif old > new * threshold and old - new > min_delta_ms:
+                improvements.append((scale, name, old, new))
+
+    for title, rows in (('Regressions', regressions), ('Improvements', improvements)):
+        if rows:
+            print(f"\n{title} (median ms):")
+            for scale, name, old, new in rows:
+                print(f"  {scale + 'x':>6} {name:<62} {old:>10.2f} -> {new:>10.2f} ({new / old:5.2f}x)")
+    if missing:
+        print(f"\n{len(missing)} case(s) not in the baseline, e.g. {missing[0][1]} at {missing[0][0]}x")
+    mark = '✗' if regressions else '✓'
+    print(f"\n{mark} {len(regressions)} regression(s), {len(improvements)} improvement(s) "
+          f"vs {baseline['meta'].get('git_commit') or 'baseline'} "
+          f"(threshold {threshold}x and {min_delta_ms} ms)")
+    return regressions
+
+
+def print_run(scale, run):
+    rows = ', '.join(f"{m} {s['rows']} rows in {s['seconds']} s" for m, s in run['seed'].items())
+    print(f"\n{scale}x - imported {rows}")
+    print(f"  {'case':<62} {'min':>9} {'median':>9} {'p95':>9}")
+    for name, stats in run['cases'].items():
+        print(f"  {name:<62} {stats['min_ms']:>9.2f} {stats['median_ms']:>9.2f} {stats['p95_ms']:>9.2f}")
+
+
+def run_suite(scales, repeats, seed):
+    """Every scale in its own database + process; the saved-run dict"""
+    model_dir = tempfile.mkdtemp(prefix='cricket-bench-models-')
+    paths = None
+    if not (os.path.exists(os.path.join(common.BACKEND_DIR, 'best_xi_model.joblib'))
+            and os.path.exists(os.path.join(common.BACKEND_DIR, 't20_model.json'))):
+        print("Model files not found - fitting stand-in models")
+        common.use_backend_dir()
+        from bench_worker_memory import build_stand_in_models
+        paths = build_stand_in_models(model_dir)
+
+    from synthetic import write_scaled_tree
+    run = {'meta': {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeats': repeats,
+        'seed': seed,
+        'stand_in_models': paths is not None
+    }, 'scales': {}}
+
+    try:
+        for scale in scales:
+            work_dir = tempfile.mkdtemp(prefix=f'cricket-bench-{scale}x-')
+            try:
+                print(f"Generating {scale}x data...")
+                write_scaled_tree(work_dir, scale, seed)
+                env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(work_dir, 'bench.db')}",
+                           WARMUP_ON_START='0', SLOW_QUERY_MS='1e9', ARTIFACT_DIR=work_dir)
+                env.pop('DB_PROFILE', None)
+                command = [sys.executable, os.path.abspath(__file__), '--run', str(scale), work_dir,
+                           '--repeats', str(repeats)]
+                if paths:
+                    command += ['--models', json.dumps(paths)]
+                out = subprocess.run(command, env=env, capture_output=True, text=True)
+                if out.returncode != 0:
+                    sys.stderr.write(out.stderr)
+                    raise SystemExit(f"✗ {scale}x run failed")
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                run['scales'][str(scale)] = result
+                print_run(str(scale), result)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100], help='data size multipliers')
+    parser.add_argument('--repeats', type=int, default=5, help='timed calls per case')
+    parser.add_argument('--seed', type=int, default=0, help='synthetic data seed')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='earlier result file to compare against')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='only compare two result files')
+    parser.add_argument('--threshold', type=float, default=1.25, help='median ratio that counts as a change')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore changes smaller than this')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 when a case regresses')
+    parser.add_argument('--run', nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument('--models', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_scale(int(args.run[0]), args.run[1], args.repeats, json.loads(args.models) if args.models else None)
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            regressions = compare(json.load(f_old), json.load(f_new), args.threshold, args.min_delta_ms)
+    else:
+        run = run_suite(args.scales, args.repeats, args.seed)
+        output = args.output or os.path.join(RESULTS_DIR, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"\n✓ Results saved to {output}")
+
+        regressions = []
+        if args.baseline:
+            with open(args.baseline) as f:
+                regressions = compare(json.load(f), run, args.threshold, args.min_delta_ms)
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
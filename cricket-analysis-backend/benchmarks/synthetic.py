@@ -0,0 +1,139 @@
+"""
+Synthetic data scaler for the benchmarks.
+
+Grows each bundled CSV to `factor` times its rows while keeping it shaped
+like real data: the original rows come first, the rest are bootstrap
+resamples of them with
+
+    players     the squad grows with sqrt(factor): resampled rows are spread
+                over clones of each player ("Kusal Mendis #2", ...)
+    counts      runs, balls, boundaries, wickets, runs conceded and maidens
+                scaled by a lognormal factor (median 1), so zeros stay zeros
+    rates       strike rate and economy recomputed from the jittered counts
+    dates       shifted by up to +/- 2 years
+
+The output keeps each file's own headers, so it goes through the same
+bulk importer and CSV loader as the bundled data.
+
+    python benchmarks/synthetic.py --factor 100 --output /tmp/scaled
+"""
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common  # noqa: E402
+
+# Format key -> bundled CSV path relative to the data directory (as data_loader reads them)
+RELATIVE_PATHS = {
+    'ODI': os.path.join('data', 'ODI', 'odi_performance.csv'),
+    'T20': os.path.join('data', 'T20', 't20_performance.csv'),
+    'TEST': os.path.join('data', 'Test', 'test_performance.csv'),
+}
+COUNT_COLUMNS = ['runs', 'balls_faced', 'fours', 'sixes', 'runs_conceded', 'maidens']
+JITTER_SIGMA = 0.25
+DATE_SHIFT_DAYS = 730
+
+
+def canonical_headers(headers, match_type):
+    """Canonical column name -> this file's header (via the bulk importer's mapping)"""
+    import bulk_import
+    from performance_view import CANONICAL_COLUMNS, column_name
+
+    rename, _ = bulk_import.map_columns(headers, match_type)
+    by_column = {column: header for header, column in rename.items()}
+    return {name: by_column[column_name(match_type, name)]
+            for name in CANONICAL_COLUMNS if column_name(match_type, name) in by_column}
+
+
+def _numbers(df, header):
+    return pd.to_numeric(df[header], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _text(values):
+    """Numbers back to CSV text: whole numbers without '.0', blanks for NaN"""
+    out = np.where(np.isnan(values), '', np.round(values, 2).astype(str))
+    return pd.Series(out).str.replace(r'\.0$', '', regex=True).to_numpy()
+
+
+def synthesize(df, match_type, rows, rng, clones):
+    """`rows` new rows resampled from df (raw string frame, original headers)"""
+    columns = canonical_headers(df.columns, match_type)
+    out = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+
+    # Clones of each player (clone 0 keeps the real name)
+    clone = rng.integers(0, clones, rows)
+    names = out[columns['player_name']].astype(str)
+    out[columns['player_name']] = np.where(clone > 0, names + ' #' + (clone + 1).astype(str), names)
+
+    # Counting stats: lognormal multiplier, rounded, wickets capped at 10
+    values = {}
+    for name in COUNT_COLUMNS + ['wickets', 'overs']:
+        if name in columns:
+            values[name] = _numbers(out, columns[name])
+    for name in COUNT_COLUMNS + ['wickets']:
+        if name in values:
+            jittered = np.round(values[name] * rng.lognormal(0.0, JITTER_SIGMA, rows))
+            values[name] = np.minimum(jittered, 10) if name == 'wickets' else jittered
+            out[columns[name]] = _text(values[name])
+
+    # Rates follow the jittered counts
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if 'strike_rate' in columns:
+            sr = np.where(values['balls_faced'] > 0, values['runs'] * 100 / values['balls_faced'], 0.0)
+            out[columns['strike_rate']] = _text(np.where(np.isnan(values['runs']), np.nan, sr))
+        if 'economy' in columns:
+            overs = values['overs']
+            balls = np.floor(overs) * 6 + np.round((overs - np.floor(overs)) * 10)
+            econ = np.where(balls > 0, values['runs_conceded'] * 6 / balls, 0.0)
+            out[columns['economy']] = _text(np.where(np.isnan(values['runs_conceded']), np.nan, econ))
+
+    # Dates: random shift, ISO text (unparseable dates stay as they were)
+    dates = pd.to_datetime(out[columns['date']], errors='coerce', format='mixed')
+    shifted = dates + pd.to_timedelta(rng.integers(-DATE_SHIFT_DAYS, DATE_SHIFT_DAYS + 1, rows), unit='D')
+    out[columns['date']] = shifted.dt.strftime('%Y-%m-%d').where(dates.notna(), out[columns['date']])
+    return out
+
+
+def scale_frame(df, match_type, factor, seed=0):
+    """df grown to factor x rows: the original rows, then synthetic ones"""
+    if factor <= 1:
+        return df
+    rng = np.random.default_rng(seed)
+    clones = max(1, round(math.sqrt(factor)))
+    extra = synthesize(df, match_type, len(df) * (factor - 1), rng, clones)
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def write_scaled_tree(directory, factor, seed=0):
+    """Write data/ODI, data/T20, data/Test CSVs scaled by `factor` under directory; {format: rows}"""
+    common.use_backend_dir()
+    counts = {}
+    for offset, (match_type, relative) in enumerate(RELATIVE_PATHS.items()):
+        df = pd.read_csv(relative, encoding='latin1', dtype=str, keep_default_na=False)
+        scaled = scale_frame(df, match_type, factor, seed + offset)
+        path = os.path.join(directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        scaled.to_csv(path, index=False, encoding='latin1')
+        counts[match_type] = len(scaled)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--factor', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help='directory to write data/<format>/*.csv into')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    counts = write_scaled_tree(output, args.factor, args.seed)
+    print(f"Wrote {args.factor}x data to {output}: {counts}")
+
+
+if __name__ == '__main__':
+    main()
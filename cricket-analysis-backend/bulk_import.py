@@ -0,0 +1,265 @@
+import os
+import time
+import click
+import numpy as np
+import pandas as pd
+from sqlalchemy import types as sa_types
+from models import db
+from player_aggregates import FORMATS, rebuild
+from data_version import bump_version
+from prediction_cache import prediction_cache
+
+# ==========================================
+# File header -> ORM column, per format
+# ==========================================
+# Headers not listed here still match an ORM column with the same name
+# (case-insensitive), which covers the ODI CSV and NDJSON dumps of to_dict().
+COLUMN_MAPS = {
+    'ODI': {},
+    'T20': {
+        'Player Name': 'player_name', 'Date': 'date', 'Opposition': 'opposition', 'Ground': 'ground',
+        'Runs_Scored': 'runs', 'Balls_Faced': 'balls_faced', '4s': 'fours', '6s': 'sixes',
+        'SR': 'strike_rate', 'Pos_Bat': 'bat_position', 'Dismissal': 'dismissal',
+        'Runs_Conceded': 'runs_conceded', 'Wickets': 'wickets', 'Maidens': 'maidens', 'Overs': 'overs',
+        'Econ': 'economy', 'Pos_Bowl': 'bowling_pos', 'Pitch_Type': 'pitch_type', 'Weather': 'weather',
+        'Role': 'main_role', 'Bowling_Style': 'bowling_style',
+    },
+    'TEST': {
+        'Player Name': 'player_name', 'Date': 'date', 'Opposition': 'opposition', 'Ground': 'ground',
+        'Role': 'main_role', 'Runs_Scored': 'runs', 'Balls_Faced': 'balls_faced', '4s': 'fours',
+        '6s': 'sixes', 'SR': 'strike_rate', 'Pos_Bat': 'bat_position', 'Dismissal': 'dismissal',
+        'Runs_Conceded': 'runs_conceded', 'Wickets': 'wickets', 'Maidens': 'maidens', 'Overs': 'overs',
+        'Econ': 'economy', 'Pos_Bowl': 'bowling_pos', 'Pitch_Type': 'pitch_type', 'Weather': 'weather',
+        'Bowling_Action': 'bowling_style',
+    },
+}
+
+SKIP_COLUMNS = {'id', 'created_at'}  # Filled by the database
+IMPORT_CHUNK_SIZE = 5000
+COMMIT_EVERY = 50000                 # Rows per transaction
+MAX_REPORTED_REJECTIONS = 1000
+NULL_TOKENS = ('', '-')              # Placeholders for "no value" (e.g. bat_position '-' for did not bat)
+
+def _format_key(match_type):
+    key = str(match_type).upper()
+    if key not in FORMATS:
+        raise ValueError(f"Unknown match type: {match_type}")
+    return key
+
+def detect_format(filename):
+    """'ndjson' for .ndjson / .jsonl / .json files, otherwise 'csv'"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    return 'ndjson' if extension in ('.ndjson', '.jsonl', '.json') else 'csv'
+
+def read_chunks(source, file_format='csv', chunk_size=IMPORT_CHUNK_SIZE):
+    """Yield DataFrames of raw (string) values, chunk_size rows at a time"""
+    if file_format == 'ndjson':
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, encoding='latin1', dtype=str)
+
+def map_columns(headers, match_type):
+    """(rename, ignored): file header -> ORM column, and the headers with no column"""
+    table = FORMATS[match_type]['model'].__table__
+    by_name = {c.name.lower(): c.name for c in table.columns if c.name not in SKIP_COLUMNS}
+    mapping = COLUMN_MAPS[match_type]
+
+    rename, ignored, taken = {}, [], set()
+    for header in headers:
+        clean = str(header).strip().replace('"', '')
+        target = mapping.get(clean) or by_name.get(clean.lower())
+        if target and target not in taken:
+            rename[header] = target
+            taken.add(target)
+        else:
+            ignored.append(header)
+    return rename, ignored
+
+# ==========================================
+# Vectorized validation / coercion of one chunk
+# ==========================================
+def coerce_chunk(df, match_type, first_row=2):
+    """
+    Map, validate and coerce one chunk of raw rows.
+
+    Returns (records, rejections): insert-ready dicts for the valid rows, and
+    {'row', 'errors'} for the others. `first_row` is the file line of the
+    chunk's first row (2 for a CSV with a header line).
+    """
+    table = FORMATS[match_type]['model'].__table__
+    rename, _ = map_columns(df.columns, match_type)
+    df = df[list(rename)].rename(columns=rename)
+    n_rows = len(df)
+
+    columns = {}
+    problems = []  # (row mask, message)
+    for column in table.columns:
+        name = column.name
+        if name in SKIP_COLUMNS:
+            continue
+        default = column.default.arg if column.default is not None and column.default.is_scalar else None
+
+        if name not in df.columns:
+            if not column.nullable and default is None:
+                problems.append((np.ones(n_rows, dtype=bool), f"{name}: column missing"))
+            else:
+                columns[name] = pd.Series(default, index=df.index, dtype=object)
+            continue
+
+        text = df[name].astype('string')
+        blank = (text.isna() | text.str.strip().isin(NULL_TOKENS)).to_numpy(dtype=bool)
+
+        if isinstance(column.type, (sa_types.Integer, sa_types.Float)):
+            values = pd.to_numeric(text, errors='coerce')
+            bad = values.isna().to_numpy(dtype=bool) & ~blank
+            problems.append((bad, f"{name}: not a number"))
+            if isinstance(column.type, sa_types.Integer):
+                fractional = (values.notna() & (values % 1 != 0)).to_numpy(dtype=bool)
+                problems.append((fractional, f"{name}: not an integer"))
+                # Rejected rows are dropped; round() only so the cast accepts them
+                values = values.round().astype('Int64')
+        elif isinstance(column.type, (sa_types.Date, sa_types.DateTime)):
+            values = pd.to_datetime(text, errors='coerce', format='mixed')
+            bad = values.isna().to_numpy(dtype=bool) & ~blank
+            problems.append((bad, f"{name}: not a date"))
+            values = values.dt.date if isinstance(column.type, sa_types.Date) else values
+        else:
+            values = text
+            length = getattr(column.type, 'length', None)
+            if length:
+                problems.append(((text.str.len() > length).fillna(False).to_numpy(dtype=bool), f"{name}: longer than {length}"))
+
+        if not column.nullable and default is None:
+            problems.append((blank, f"{name}: required"))
+
+        values = values.astype(object).where(~blank, default)
+        columns[name] = values.where(values.notna(), default)
+
+    # Every row of the format gets its canonical match type label
+    columns['match_type'] = pd.Series(table.columns['match_type'].default.arg, index=df.index, dtype=object)
+
+    rejected = np.zeros(n_rows, dtype=bool)
+    for mask, _ in problems:
+        rejected |= mask
+
+    rejections = []
+    for position in np.flatnonzero(rejected):
+        rejections.append({
+            'row': first_row + int(position),
+            'errors': [message for mask, message in problems if mask[position]]
+        })
+
+    frame = pd.DataFrame(columns)[~rejected]
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict('records'), rejections
+
+# ==========================================
+# Import driver
+# ==========================================
+def refresh_derived(match_type):
+    """Rebuild the format's aggregates, bump the data version, drop cached predictions"""
+    rebuild(match_type)
+    bump_version()
+    db.session.commit()
+    prediction_cache.clear()
+
+def import_file(source, match_type, file_format='csv', chunk_size=IMPORT_CHUNK_SIZE,
+                commit_every=COMMIT_EVERY, dry_run=False, max_rejections=MAX_REPORTED_REJECTIONS):
+    """
+    Stream a CSV / NDJSON file into a performance table.
+
+    Valid rows are inserted with one executemany per chunk and committed
+    every `commit_every` rows; invalid rows are skipped and reported. The
+    aggregates are rebuilt and caches invalidated once, after the final
+    commit.
+    """
+    match_type = _format_key(match_type)
+    table = FORMATS[match_type]['model'].__table__
+    start = time.perf_counter()
+    report = {'match_type': match_type, 'format': file_format, 'dry_run': dry_run,
+              'inserted': 0, 'rejected': 0, 'rejections': [], 'ignored_columns': None}
+
+    # CSV rows start on line 2 (after the header), NDJSON rows on line 1
+    next_row = 2 if file_format == 'csv' else 1
+    uncommitted = committed = 0
+    try:
+        for chunk in read_chunks(source, file_format, chunk_size):
+            if report['ignored_columns'] is None:
+                report['ignored_columns'] = map_columns(chunk.columns, match_type)[1]
+
+            records, rejections = coerce_chunk(chunk, match_type, next_row)
+            next_row += len(chunk)
+            report['rejected'] += len(rejections)
+            report['rejections'].extend(rejections[:max(0, max_rejections - len(report['rejections']))])
+
+            if records and not dry_run:
+                db.session.execute(table.insert(), records)
+                uncommitted += len(records)
+                if uncommitted >= commit_every:
+                    db.session.commit()
+                    committed += uncommitted
+                    uncommitted = 0
+            report['inserted'] += len(records)
+
+        if not dry_run:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        if committed:
+            # Earlier chunks stay committed; try to keep derived data in step,
+            # without hiding the original error
+            try:
+                refresh_derived(match_type)
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Aggregate rebuild after failed import failed: {e}")
+        raise
+
+    if not dry_run and report['inserted']:
+        refresh_derived(match_type)
+
+    report['ignored_columns'] = report['ignored_columns'] or []
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+# ==========================================
+# Bundled CSVs (seed for the in-memory database profile)
+# ==========================================
+BUNDLED_CSVS = {
+    'ODI': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ODI', 'odi_performance.csv'),
+    'T20': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'T20', 't20_performance.csv'),
+    'TEST': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'Test', 'test_performance.csv'),
+}
+
+def seed_from_csv():
+    """Import the bundled CSVs into empty performance tables; {format: rows inserted}"""
+    counts = {}
+    for match_type, path in BUNDLED_CSVS.items():
+        model = FORMATS[match_type]['model']
+        if not os.path.exists(path) or db.session.query(model.id).first() is not None:
+            continue
+        counts[match_type] = import_file(path, match_type)['inserted']
+    return counts
+
+# ==========================================
+# CLI: flask import-data FILE --match-type T20
+# ==========================================
+def register_commands(app):
+    @app.cli.command('import-data')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--match-type', required=True, help='ODI, T20 or TEST')
+    @click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), default=None,
+                  help='Default: from the file extension')
+    @click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True)
+    @click.option('--dry-run', is_flag=True, help='Validate only, insert nothing')
+    def import_data_command(path, match_type, file_format, chunk_size, dry_run):
+        """Bulk import a CSV / NDJSON file into a performance table."""
+        from startup import init_cli_database
+        init_cli_database(app)
+        report = import_file(path, match_type, file_format or detect_format(path), chunk_size, dry_run=dry_run)
+        for rejection in report['rejections'][:50]:
+            click.echo(f"✗ row {rejection['row']}: {'; '.join(rejection['errors'])}")
+        if report['ignored_columns']:
+            click.echo(f"⚠ Ignored columns: {', '.join(map(str, report['ignored_columns']))}")
+        action = 'Validated' if dry_run else 'Imported'
+        click.echo(f"✓ {action} {report['inserted']} rows, rejected {report['rejected']} ({report['seconds']}s)")
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import pandas as pd
+
+# ==========================================
+# Columnar (Parquet) cache of the source CSVs
+# ==========================================
+# Each CSV is parsed once, projected and typed, and saved as Parquet next to
+# it (.cache/) or in CSV_CACHE_DIR. Later loads read the Parquet file while
+# the CSV's mtime + size (or, failing that, its content hash) is unchanged;
+# a changed CSV is converted again. Without pyarrow the CSV is parsed directly.
+CSV_CACHE_ENABLED = os.getenv('CSV_CACHE', '1') == '1'
+CSV_CACHE_DIR = os.getenv('CSV_CACHE_DIR')
+
+# Label-encoded copies and empty export columns: nothing reads them
+DROP_COLUMNS = re.compile(r'(_ID|_Encoded)$|^Unnamed')
+
+# Text columns with few distinct values (compared stripped + lower-case)
+CATEGORY_COLUMNS = {
+    'match_type', 'player_name', 'player name', 'date', 'opposition', 'ground', 'pitch_type', 'weather',
+    'main_role', 'role', 'batting_style', 'bowling_style', 'bowling_action', 'dismissal',
+    'ground_size', 'opposition_bowling_strength', 'pressure_level', 'match_time'
+}
+
+CACHE_VERSION = 1
+# Cached files made under other projection / dtype rules are converted again
+SCHEMA_FINGERPRINT = hashlib.sha1(
+    json.dumps([CACHE_VERSION, DROP_COLUMNS.pattern, sorted(CATEGORY_COLUMNS)]).encode()
+).hexdigest()[:16]
+METADATA_KEY = b'cricket_csv_cache'
+
+_pyarrow_warned = False
+
+def _pyarrow():
+    """pyarrow (+ parquet) modules, or None when not installed"""
+    global _pyarrow_warned
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        if not _pyarrow_warned:
+            print("⚠ pyarrow not installed - CSV cache disabled, parsing CSVs directly")
+            _pyarrow_warned = True
+        return None
+
+def _clean(column):
+    return str(column).strip().replace('"', '')
+
+def csv_schema(path, encoding='latin1'):
+    """(kept columns, dtypes) for a CSV: projection + category columns from its header"""
+    headers = pd.read_csv(path, encoding=encoding, nrows=0).columns
+    keep = [c for c in headers if not DROP_COLUMNS.search(_clean(c))]
+    dtypes = {c: 'category' for c in keep if _clean(c).lower() in CATEGORY_COLUMNS}
+    return keep, dtypes
+
+def parse_csv(path, encoding='latin1'):
+    """The CSV with the projection and dtypes applied (no cache)"""
+    keep, dtypes = csv_schema(path, encoding)
+    return pd.read_csv(path, encoding=encoding, usecols=keep, dtype=dtypes)
+
+def cache_path(path):
+    """Parquet file caching a CSV"""
+    path = os.path.abspath(path)
+    directory = CSV_CACHE_DIR or os.path.join(os.path.dirname(path), '.cache')
+    stem = os.path.splitext(os.path.basename(path))[0]
+    # Path hash: several source trees can share one CSV_CACHE_DIR
+    return os.path.join(directory, f"{stem}-{hashlib.sha1(path.encode()).hexdigest()[:8]}.parquet")
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _source_info(path):
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def _cached_info(pa, cached):
+    """Source info stored in a cache file, None if missing / unreadable / other schema"""
+    try:
+        metadata = pa.parquet.read_schema(cached).metadata or {}
+        info = json.loads(metadata[METADATA_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+    return info if info.get('schema') == SCHEMA_FINGERPRINT else None
+
+def _write(pa, df, cached, info):
+    """Write df + source info atomically (concurrent workers never see half a file)"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps({**info, 'schema': SCHEMA_FINGERPRINT}).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cached), suffix='.tmp')
+    os.close(fd)
+    try:
+        pa.parquet.write_table(table, tmp)
+        os.replace(tmp, cached)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def _try_write(pa, df, cached, info):
+    try:
+        _write(pa, df, cached, info)
+    except (OSError, pa.ArrowException) as e:
+        # Read-only checkout etc.: the parsed frame is still good
+        print(f"⚠ Could not write CSV cache {cached}: {e}")
+
+def read_csv(path, encoding='latin1'):
+    """
+    DataFrame of a CSV (projected columns, categories) via its Parquet cache.
+
+    FileNotFoundError when the CSV does not exist, like pd.read_csv.
+    """
+    source = _source_info(path)  # Raises FileNotFoundError first
+    pa = _pyarrow() if CSV_CACHE_ENABLED else None
+    if pa is None:
+        return parse_csv(path, encoding)
+
+    cached = cache_path(path)
+    info = _cached_info(pa, cached)
+    if info is not None:
+        same_stat = info['mtime_ns'] == source['mtime_ns'] and info['size'] == source['size']
+        # Touched but identical (checkout, copy): hash once, then restamp the cache
+        if same_stat or (info['size'] == source['size'] and info['sha1'] == file_hash(path)):
+            df = pd.read_parquet(cached, engine='pyarrow')
+            if not same_stat:
+                _try_write(pa, df, cached, {**source, 'sha1': info['sha1']})
+            return df
+
+    df = parse_csv(path, encoding)
+    _try_write(pa, df, cached, {**source, 'sha1': file_hash(path)})
+    print(f"✓ Cached {os.path.basename(path)} as Parquet ({len(df)} rows, {len(df.columns)} columns)")
+    return df
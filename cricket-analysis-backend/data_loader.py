@@ -1,17 +1,32 @@
 import pandas as pd
-import joblib
+import numpy as np
 import os
+import threading
+import encoding
+import columnar_cache
+from pandas.api.types import union_categoricals
+from sqlalchemy import select, types as sa_types
 
 # Global Variables - Organized by Match Type
+# Each match type keeps ONE columnar frame; batting/bowling are boolean masks over it
 datasets = {
-    'ODI': {'batting': pd.DataFrame(), 'bowling': pd.DataFrame()},
-    'T20': {'batting': pd.DataFrame(), 'bowling': pd.DataFrame()},
-    'Test': {'batting': pd.DataFrame(), 'bowling': pd.DataFrame()}
+    'ODI': {'frame': pd.DataFrame(), 'batting': None, 'bowling': None},
+    'T20': {'frame': pd.DataFrame(), 'batting': None, 'bowling': None},
+    'Test': {'frame': pd.DataFrame(), 'batting': None, 'bowling': None}
 }
 
+# Column that marks a batting / bowling record in each format
+RUN_COLUMNS = {'ODI': 'batting_runs', 'T20': 'runs', 'Test': 'runs'}
+WICKET_COLUMNS = {'ODI': 'wicket_taken', 'T20': 'wickets', 'Test': 'wickets'}
+
+# Rows fetched per round trip by the columnar loader
+LOAD_CHUNK_SIZE = 5000
+
 df_players_ml = pd.DataFrame()
 model = None
 model_info = None  # Will contain encoders and feature info
+encoding_tables = {}  # Compiled lookup tables for model_info['encoders']
+_encoding_source = None
 default_weather = 'Balanced'
 
 WICKET_KEEPER_NAMES = {
@@ -23,13 +38,71 @@ ALL_ROUNDER_NAMES = {
     'Dunith Wellalage', 'Chamika Karunaratne', 'Charith Asalanka', 'Janith Liyanage'
 }
 
-# Backward compatibility aliases
-df_batting = None  # Will be set to ODI data
-df_bowling = None  # Will be set to ODI data
+def _normalize_match_type(match_type):
+    """Map 'odi' / 'TEST' / 'Test' style inputs onto the keys used in datasets"""
+    lookup = {key.upper(): key for key in datasets}
+    return lookup.get(str(match_type).upper())
+
+def _build_masks(frame, run_candidates, wicket_candidates):
+    """Boolean batting/bowling masks over a frame (no row copies)"""
+    run_col = next((c for c in run_candidates if c in frame.columns), None)
+    wicket_col = next((c for c in wicket_candidates if c in frame.columns), None)
+
+    if run_col:
+        batting = pd.to_numeric(frame[run_col], errors='coerce').fillna(0).to_numpy() > 0
+    else:
+        batting = np.ones(len(frame), dtype=bool)
+
+    if wicket_col:
+        bowling = pd.to_numeric(frame[wicket_col], errors='coerce').fillna(0).to_numpy() > 0
+    else:
+        bowling = np.zeros(len(frame), dtype=bool)
+
+    return batting, bowling
+
+def _chunk_to_array(values, column):
+    """Convert one chunk of raw DB values into a typed array for its column"""
+    col_type = column.type
+    if isinstance(col_type, sa_types.Integer):
+        return pd.array(values, dtype='Int64')
+    if isinstance(col_type, sa_types.Float):
+        return np.array(values, dtype=np.float64)
+    if isinstance(col_type, (sa_types.Date, sa_types.DateTime)):
+        return pd.to_datetime(pd.Series(values, dtype=object), errors='coerce').to_numpy()
+    # Text columns repeat heavily (players, grounds, roles) - store as categories
+    return pd.Categorical(values)
+
+def _concat_chunks(chunks, column):
+    """Join the per-chunk arrays of one column into a single typed column"""
+    if not chunks:
+        return pd.Series([], dtype=object)
+    if isinstance(chunks[0], pd.Categorical):
+        return pd.Series(union_categoricals(chunks))
+    if isinstance(chunks[0], np.ndarray):
+        return pd.Series(np.concatenate(chunks))
+    return pd.Series(pd.concat([pd.Series(c) for c in chunks], ignore_index=True).array)
+
+def fetch_table_columnar(model_class, session, chunk_size=LOAD_CHUNK_SIZE):
+    """
+    Read a whole performance table with one Core SELECT into a typed DataFrame.
+
+    Rows are pulled in chunks of `chunk_size` and converted straight into
+    NumPy/pandas column arrays, so no ORM objects or per-row dicts are built.
+    """
+    columns = list(model_class.__table__.columns)
+    stmt = select(*columns).execution_options(yield_per=chunk_size)
+    result = session.execute(stmt)
+
+    chunks = {column.name: [] for column in columns}
+    for partition in result.partitions(chunk_size):
+        for column, values in zip(columns, zip(*partition)):
+            chunks[column.name].append(_chunk_to_array(values, column))
+
+    return pd.DataFrame({column.name: _concat_chunks(chunks[column.name], column) for column in columns})
 
 def load_data_by_match_type():
     """Load data for all match types from database"""
-    global datasets, df_batting, df_bowling
+    global datasets
     
     try:
         from models import ODIPerformance, T20Performance, TestPerformance
@@ -44,31 +117,19 @@ def load_data_by_match_type():
         
         for match_type, model_class in model_map.items():
             try:
-                # Query all records for this match type
-                records = db.session.query(model_class).all()
+                frame = fetch_table_columnar(model_class, db.session)
                 
-                if records:
-                    # Convert to dataframe
-                    data = [record.to_dict() for record in records]
+                if not frame.empty:
+                    batting, bowling = _build_masks(frame, [RUN_COLUMNS[match_type]], [WICKET_COLUMNS[match_type]])
+                    datasets[match_type] = {'frame': frame, 'batting': batting, 'bowling': bowling}
                     
-                    # Separate batting and bowling
-                    batting_data = [d for d in data if d.get('runs', 0) > 0]
-                    bowling_data = [d for d in data if d.get('wickets', 0) > 0]
-                    
-                    datasets[match_type]['batting'] = pd.DataFrame(batting_data) if batting_data else pd.DataFrame()
-                    datasets[match_type]['bowling'] = pd.DataFrame(bowling_data) if bowling_data else pd.DataFrame()
-                    
-                    print(f"✓ Loaded {match_type}: {len(batting_data)} batting, {len(bowling_data)} bowling records")
+                    print(f"✓ Loaded {match_type}: {int(batting.sum())} batting, {int(bowling.sum())} bowling records")
                 else:
                     print(f"⚠ No {match_type} data in database")
                     
             except Exception as e:
                 print(f"⚠ Error loading {match_type} from database: {e}")
         
-        # Set backward compatibility variables (default to ODI)
-        df_batting = datasets['ODI']['batting']
-        df_bowling = datasets['ODI']['bowling']
-        
     except Exception as e:
         print(f"Error in load_data_by_match_type: {e}")
         # Fallback: try loading from CSV
@@ -76,7 +137,7 @@ def load_data_by_match_type():
 
 def load_data_from_csv():
     """Fallback: Load data from CSV files if database unavailable"""
-    global datasets, df_batting, df_bowling
+    global datasets
     
     csv_files = {
         'data/ODI/odi_performance.csv': 'ODI',
@@ -86,25 +147,30 @@ def load_data_from_csv():
     
     for filename, match_type in csv_files.items():
         try:
-            df = pd.read_csv(filename, encoding='latin1')
+            df = columnar_cache.read_csv(filename)
             df.columns = df.columns.str.strip().str.replace('"', '')
             
-            # Separate batting and bowling
-            batting = df[df.get('runs', 0) > 0] if 'runs' in df.columns else df
-            bowling = df[df.get('wickets', 0) > 0] if 'wickets' in df.columns else pd.DataFrame()
-            
-            datasets[match_type]['batting'] = batting
-            datasets[match_type]['bowling'] = bowling
+            # Separate batting and bowling (T20/Test CSVs use 'Runs_Scored' / 'Wickets')
+            batting, bowling = _build_masks(
+                df,
+                [RUN_COLUMNS[match_type], 'runs', 'Runs_Scored'],
+                [WICKET_COLUMNS[match_type], 'wickets', 'Wickets']
+            )
+            datasets[match_type] = {'frame': df, 'batting': batting, 'bowling': bowling}
             
             print(f"✓ Loaded {match_type} from CSV ({filename})")
         except FileNotFoundError:
             print(f"⚠ CSV file not found: {filename}")
         except Exception as e:
             print(f"⚠ Error loading {match_type} from CSV: {e}")
-    
-    # Set backward compatibility
-    df_batting = datasets['ODI']['batting']
-    df_bowling = datasets['ODI']['bowling']
+
+def __getattr__(name):
+    # Backward compatibility aliases (ODI data), built only when someone asks for them
+    if name == 'df_batting':
+        return get_dataset('ODI', 'batting')
+    if name == 'df_bowling':
+        return get_dataset('ODI', 'bowling')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Try loading from database first, fallback to CSV
 try:
@@ -131,7 +197,7 @@ def load_ml_dataset():
         
         for filename in possible_files:
             try:
-                df_temp = pd.read_csv(filename, encoding='latin1')
+                df_temp = columnar_cache.read_csv(filename)
                 loaded_file = filename
                 print(f"✓ Successfully loaded ML dataset from: {filename}")
                 break
@@ -172,8 +238,8 @@ def load_ml_dataset():
                 df_players_ml['Player_Name'] = df_players_ml.iloc[:, 0]
         
         # Derive Player_Type from Role if not present
-        def derive_player_type(row):
-            role = str(row.get('Role', '')).lower()
+        def derive_player_type(role):
+            role = role.lower()
             
             if 'keeper' in role or 'wicket' in role:
                 return 'Wicket Keeper'
@@ -185,7 +251,10 @@ def load_ml_dataset():
                 return 'Batsman'
         
         if 'Player_Type' not in df_players_ml.columns:
-            df_players_ml['Player_Type'] = df_players_ml.apply(derive_player_type, axis=1)
+            # Depends on the role text only: derive once per distinct role
+            roles = df_players_ml['Role'].astype(str) if 'Role' in df_players_ml.columns else pd.Series('', index=df_players_ml.index)
+            player_types = {role: derive_player_type(role) for role in roles.unique()}
+            df_players_ml['Player_Type'] = roles.map(player_types).astype(object)
         
         # Set default weather
         if 'Weather' in df_players_ml.columns and not df_players_ml['Weather'].dropna().empty:
@@ -205,6 +274,7 @@ def load_ml_dataset():
 
 def load_ml_model():
     global model, model_info
+    import joblib
     try:
         if os.path.exists("best_xi_model.joblib"):
             model = joblib.load("best_xi_model.joblib")
@@ -213,6 +283,7 @@ def load_ml_model():
             # Try to load encoders
             if os.path.exists("best_xi_model_encoders.joblib"):
                 model_info = joblib.load("best_xi_model_encoders.joblib")
+                get_encoding_tables()
                 print("✓ Model encoders loaded successfully.")
             else:
                 print("⚠ Model encoders file not found - will attempt predictions without encoders")
@@ -230,9 +301,29 @@ def load_ml_model():
         model_info = None
         return False
 
-# Initialize ML components
-load_ml_model()
-load_ml_dataset()
+# ML components load on first use (or from the warm-up thread), not at import
+_ml_lock = threading.Lock()
+_ml_loaded = False
+
+def ensure_ml_loaded():
+    """Load the best XI model and ML dataset once; returns True if the model is available"""
+    global _ml_loaded
+    if not _ml_loaded:
+        with _ml_lock:
+            if not _ml_loaded:
+                load_ml_model()
+                load_ml_dataset()
+                _ml_loaded = True
+    return model is not None
+
+def ml_status():
+    """What the ML side has loaded so far (for /api/health/ready)"""
+    return {
+        "loaded": _ml_loaded,
+        "model": model is not None,
+        "encoders": model_info is not None,
+        "dataset_rows": len(df_players_ml)
+    }
 
 # Initialize match type data (will be called after app initialization)
 def initialize_match_type_data(app=None):
@@ -250,10 +341,25 @@ def initialize_match_type_data(app=None):
 # Expose datasets for other modules
 def get_dataset(match_type='ODI', data_type='batting'):
     """Get dataset for specific match type (batting or bowling)"""
-    match_type = match_type.upper()
-    if match_type in datasets and data_type in datasets[match_type]:
-        return datasets[match_type][data_type]
-    return pd.DataFrame()
+    frame = get_frame(match_type)
+    mask = get_mask(match_type, data_type)
+    if mask is None or frame.empty:
+        return pd.DataFrame()
+    return frame[mask]
+
+def get_frame(match_type='ODI'):
+    """Full columnar frame for a match type (shared, do not modify in place)"""
+    key = _normalize_match_type(match_type)
+    if key is None:
+        return pd.DataFrame()
+    return datasets[key]['frame']
+
+def get_mask(match_type='ODI', data_type='batting'):
+    """Boolean batting/bowling mask over get_frame(match_type), or None"""
+    key = _normalize_match_type(match_type)
+    if key is None or data_type not in ('batting', 'bowling'):
+        return None
+    return datasets[key][data_type]
 
 def get_all_match_types():
     """Get list of all available match types"""
@@ -262,22 +368,31 @@ def get_all_match_types():
 # ========================================================================
 # PREDICTION HELPER
 # ========================================================================
-def predict_player_scores(opposition, pitch_type, weather, player_name, player_role):
+def get_encoding_tables():
+    """Lookup tables compiled from model_info['encoders'] (recompiled if model_info changes)"""
+    global encoding_tables, _encoding_source
+    if _encoding_source is not model_info:
+        encoding_tables = encoding.compile_label_encoders((model_info or {}).get('encoders'))
+        _encoding_source = model_info
+    return encoding_tables
+
+def predict_player_scores_batch(players, opposition, pitch_type, weather):
     """
-    Predict player scores using the ML model with proper feature encoding
+    Predict scores for a whole squad with a single model call
     
     Args:
+        players: List of (player_name, player_role) tuples
         opposition: String (e.g., 'India')
         pitch_type: String (e.g., 'spin', 'bouncy')
         weather: String (e.g., 'humid', 'sunny')
-        player_name: String (player name)
-        player_role: String (e.g., 'batting', 'bowling')
     
     Returns:
-        Tuple of (batting_score, bowling_score) or None if prediction fails
+        NumPy array of shape (len(players), 2) with (batting_score, bowling_score)
+        per player, or None if prediction fails
     """
     global model, model_info, df_players_ml
     
+    ensure_ml_loaded()
     if model is None:
         print("Error: ML model not loaded")
         return None
@@ -291,44 +406,53 @@ def predict_player_scores(opposition, pitch_type, weather, player_name, player_r
         return None
     
     try:
-        # Get encoders
-        encoders = model_info.get('encoders', {})
+        # Compiled encoders
+        tables = get_encoding_tables()
         feature_columns = model_info.get('feature_columns', [])
+        n_players = len(players)
+        roles = [role for _, role in players]
         
-        # Encode categorical features
-        encoded_role = encoders['main_role'].transform([player_role])[0] if player_role in encoders['main_role'].classes_ else 0
-        encoded_opposition = encoders['opposition'].transform([opposition])[0] if opposition in encoders['opposition'].classes_ else 0
-        encoded_pitch = encoders['pitch_type'].transform([pitch_type])[0] if pitch_type in encoders['pitch_type'].classes_ else 0
-        encoded_weather = encoders['weather'].transform([weather])[0] if weather in encoders['weather'].classes_ else 0
-        encoded_style = encoders['batting_style'].transform(['No_Bowling'])[0]  # Default batting style
-        
-        # Create input DataFrame with all required features
-        input_data = pd.DataFrame({
-            'main_role_encoded': [encoded_role],
-            'opposition_encoded': [encoded_opposition],
-            'pitch_type_encoded': [encoded_pitch],
-            'weather_encoded': [encoded_weather],
-            'batting_style_encoded': [encoded_style],
-            'runs': [0],
-            'strike_rate': [0],
-            'wickets': [0],
-            'economy': [0],
-            'average': [0],
-            'balls_faced': [0],
-            'fours': [0],
-            'sixes': [0]
-        })
-        
-        # Reorder to match training features
-        input_data = input_data[feature_columns]
+        # One contiguous feature matrix for the squad (numeric inputs stay 0)
+        features = np.zeros((n_players, len(feature_columns)), dtype=np.float64)
+        column_index = {name: i for i, name in enumerate(feature_columns)}
         
-        # Make prediction
-        prediction = model.predict(input_data)[0]
-        batting_score, bowling_score = prediction
+        encoded = {
+            'main_role_encoded': tables['main_role'].encode(roles),
+            'opposition_encoded': tables['opposition'].code(opposition),
+            'pitch_type_encoded': tables['pitch_type'].code(pitch_type),
+            'weather_encoded': tables['weather'].code(weather),
+            'batting_style_encoded': tables['batting_style'].code('No_Bowling')  # Default batting style
+        }
+        for name, values in encoded.items():
+            if name in column_index:
+                features[:, column_index[name]] = values
         
-        return float(batting_score), float(bowling_score)
+        # Make prediction (column names kept so the model sees its training features)
+        predictions = model.predict(pd.DataFrame(features, columns=feature_columns, copy=False))
+        return np.asarray(predictions, dtype=np.float64).reshape(n_players, -1)
     except Exception as e:
-        print(f"Error predicting for {player_name}: {e}")
+        print(f"Error predicting squad of {len(players)}: {e}")
         import traceback
         traceback.print_exc()
-        return None
\ No newline at end of file
+        return None
+
+def predict_player_scores(opposition, pitch_type, weather, player_name, player_role):
+    """
+    Predict player scores using the ML model with proper feature encoding
+    
+    Args:
+        opposition: String (e.g., 'India')
+        pitch_type: String (e.g., 'spin', 'bouncy')
+        weather: String (e.g., 'humid', 'sunny')
+        player_name: String (player name)
+        player_role: String (e.g., 'batting', 'bowling')
+    
+    Returns:
+        Tuple of (batting_score, bowling_score) or None if prediction fails
+    """
+    predictions = predict_player_scores_batch([(player_name, player_role)], opposition, pitch_type, weather)
+    if predictions is None:
+        return None
+    
+    batting_score, bowling_score = predictions[0][:2]
+    return float(batting_score), float(bowling_score)
@@ -0,0 +1,25 @@
+from sqlalchemy import update
+from models import db, DatasetVersion
+
+# Single row holding the version of the performance tables
+VERSION_ROW_ID = 1
+
+def get_version():
+    """Current dataset version (0 before the first write)"""
+    version = db.session.query(DatasetVersion.version).filter(DatasetVersion.id == VERSION_ROW_ID).scalar()
+    return version or 0
+
+def bump_version():
+    """
+    Stage a version increment on db.session.
+
+    Call it next to any write to odi/t20/test_performance so the bump is
+    committed (or rolled back) together with the data change.
+    """
+    result = db.session.execute(
+        update(DatasetVersion)
+        .where(DatasetVersion.id == VERSION_ROW_ID)
+        .values(version=DatasetVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.session.add(DatasetVersion(id=VERSION_ROW_ID, version=1))
@@ -0,0 +1,76 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# ==========================================
+# Connection pool with checkout wait / saturation metrics
+# ==========================================
+_stats_lock = threading.Lock()
+_stats = {'checkouts': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0, 'timeouts': 0, 'peak_checked_out': 0}
+_nested = threading.local()
+_current_pool = None  # Latest InstrumentedQueuePool (engine.dispose() recreates the pool)
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout from the pool.
+
+    The wait covers queueing for a free connection (and opening a new one
+    while under capacity); a checkout that gives up after pool_timeout
+    counts as a timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        global _current_pool
+        super().__init__(*args, **kwargs)
+        _current_pool = self
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call
+        if getattr(_nested, 'active', False):
+            return super()._do_get()
+        _nested.active = True
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            with _stats_lock:
+                _stats['timeouts'] += 1
+            raise
+        finally:
+            _nested.active = False
+        wait = time.perf_counter() - start
+        with _stats_lock:
+            _stats['checkouts'] += 1
+            _stats['wait_seconds'] += wait
+            _stats['max_wait_seconds'] = max(_stats['max_wait_seconds'], wait)
+            _stats['peak_checked_out'] = max(_stats['peak_checked_out'], self.checkedout())
+        return entry
+
+def pool_stats():
+    """Cumulative checkout metrics plus the current pool's occupancy"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['mean_wait_ms'] = round(stats['wait_seconds'] * 1000 / stats['checkouts'], 3) if stats['checkouts'] else 0.0
+    stats['max_wait_ms'] = round(stats.pop('max_wait_seconds') * 1000, 3)
+    stats['wait_seconds'] = round(stats['wait_seconds'], 6)
+
+    pool = _current_pool
+    if pool is not None:
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        stats.update({
+            'pool_size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'checked_out': checked_out,
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'capacity': capacity,
+            'saturation': round(checked_out / capacity, 3) if capacity else 0.0
+        })
+    return stats
+
+def reset_pool_stats():
+    """Zero the cumulative counters (benchmarks)"""
+    with _stats_lock:
+        _stats.update(checkouts=0, wait_seconds=0.0, max_wait_seconds=0.0, timeouts=0, peak_checked_out=0)
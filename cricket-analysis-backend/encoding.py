@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# Label used for categories a model never saw during training
+UNKNOWN_LABEL = 'Unknown'
+
+# ==========================================
+# Compiled lookup table for one categorical feature
+# ==========================================
+class CategoryTable:
+    """
+    Dict/array backed lookup compiled once from a fitted encoder's classes.
+
+    encode() maps labels to integer codes, labels() maps them onto the known
+    label set; anything unseen falls into the unknown bucket (code
+    `unknown_code`, label `unknown_label`).
+    """
+
+    def __init__(self, classes, unknown_code=0, unknown_label=UNKNOWN_LABEL):
+        self.classes = np.asarray(classes, dtype=object)
+        self.index = pd.Index(self.classes)
+        self.codes = {label: i for i, label in enumerate(self.classes)}
+        self.unknown_code = unknown_code
+        self.unknown_label = unknown_label
+
+    def __contains__(self, label):
+        return label in self.codes
+
+    def code(self, label):
+        """Code of a single label"""
+        return self.codes.get(label, self.unknown_code)
+
+    def encode(self, values):
+        """Vectorized codes for a whole column (int64 array)"""
+        codes = self.index.get_indexer(pd.Index(np.asarray(values, dtype=object)))
+        codes[codes < 0] = self.unknown_code
+        return codes.astype(np.int64, copy=False)
+
+    def labels(self, values):
+        """Column as a Categorical over the known labels plus the unknown bucket"""
+        categories = self.index if self.unknown_label in self.codes else self.index.append(pd.Index([self.unknown_label]))
+        column = pd.Categorical(np.asarray(values, dtype=object), categories=categories)
+        return column.fillna(self.unknown_label)
+
+# ==========================================
+# Compilers
+# ==========================================
+def compile_label_encoders(encoders):
+    """{feature: LabelEncoder} (best_xi_model_encoders.joblib) -> {feature: CategoryTable}"""
+    return {name: CategoryTable(encoder.classes_) for name, encoder in (encoders or {}).items()}
+
+def _category_encoders(obj, seen=None):
+    """Yield (columns, encoder) for every fitted One-Hot/Ordinal encoder inside a model"""
+    seen = seen if seen is not None else set()
+    if obj is None or id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    # ColumnTransformer: fitted (name, transformer, columns) triples
+    for _, transformer, columns in getattr(obj, 'transformers_', []):
+        if hasattr(transformer, 'categories_'):
+            yield list(columns), transformer
+        else:
+            for found_columns, encoder in _category_encoders(transformer, seen):
+                yield (found_columns if found_columns else list(columns)), encoder
+
+    # Pipeline steps, meta-estimators (MultiOutputRegressor etc.)
+    for _, step in getattr(obj, 'steps', []):
+        if hasattr(step, 'categories_'):
+            yield list(getattr(step, 'feature_names_in_', [])), step
+        else:
+            yield from _category_encoders(step, seen)
+    for attr in ('estimator', 'regressor', 'regressor_'):
+        yield from _category_encoders(getattr(obj, attr, None), seen)
+    for estimator in getattr(obj, 'estimators_', [])[:1]:
+        yield from _category_encoders(estimator, seen)
+
+def compile_pipeline_categories(pipeline):
+    """Per-column CategoryTable for the categorical inputs of a fitted sklearn pipeline"""
+    tables = {}
+    for columns, encoder in _category_encoders(pipeline):
+        for column, categories in zip(columns, encoder.categories_):
+            tables[column] = CategoryTable(categories)
+    return tables
+
+def prepare_categoricals(df, tables, columns):
+    """
+    Put categorical model inputs in the shape the model was trained on.
+
+    Columns with a compiled table become Categoricals over the training
+    labels (unseen -> unknown bucket); others fall back to strings.
+    """
+    for column in columns:
+        values = df[column] if column in df.columns else pd.Series(UNKNOWN_LABEL, index=df.index)
+        if column in tables:
+            df[column] = tables[column].labels(values)
+        else:
+            df[column] = values.fillna(UNKNOWN_LABEL).astype(str)
+    return df
@@ -0,0 +1,27 @@
+# Production serving: gunicorn -c gunicorn.conf.py app:app
+#
+# The app, models and ML dataset are loaded ONCE in the master process and
+# moved to read-only memory-mapped artifacts before the workers are forked,
+# so adding workers adds little memory (see benchmarks/bench_worker_memory.py).
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+preload_app = True
+
+def when_ready(server):
+    """Master, after the preloaded import and before the first fork"""
+    import startup
+    from app import app
+    startup.prepare_for_fork(app)
+
+def post_fork(server, worker):
+    import startup
+    from app import app
+    startup.reset_after_fork(app)
+
+def on_exit(server):
+    import shared_artifacts
+    shared_artifacts.cleanup()
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ==========================================
+# Settings
+# ==========================================
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))  # Log statements slower than this
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# ==========================================
+# Histogram / counter (recorded on every request, rendered only on scrape)
+# ==========================================
+class Histogram:
+    """Prometheus-style histogram with one series per label tuple"""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1  # Non-cumulative here; cumulated when rendered
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(snapshot.items()):
+            base = _label_text(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                le = bound if bound == '+Inf' else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{le}"}} {cumulative}')
+            braces = f"{{{base}}}" if base else ''
+            lines.append(f"{self.name}_sum{braces} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{braces} {series[-1]}")
+        return lines
+
+class Counter:
+    """Monotonic counter with one series per label tuple"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            snapshot = dict(self._series)
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(snapshot.items()):
+            base = _label_text(self.label_names, labels)
+            lines.append(f"{self.name}{{{base}}} {value}" if base else f"{self.name} {value}")
+        return lines
+
+def _label_text(names, values):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return ','.join(f'{n}="{v}"' for n, v in zip(names, escaped))
+
+# ==========================================
+# Metrics
+# ==========================================
+request_latency = Histogram(
+    'cricket_http_request_duration_seconds', 'Request latency per route', ('blueprint', 'route', 'method', 'status'))
+request_queries = Histogram(
+    'cricket_http_request_sql_queries', 'SQL statements executed per request', ('route',), QUERY_COUNT_BUCKETS)
+request_sql_time = Histogram(
+    'cricket_http_request_sql_duration_seconds', 'Time spent in SQL per request', ('route',))
+sql_duration = Histogram(
+    'cricket_sql_query_duration_seconds', 'SQL statement latency by statement type', ('operation',))
+slow_queries = Counter(
+    'cricket_sql_slow_queries_total', 'SQL statements slower than SLOW_QUERY_MS', ('operation',))
+inference_latency = Histogram(
+    'cricket_model_inference_seconds', 'Model prediction time per call', ('model',))
+
+# ==========================================
+# Request middleware
+# ==========================================
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+
+def _after_request(response):
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return response
+    # Streamed bodies are timed up to the first byte (the generator runs later)
+    elapsed = time.perf_counter() - start
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    request_latency.observe((request.blueprint or '', route, request.method, str(response.status_code)), elapsed)
+    request_queries.observe((route,), g.get('sql_queries', 0))
+    request_sql_time.observe((route,), g.get('sql_seconds', 0.0))
+    return response
+
+# ==========================================
+# SQL hooks (every engine and thread)
+# ==========================================
+# The start time lives on the statement's execution context: a statement
+# that raises never reaches after_cursor_execute, and its context (with the
+# start time) is simply dropped instead of being left on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_query_start', None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+    sql_duration.observe((operation,), elapsed)
+
+    if has_request_context():
+        g.sql_queries = g.get('sql_queries', 0) + 1
+        g.sql_seconds = g.get('sql_seconds', 0.0) + elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_queries.inc((operation,))
+        where = f" [{request.method} {request.path}]" if has_request_context() else ''
+        print(f"⚠ Slow query ({elapsed * 1000:.0f} ms){where}: {' '.join(statement.split())[:500]}")
+
+# ==========================================
+# Model inference timer
+# ==========================================
+_captured = threading.local()
+
+@contextmanager
+def inference_timer(model):
+    """with inference_timer('odi'): ... -> cricket_model_inference_seconds{model="odi"}"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings = getattr(_captured, 'timings', None)
+        if timings is not None:
+            timings.append((model, elapsed))
+        elif METRICS_ENABLED:
+            inference_latency.observe((model,), elapsed)
+
+@contextmanager
+def capture_inference():
+    """
+    Collect this thread's inference timings in a list instead of the histogram.
+    Job workers are separate processes whose histograms are never scraped:
+    they return the list with the result and the Flask process records it.
+    """
+    timings = []
+    _captured.timings = timings
+    try:
+        yield timings
+    finally:
+        _captured.timings = None
+
+def record_inference(timings):
+    """Record (model, seconds) pairs captured in a job worker"""
+    if METRICS_ENABLED:
+        for model, seconds in timings:
+            inference_latency.observe((model,), seconds)
+
+# ==========================================
+# Setup + Prometheus text
+# ==========================================
+def init_app(app):
+    """Register the request middleware and SQL hooks (no-op when METRICS_ENABLED=0)"""
+    if not METRICS_ENABLED:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+def render_prometheus(extra=()):
+    """Exposition text for every metric plus unlabelled (name, type, help, value) samples"""
+    lines = []
+    for metric in (request_latency, request_queries, request_sql_time, sql_duration, slow_queries, inference_latency):
+        lines.extend(metric.render())
+    for name, kind, help_text, value in extra:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return '\n'.join(lines) + '\n'
@@ -8,6 +8,14 @@ db = SQLAlchemy()
 # ==========================================
 class ODIPerformance(db.Model):
     __tablename__ = 'odi_performance'
+    # Access paths: players/grounds with runs or wickets (covering), duplicate
+    # check on player + opposition, records newest first
+    __table_args__ = (
+        db.Index('ix_odi_player_ground_runs', 'player_name', 'ground', 'batting_runs'),
+        db.Index('ix_odi_player_ground_wickets', 'player_name', 'ground', 'wicket_taken'),
+        db.Index('ix_odi_player_opposition', 'player_name', 'opposition'),
+        db.Index('ix_odi_date_id', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     match_type = db.Column(db.String(20), default='ODI')
     date = db.Column(db.Date, nullable=False)
@@ -76,6 +84,12 @@ class ODIPerformance(db.Model):
 # ==========================================
 class T20Performance(db.Model):
     __tablename__ = 't20_performance'
+    __table_args__ = (
+        db.Index('ix_t20_player_ground_runs', 'player_name', 'ground', 'runs'),
+        db.Index('ix_t20_player_ground_wickets', 'player_name', 'ground', 'wickets'),
+        db.Index('ix_t20_player_opposition', 'player_name', 'opposition'),
+        db.Index('ix_t20_date_id', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     player_name = db.Column(db.String(120), nullable=False)
     opposition = db.Column(db.String(120), nullable=False)
@@ -146,6 +160,12 @@ class T20Performance(db.Model):
 
 class TestPerformance(db.Model):
     __tablename__ = 'test_performance'
+    __table_args__ = (
+        db.Index('ix_test_player_ground_runs', 'player_name', 'ground', 'runs'),
+        db.Index('ix_test_player_ground_wickets', 'player_name', 'ground', 'wickets'),
+        db.Index('ix_test_player_opposition', 'player_name', 'opposition'),
+        db.Index('ix_test_date_id', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     player_name = db.Column(db.String(120), nullable=False)
     opposition = db.Column(db.String(120), nullable=False)
@@ -214,7 +234,69 @@ class TestPerformance(db.Model):
         }
 
 # ==========================================
-# 3. OTHER MODELS (Test, Best XI)
+# 3. Player / Ground Aggregates (kept in sync on every dataset write)
+# ==========================================
+class PlayerGroundAggregate(db.Model):
+    """
+    Running totals per (format, player, ground, opposition).
+
+    Batting columns sum the records with runs > 0 and bowling columns the
+    records with wickets > 0, the same split the stats endpoints use.
+    """
+    __tablename__ = 'player_ground_aggregates'
+    __table_args__ = (
+        db.UniqueConstraint('match_type', 'player_name', 'ground', 'opposition', name='uq_player_ground_aggregate'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    match_type = db.Column(db.String(20), nullable=False)
+    player_name = db.Column(db.String(120), nullable=False)
+    ground = db.Column(db.String(150), nullable=False)
+    opposition = db.Column(db.String(120), nullable=False)
+
+    # Batting totals
+    bat_innings = db.Column(db.Integer, default=0)
+    runs = db.Column(db.Integer, default=0)
+    balls_faced = db.Column(db.Integer, default=0)
+    fours = db.Column(db.Integer, default=0)
+    sixes = db.Column(db.Integer, default=0)
+    sr_sum = db.Column(db.Float, default=0.0)
+    first_bat_id = db.Column(db.Integer)
+
+    # Bowling totals
+    bowl_innings = db.Column(db.Integer, default=0)
+    wickets = db.Column(db.Integer, default=0)
+    balls_bowled = db.Column(db.Integer, default=0)
+    runs_conceded = db.Column(db.Integer, default=0)
+    first_bowl_id = db.Column(db.Integer)
+
+    def to_dict(self):
+        return {
+            "match_type": self.match_type,
+            "player_name": self.player_name,
+            "ground": self.ground,
+            "opposition": self.opposition,
+            "bat_innings": self.bat_innings,
+            "runs": self.runs,
+            "balls_faced": self.balls_faced,
+            "fours": self.fours,
+            "sixes": self.sixes,
+            "bowl_innings": self.bowl_innings,
+            "wickets": self.wickets,
+            "balls_bowled": self.balls_bowled,
+            "runs_conceded": self.runs_conceded
+        }
+
+# ==========================================
+# 4. Dataset Version (bumped by every performance table write)
+# ==========================================
+class DatasetVersion(db.Model):
+    __tablename__ = 'dataset_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+# ==========================================
+# 5. OTHER MODELS (Test, Best XI)
 # ==========================================
  
 class BestXIPlayer(db.Model):
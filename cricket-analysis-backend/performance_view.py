@@ -0,0 +1,62 @@
+from sqlalchemy import literal, select
+from models import db, ODIPerformance, T20Performance, TestPerformance
+
+# ==========================================
+# Canonical column names across the three formats
+# ==========================================
+FORMAT_MODELS = {'ODI': ODIPerformance, 'T20': T20Performance, 'TEST': TestPerformance}
+
+CANONICAL_COLUMNS = [
+    'id', 'date', 'player_name', 'opposition', 'ground', 'pitch_type', 'weather',
+    'main_role', 'batting_style', 'bowling_style',
+    'runs', 'balls_faced', 'fours', 'sixes', 'strike_rate', 'bat_position', 'dismissal',
+    'overs', 'maidens', 'runs_conceded', 'wickets', 'economy', 'bowling_pos'
+]
+
+# Canonical name -> model column, where a format names it differently
+RENAMED_COLUMNS = {
+    'ODI': {'runs': 'batting_runs', 'balls_faced': 'bf', 'strike_rate': 'sr',
+            'wickets': 'wicket_taken', 'economy': 'econ', 'maidens': 'mdns'},
+    'T20': {},
+    'TEST': {}
+}
+
+def format_key(match_type, default='ODI'):
+    """'ODI' / 'T20' / 'TEST' for any spelling ('odi', 'Test', ...); `default` when unknown"""
+    key = str(match_type).upper()
+    return key if key in FORMAT_MODELS else default
+
+def model_for(match_type, default='ODI'):
+    """Performance model of a format; the `default` format's model when unknown"""
+    return FORMAT_MODELS[format_key(match_type, default)]
+
+def column_name(match_type, name):
+    """Model column name of a canonical column in one format"""
+    return RENAMED_COLUMNS[match_type.upper()].get(name, name)
+
+def canonical_column(model, name):
+    """Model attribute for a canonical column, e.g. canonical_column(ODIPerformance, 'runs')"""
+    match_type = next(key for key, m in FORMAT_MODELS.items() if m is model)
+    return getattr(model, column_name(match_type, name))
+
+# ==========================================
+# Canonical-column relation of one format
+# ==========================================
+RELATION_NAME = 'performance'
+
+def format_select(match_type):
+    """One format's rows under the canonical column names, match_type = format key"""
+    match_type = match_type.upper()
+    model = FORMAT_MODELS[match_type]
+    columns = [literal(match_type, db.String(20)).label('match_type')]
+    columns += [canonical_column(model, name).label(name) for name in CANONICAL_COLUMNS]
+    return select(*columns)
+
+def relation(match_type):
+    """
+    Canonical-column relation of one format to query.
+
+    A plain subquery, which the database flattens into the base table, so
+    the table's indexes still apply.
+    """
+    return format_select(match_type).subquery(f"{RELATION_NAME}_{match_type.lower()}")
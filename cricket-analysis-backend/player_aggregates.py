@@ -0,0 +1,322 @@
+import click
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, case, select, delete, insert, update
+from models import db, ODIPerformance, T20Performance, TestPerformance, PlayerGroundAggregate
+from stats_kernels import overs_to_balls
+from data_version import bump_version
+
+# ==========================================
+# Format specific column names
+# ==========================================
+FORMATS = {
+    'ODI': {'model': ODIPerformance, 'runs': 'batting_runs', 'balls_faced': 'bf', 'sr': 'sr', 'wickets': 'wicket_taken'},
+    'T20': {'model': T20Performance, 'runs': 'runs', 'balls_faced': 'balls_faced', 'sr': 'strike_rate', 'wickets': 'wickets'},
+    'TEST': {'model': TestPerformance, 'runs': 'runs', 'balls_faced': 'balls_faced', 'sr': 'strike_rate', 'wickets': 'wickets'}
+}
+
+KEY_COLUMNS = ['player_name', 'ground', 'opposition']
+SUM_COLUMNS = [
+    'bat_innings', 'runs', 'balls_faced', 'fours', 'sixes', 'sr_sum',
+    'bowl_innings', 'wickets', 'balls_bowled', 'runs_conceded'
+]
+FIRST_ID_COLUMNS = ['first_bat_id', 'first_bowl_id']
+
+def format_of(record):
+    """Format key ('ODI' / 'T20' / 'TEST') of a performance record"""
+    for match_type, spec in FORMATS.items():
+        if isinstance(record, spec['model']):
+            return match_type
+    raise ValueError(f"Not a performance record: {record!r}")
+
+def _record_deltas(spec, record):
+    """Aggregate contributions of a single raw record"""
+    deltas = {}
+    runs = getattr(record, spec['runs']) or 0
+    wickets = getattr(record, spec['wickets']) or 0
+
+    if runs > 0:
+        deltas.update({
+            'bat_innings': 1,
+            'runs': runs,
+            'balls_faced': getattr(record, spec['balls_faced']) or 0,
+            'fours': record.fours or 0,
+            'sixes': record.sixes or 0,
+            'sr_sum': getattr(record, spec['sr']) or 0.0
+        })
+    if wickets > 0:
+        deltas.update({
+            'bowl_innings': 1,
+            'wickets': wickets,
+            'balls_bowled': int(overs_to_balls(record.overs or 0.0)),
+            'runs_conceded': record.runs_conceded or 0
+        })
+    return deltas
+
+def _first_id_subquery(spec, key, stat, exclude_id):
+    """Lowest remaining raw id for a key (used when the first record is deleted)"""
+    model = spec['model']
+    return select(func.min(model.id)).where(
+        model.player_name == key['player_name'],
+        model.ground == key['ground'],
+        model.opposition == key['opposition'],
+        getattr(model, spec[stat]) > 0,
+        model.id != exclude_id
+    ).scalar_subquery()
+
+def _key_filter(match_type, key):
+    a = PlayerGroundAggregate
+    return (a.match_type == match_type, a.player_name == key['player_name'],
+            a.ground == key['ground'], a.opposition == key['opposition'])
+
+def _lowest_id(current, new):
+    """current first id, replaced by new when unset or lower (portable LEAST)"""
+    return case((current.is_(None), new), (new < current, new), else_=current)
+
+def _add(match_type, key, deltas, first_ids):
+    """
+    Upsert: insert the key's row, or add the deltas to the existing one, in a
+    single statement so concurrent writers (and two first inserts) never
+    overwrite each other.
+    """
+    table = PlayerGroundAggregate.__table__
+    values = {'match_type': match_type, **key, **{c: 0 for c in SUM_COLUMNS}, **deltas, **first_ids}
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table).values(**values)
+        new = stmt.inserted
+        updates = {c: table.c[c] + new[c] for c in deltas}
+        updates.update({c: _lowest_id(table.c[c], new[c]) for c in first_ids})
+        db.session.execute(stmt.on_duplicate_key_update(**updates))
+    elif dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**values)
+        new = stmt.excluded
+        updates = {c: table.c[c] + new[c] for c in deltas}
+        updates.update({c: _lowest_id(table.c[c], new[c]) for c in first_ids})
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['match_type', 'player_name', 'ground', 'opposition'], set_=updates
+        ))
+    else:
+        # No upsert: atomic increment, insert when the key has no row yet
+        updates = {c: table.c[c] + v for c, v in deltas.items()}
+        updates.update({c: _lowest_id(table.c[c], v) for c, v in first_ids.items()})
+        result = db.session.execute(update(table).where(*_key_filter(match_type, key)).values(**updates))
+        if result.rowcount == 0:
+            db.session.execute(insert(table).values(**values))
+
+def _remove(spec, match_type, key, deltas, record_id):
+    """Subtract the deltas in place; drop the row once it has no innings left"""
+    table = PlayerGroundAggregate.__table__
+    where = _key_filter(match_type, key)
+    db.session.execute(update(table).where(*where).values(**{c: table.c[c] - v for c, v in deltas.items()}))
+
+    for column, stat, counter in (('first_bat_id', 'runs', 'bat_innings'), ('first_bowl_id', 'wickets', 'bowl_innings')):
+        if counter in deltas:
+            db.session.execute(
+                update(table).where(*where, table.c[column] == record_id)
+                .values(**{column: _first_id_subquery(spec, key, stat, record_id)})
+            )
+
+    db.session.execute(delete(table).where(
+        *where, func.coalesce(table.c.bat_innings, 0) <= 0, func.coalesce(table.c.bowl_innings, 0) <= 0
+    ))
+
+# ==========================================
+# Incremental maintenance (same transaction as the raw write)
+# ==========================================
+def apply_record(record, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) one raw record from the aggregates.
+
+    Every change is a single UPDATE / upsert relative to the stored values
+    (col = col + delta), so concurrent writers to the same key do not lose
+    updates. Only stages changes on db.session; the caller's commit makes
+    the raw write and the aggregate update land together.
+    """
+    match_type = format_of(record)
+    spec = FORMATS[match_type]
+    deltas = _record_deltas(spec, record)
+    if not deltas:
+        return
+
+    if record.id is None:
+        db.session.flush()
+
+    key = {'player_name': record.player_name, 'ground': record.ground, 'opposition': record.opposition}
+    if sign > 0:
+        first_ids = {column: record.id for column, counter in (('first_bat_id', 'bat_innings'), ('first_bowl_id', 'bowl_innings'))
+                     if counter in deltas}
+        _add(match_type, key, deltas, first_ids)
+    else:
+        _remove(spec, match_type, key, deltas, record.id)
+
+# ==========================================
+# Rebuild / consistency check from the raw tables
+# ==========================================
+def compute_from_raw(match_type):
+    """Expected aggregate rows for one format, computed from the raw table"""
+    spec = FORMATS[match_type]
+    model = spec['model']
+    runs = getattr(model, spec['runs'])
+    wickets = getattr(model, spec['wickets'])
+    is_bat = runs > 0
+    is_bowl = wickets > 0
+    overs = func.coalesce(model.overs, 0.0)
+
+    def bat_sum(col):
+        return func.sum(case((is_bat, func.coalesce(col, 0)), else_=0))
+
+    def bowl_sum(col):
+        return func.sum(case((is_bowl, func.coalesce(col, 0)), else_=0))
+
+    # Grouped by overs too, so overs -> balls is exact (done in NumPy below)
+    stmt = select(
+        model.player_name, model.ground, model.opposition, overs.label('overs'),
+        func.sum(case((is_bat, 1), else_=0)).label('bat_innings'),
+        bat_sum(runs).label('runs'),
+        bat_sum(getattr(model, spec['balls_faced'])).label('balls_faced'),
+        bat_sum(model.fours).label('fours'),
+        bat_sum(model.sixes).label('sixes'),
+        func.sum(case((is_bat, func.coalesce(getattr(model, spec['sr']), 0.0)), else_=0.0)).label('sr_sum'),
+        func.min(case((is_bat, model.id))).label('first_bat_id'),
+        func.sum(case((is_bowl, 1), else_=0)).label('bowl_innings'),
+        bowl_sum(wickets).label('wickets'),
+        bowl_sum(model.runs_conceded).label('runs_conceded'),
+        func.min(case((is_bowl, model.id))).label('first_bowl_id')
+    ).where(is_bat | is_bowl).group_by(model.player_name, model.ground, model.opposition, overs)
+
+    df = pd.DataFrame(db.session.execute(stmt).all(), columns=[
+        'player_name', 'ground', 'opposition', 'overs', 'bat_innings', 'runs', 'balls_faced', 'fours',
+        'sixes', 'sr_sum', 'first_bat_id', 'bowl_innings', 'wickets', 'runs_conceded', 'first_bowl_id'
+    ])
+    if df.empty:
+        return pd.DataFrame(columns=KEY_COLUMNS + SUM_COLUMNS + FIRST_ID_COLUMNS)
+
+    df['balls_bowled'] = overs_to_balls(df['overs'].to_numpy()) * df['bowl_innings'].to_numpy(dtype=np.int64)
+    agg = {c: 'sum' for c in SUM_COLUMNS}
+    agg.update({c: 'min' for c in FIRST_ID_COLUMNS})
+    df = df.groupby(KEY_COLUMNS, as_index=False).agg(agg)
+    for column in SUM_COLUMNS:
+        if column != 'sr_sum':
+            df[column] = df[column].astype(np.int64)
+    return df
+
+def rebuild(match_type=None):
+    """Recompute the aggregate rows of one format (or all) from scratch"""
+    counts = {}
+    for m_type in ([match_type.upper()] if match_type else FORMATS):
+        df = compute_from_raw(m_type)
+        db.session.execute(delete(PlayerGroundAggregate).where(PlayerGroundAggregate.match_type == m_type))
+        if not df.empty:
+            df['match_type'] = m_type
+            records = df.astype(object).where(df.notna(), None).to_dict('records')
+            db.session.execute(PlayerGroundAggregate.__table__.insert(), records)
+        counts[m_type] = len(df)
+    db.session.commit()
+    return counts
+
+def check_consistency(match_type=None, tolerance=1e-6):
+    """
+    Compare stored aggregates with the raw tables.
+
+    Returns a list of mismatch dicts (empty when everything agrees).
+    """
+    problems = []
+    for m_type in ([match_type.upper()] if match_type else FORMATS):
+        expected = compute_from_raw(m_type)
+        stored = pd.DataFrame(
+            db.session.execute(
+                select(*[getattr(PlayerGroundAggregate, c) for c in KEY_COLUMNS + SUM_COLUMNS + FIRST_ID_COLUMNS])
+                .where(PlayerGroundAggregate.match_type == m_type)
+            ).all(),
+            columns=KEY_COLUMNS + SUM_COLUMNS + FIRST_ID_COLUMNS
+        )
+        merged = expected.merge(stored, on=KEY_COLUMNS, how='outer', suffixes=('_raw', '_agg'), indicator='side')
+
+        for row in merged.itertuples(index=False):
+            row = row._asdict()
+            key = {c: row[c] for c in KEY_COLUMNS}
+            if row['side'] != 'both':
+                side = 'missing aggregate' if row['side'] == 'left_only' else 'orphan aggregate'
+                problems.append({'match_type': m_type, **key, 'problem': side})
+                continue
+            for column in SUM_COLUMNS + FIRST_ID_COLUMNS:
+                raw, agg = row[f'{column}_raw'], row[f'{column}_agg']
+                if pd.isna(raw) and pd.isna(agg):
+                    continue
+                if pd.isna(raw) or pd.isna(agg) or abs(float(raw) - float(agg)) > tolerance:
+                    problems.append({'match_type': m_type, **key, 'problem': column, 'raw': raw, 'aggregate': agg})
+    return problems
+
+def ensure_built():
+    """Build the aggregates on first start (empty aggregate table, raw data present)"""
+    if db.session.query(PlayerGroundAggregate.id).first() is not None:
+        return False
+    if not any(db.session.query(spec['model'].id).first() for spec in FORMATS.values()):
+        return False
+    counts = rebuild()
+    print(f"✓ Player/ground aggregates built: {counts}")
+    return True
+
+# ==========================================
+# Reads used by the stats endpoints
+# ==========================================
+def batting_rows(match_type, player_name, ground_name):
+    """(opposition, innings, runs, fours, sixes, sr_sum) per opposition, best first"""
+    a = PlayerGroundAggregate
+    return db.session.query(
+        a.opposition, a.bat_innings, a.runs, a.fours, a.sixes, a.sr_sum
+    ).filter(
+        a.match_type == match_type.upper(),
+        a.player_name == player_name,
+        a.ground == ground_name,
+        a.bat_innings > 0
+    ).order_by(a.runs.desc(), a.first_bat_id).all()
+
+def bowling_rows(match_type, player_name, ground_name):
+    """(opposition, innings, balls, wickets, runs_conceded, first_id) per opposition"""
+    a = PlayerGroundAggregate
+    return db.session.query(
+        a.opposition, a.bowl_innings, a.balls_bowled, a.wickets, a.runs_conceded, a.first_bowl_id
+    ).filter(
+        a.match_type == match_type.upper(),
+        a.player_name == player_name,
+        a.ground == ground_name,
+        a.bowl_innings > 0
+    ).all()
+
+# ==========================================
+# CLI: flask rebuild-aggregates / flask check-aggregates
+# ==========================================
+def register_commands(app):
+    @app.cli.command('rebuild-aggregates')
+    @click.option('--match-type', default=None, help='ODI, T20 or TEST (default: all)')
+    def rebuild_aggregates_command(match_type):
+        """Rebuild player/ground aggregates from the raw performance tables."""
+        from startup import init_cli_database
+        init_cli_database(app)
+        counts = rebuild(match_type)
+        # Running servers drop their homepage snapshot / cached predictions
+        bump_version()
+        db.session.commit()
+        click.echo(f"✓ Rebuilt aggregates: {counts}")
+
+    @app.cli.command('check-aggregates')
+    @click.option('--match-type', default=None, help='ODI, T20 or TEST (default: all)')
+    def check_aggregates_command(match_type):
+        """Check player/ground aggregates against the raw performance tables."""
+        from startup import init_cli_database
+        init_cli_database(app)
+        problems = check_consistency(match_type)
+        for p in problems[:50]:
+            click.echo(f"✗ {p}")
+        if problems:
+            click.echo(f"✗ {len(problems)} inconsistencies found")
+            raise SystemExit(1)
+        click.echo("✓ Aggregates are consistent with the raw tables")
@@ -0,0 +1,257 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+
+# ==========================================
+# Background prediction jobs (local process pool, no broker)
+# ==========================================
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', 16))   # Waiting jobs allowed on top of the running ones
+JOB_HISTORY = int(os.getenv('JOB_HISTORY', 200))        # Finished jobs kept for polling
+# Workers never fork the (multi-threaded) Flask process: forkserver starts
+# them from a clean single-threaded server, spawn from a fresh interpreter
+START_METHODS = ('forkserver', 'spawn')
+JOB_START_METHOD = os.getenv(
+    'JOB_START_METHOD', 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity"""
+
+# ==========================================
+# Worker side (runs inside the pool processes)
+# ==========================================
+def _init_worker():
+    """Pool initializer: load the ODI / T20 models once per worker process"""
+    from routes.best_xi import ensure_models_loaded
+    ensure_models_loaded()
+
+def _timed(task, *args):
+    """Run a task and report when it actually started / finished in the worker, and its model timings"""
+    started = time.time()
+    with metrics.capture_inference() as inference:
+        result = task(*args)
+    return {'started_at': started, 'finished_at': time.time(), 'result': result, 'inference': inference}
+
+def predict_team_task(df_players, data, match_type, pitch_type, weather, opposition):
+    """Same result as /api/predict-team, from already fetched player features"""
+    from routes.best_xi import build_feature_frame, score_players, team_result
+    df_players = score_players(build_feature_frame(df_players, pitch_type, weather, opposition), match_type)
+    return team_result(df_players[['Player_Name', 'Role', 'Predicted_Score']], data, match_type, pitch_type)
+
+def sweep_task(df_players, match_type, scenarios, min_bowling_options):
+    """Same result as /api/predict-team/sweep, from already fetched player features"""
+    from routes.best_xi import sweep_players, sweep_header, scenario_payload
+    players, roles, results = sweep_players(df_players, match_type, scenarios, min_bowling_options)
+    return {**sweep_header(match_type, players, roles, len(results)), "scenarios": [scenario_payload(r) for r in results]}
+
+# ==========================================
+# Job manager (Flask process)
+# ==========================================
+FINISHED = ('done', 'failed', 'cancelled')
+
+class JobManager:
+    """
+    Bounded queue of prediction jobs on a ProcessPoolExecutor.
+
+    Jobs wait in our own FIFO and a dispatcher thread hands them to the pool
+    only when a worker is free, so queued jobs can still be cancelled and
+    the queue depth is exact. Submitting beyond workers + queue_size raises
+    QueueFullError; finished jobs are kept (up to `history`) for polling.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE, history=JOB_HISTORY,
+                 start_method=JOB_START_METHOD):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.history = history
+        if start_method not in START_METHODS or start_method not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Unsupported JOB_START_METHOD: {start_method} (use forkserver or spawn)")
+        self.start_method = start_method
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(self.workers)
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._started = time.time()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+        self.max_run_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def _count(self, *statuses):
+        return sum(1 for job in self._jobs.values() if job['status'] in statuses)
+
+    def submit(self, kind, task, *args):
+        """Queue task(*args) for the pool; returns the job id"""
+        with self._lock:
+            if self._count('queued', 'running') >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise QueueFullError(f"Job queue is full ({self.workers} running + {self.queue_size} queued)")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id, 'kind': kind, 'status': 'queued', 'task': task, 'args': args,
+                'submitted_at': time.time()
+            }
+            self.submitted += 1
+            self._trim_history()
+
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name='prediction-jobs', daemon=True)
+                self._dispatcher.start()
+
+        self._queue.put(job_id)
+        return job_id
+
+    def _dispatch_loop(self):
+        """Hand queued jobs to the pool, one per free worker"""
+        while True:
+            job_id = self._queue.get()
+            self._slots.acquire()
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job['status'] != 'queued':
+                    self._slots.release()
+                    continue
+                task, args = job.pop('task'), job.pop('args')
+                try:
+                    future = self._submit(task, args)
+                except Exception as e:
+                    # The pool cannot start at all: fail this job, keep dispatching
+                    print(f"❌ Prediction job {job_id} could not be started: {e}")
+                    job.update(status='failed', error=str(e), finished_at=time.time())
+                    self.failed += 1
+                    self._slots.release()
+                    continue
+                job['status'] = 'running'
+                job['dispatched_at'] = time.time()
+            future.add_done_callback(lambda f, job_id=job_id: self._finished(job_id, f))
+
+    def _submit(self, task, args):
+        """Submit to the pool; a broken pool is replaced and the submit retried once"""
+        try:
+            return self._get_executor().submit(_timed, task, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM etc.): start a fresh pool and retry once
+            print("⚠️ Prediction job pool was broken, restarting it")
+            self.shutdown(wait=False)
+            return self._get_executor().submit(_timed, task, *args)
+
+    def _finished(self, job_id, future):
+        """Done callback: store the outcome, record run / wait times, free the slot"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['finished_at'] = time.time()
+                if future.cancelled():
+                    job['status'] = 'cancelled'
+                    self.cancelled += 1
+                elif future.exception() is not None:
+                    job['status'] = 'failed'
+                    job['error'] = str(future.exception())
+                    self.failed += 1
+                else:
+                    timing = future.result()
+                    run_seconds = timing['finished_at'] - timing['started_at']
+                    job.update(status='done', result=timing['result'],
+                               started_at=timing['started_at'], finished_at=timing['finished_at'])
+                    self.completed += 1
+                    self.busy_seconds += run_seconds
+                    self.max_run_seconds = max(self.max_run_seconds, run_seconds)
+                    self.total_wait_seconds += max(0.0, timing['started_at'] - job['submitted_at'])
+                    metrics.record_inference(timing['inference'])
+        self._slots.release()
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id, include_result=True):
+        """Status dict of one job (None if unknown / expired)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            info = {'job_id': job_id, 'kind': job['kind'], 'status': job['status'], 'submitted_at': job['submitted_at']}
+            if job['status'] == 'queued':
+                info['queue_position'] = sum(
+                    1 for other in self._jobs.values()
+                    if other['status'] == 'queued' and other['submitted_at'] <= job['submitted_at']
+                )
+            for key in ('dispatched_at', 'started_at', 'finished_at', 'error'):
+                if key in job:
+                    info[key] = job[key]
+            if job['status'] == 'done':
+                info['wait_seconds'] = round(max(0.0, job['started_at'] - job['submitted_at']), 4)
+                info['run_seconds'] = round(job['finished_at'] - job['started_at'], 4)
+                if include_result:
+                    info['result'] = job['result']
+            return info
+
+    def cancel(self, job_id):
+        """Cancel a queued job. Returns None (unknown), True, or False (already running/finished)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] != 'queued':
+                return False
+            job.pop('task', None)
+            job.pop('args', None)
+            job['status'] = 'cancelled'
+            job['finished_at'] = time.time()
+            self.cancelled += 1
+            return True
+
+    def stats(self):
+        with self._lock:
+            running = self._count('running')
+            uptime = time.time() - self._started
+            return {
+                "workers": self.workers,
+                "start_method": self.start_method,
+                "queue_capacity": self.queue_size,
+                "queue_depth": self._count('queued'),
+                "running": running,
+                "utilization": round(running / self.workers, 4),
+                "busy_fraction": round(self.busy_seconds / (self.workers * uptime), 4) if uptime > 0 else 0.0,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+                "avg_run_seconds": round(self.busy_seconds / self.completed, 4) if self.completed else 0.0,
+                "max_run_seconds": round(self.max_run_seconds, 4),
+                "avg_wait_seconds": round(self.total_wait_seconds / self.completed, 4) if self.completed else 0.0
+            }
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+job_manager = JobManager()
@@ -0,0 +1,155 @@
+import re
+import click
+from sqlalchemy import func, inspect, select, text
+from models import db, PlayerGroundAggregate
+from player_aggregates import FORMATS
+from performance_view import relation
+
+# ==========================================
+# Migration: indexes declared in models.py on existing tables
+# ==========================================
+# db.create_all() only adds indexes together with a new table, so databases
+# created before the indexes were declared need this once (flask create-indexes).
+INDEXED_MODELS = [spec['model'] for spec in FORMATS.values()] + [PlayerGroundAggregate]
+
+def ensure_indexes():
+    """Create the declared indexes that are missing; returns their names"""
+    engine = db.engine
+    inspector = inspect(engine)
+    created = []
+    for model in INDEXED_MODELS:
+        table = model.__table__
+        if not inspector.has_table(table.name):
+            continue  # create_all makes it with its indexes
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+# ==========================================
+# Query plans of the endpoint queries
+# ==========================================
+def _sample_key(model):
+    """A real (player, ground, opposition, date, id) so the planner sees realistic values"""
+    row = db.session.execute(
+        select(model.player_name, model.ground, model.opposition, model.date, model.id).limit(1)
+    ).first()
+    return row or ('N/A', 'N/A', 'N/A', None, 0)
+
+def endpoint_queries(match_type):
+    """(name, statement) for every hot query of one format"""
+    # Imported here: the route modules import this module's siblings at load time
+    from routes.dataset import records_query, DEFAULT_PAGE_SIZE
+    from routes.best_xi import player_features_query
+    from routes.career import career_query
+
+    model = FORMATS[match_type]['model']
+    perf = relation(match_type)
+    player, ground, opposition, date_value, record_id = _sample_key(model)
+    a = PlayerGroundAggregate
+    page = DEFAULT_PAGE_SIZE + 1
+
+    return [
+        ('players', select(perf.c.player_name).where(perf.c.runs > 0).distinct()),
+        ('grounds-for-player', select(perf.c.ground).where(perf.c.player_name == player, perf.c.runs > 0).distinct()),
+        ('bowling/players', select(perf.c.player_name).where(perf.c.wickets > 0).distinct()),
+        ('bowling/grounds-for-player',
+         select(perf.c.ground).where(perf.c.player_name == player, perf.c.wickets > 0).distinct()),
+        ('check-condition',
+         select(model).where(model.player_name == player, model.opposition == opposition).limit(1)),
+        ('records', records_query(model, {}).limit(page)),
+        ('records?cursor', records_query(model, {}, (date_value, record_id)).limit(page)),
+        ('records?player', records_query(model, {'player': player}).limit(page)),
+        ('player-ground-stats', select(a.opposition, a.runs).where(
+            a.match_type == match_type, a.player_name == player, a.ground == ground, a.bat_innings > 0
+        ).order_by(a.runs.desc(), a.first_bat_id)),
+        ('bowling/player-ground-stats', select(a.opposition, a.wickets).where(
+            a.match_type == match_type, a.player_name == player, a.ground == ground, a.bowl_innings > 0
+        )),
+        ('homepage-stats', select(a.player_name, func.sum(a.runs)).where(
+            a.match_type == match_type
+        ).group_by(a.player_name)),
+        ('best-xi features', player_features_query(match_type)),
+        ('career', career_query(player, match_type)),
+    ]
+
+def explain(stmt):
+    """Plan rows for a statement: SQLite EXPLAIN QUERY PLAN details or MySQL EXPLAIN dicts"""
+    dialect = db.engine.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'sqlite':
+        return [row.detail for row in db.session.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+    return [dict(row._mapping) for row in db.session.execute(text('EXPLAIN ' + sql))]
+
+# Queries that pass over a whole table on purpose (query name -> why)
+ALLOWED_FULL_SCANS = {
+    'records': 'walks ix_*_date_id in order and stops after one page (LIMIT)',
+    'records?cursor': 'walks ix_*_date_id in order from the cursor and stops after one page (LIMIT)',
+    'best-xi features': 'averages every row of the format, once per data version',
+}
+
+# SQLite < 3.36 prints "SCAN TABLE t", newer versions "SCAN t". Only SEARCH
+# and "SCAN t USING COVERING INDEX" avoid reading every row of t; "SCAN t
+# USING INDEX ix" reads all of t in index order
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\S+)')
+
+def full_scans(plan):
+    """Plan rows that read every row of a table (scans of subquery results are fine)"""
+    if db.engine.dialect.name == 'sqlite':
+        tables = set(db.metadata.tables)
+        scans = []
+        for row in plan:
+            match = _SQLITE_SCAN.match(row)
+            if match and match.group(1) in tables and 'USING COVERING INDEX' not in row:
+                scans.append(row)
+        return scans
+    # MySQL: ALL = table scan, index = full index scan (covering only with "Using index")
+    return [row for row in plan if row.get('type') == 'ALL'
+            or (row.get('type') == 'index' and 'Using index' not in (row.get('Extra') or ''))]
+
+def check_query_plans(match_type=None):
+    """[{match_type, query, plan, full_scans, allowed}] for the endpoint queries"""
+    results = []
+    for m_type in ([match_type.upper()] if match_type else FORMATS):
+        for name, stmt in endpoint_queries(m_type):
+            plan = explain(stmt)
+            scans = full_scans(plan)
+            results.append({'match_type': m_type, 'query': name, 'plan': plan, 'full_scans': scans,
+                            'allowed': ALLOWED_FULL_SCANS.get(name) if scans else None})
+    return results
+
+# ==========================================
+# CLI: flask create-indexes / flask check-query-plans
+# ==========================================
+def register_commands(app):
+    @app.cli.command('create-indexes')
+    def create_indexes_command():
+        """Add the indexes declared in models.py to existing tables."""
+        from startup import init_cli_database
+        init_cli_database(app)
+        created = ensure_indexes()
+        click.echo(f"✓ Created {len(created)} indexes: {', '.join(created)}" if created else "✓ All indexes present")
+
+    @app.cli.command('check-query-plans')
+    @click.option('--match-type', default=None, help='ODI, T20 or TEST (default: all)')
+    @click.option('--verbose', is_flag=True, help='Print every plan')
+    def check_query_plans_command(match_type, verbose):
+        """EXPLAIN the endpoint queries; exit 1 if any reads a whole table unexpectedly."""
+        from startup import init_cli_database
+        init_cli_database(app)
+        results = check_query_plans(match_type)
+        failed = [r for r in results if r['full_scans'] and not r['allowed']]
+        allowed = [r for r in results if r['allowed']]
+        for r in results:
+            if verbose or r['full_scans']:
+                mark = '✗' if r in failed else ('~' if r['allowed'] else '✓')
+                reason = f" (allowed: {r['allowed']})" if r['allowed'] else ''
+                click.echo(f"{mark} {r['match_type']} {r['query']}{reason}")
+                for row in r['plan']:
+                    click.echo(f"    {row}")
+        if failed:
+            click.echo(f"✗ {len(failed)} of {len(results)} queries do a full table scan")
+            raise SystemExit(1)
+        click.echo(f"✓ No unexpected full table scans in {len(results)} query plans ({len(allowed)} allow-listed)")
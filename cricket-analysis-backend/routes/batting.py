@@ -1,28 +1,20 @@
 from flask import Blueprint, jsonify, request
-from models import db, ODIPerformance, T20Performance, TestPerformance
-from sqlalchemy import func, distinct
+from models import db
+from player_aggregates import batting_rows
+from performance_view import format_key, relation
 
 batting_bp = Blueprint('batting', __name__)
 
-def get_model(match_type):
-    # Match type එක standardize කිරීම
-    m_type = match_type.upper()
-    if m_type == 'ODI': return ODIPerformance
-    elif m_type == 'T20': return T20Performance
-    elif m_type == 'TEST': return TestPerformance
-    return ODIPerformance
-
 @batting_bp.route('/api/players', methods=['GET'])
 def get_players():
     match_type = request.args.get('matchType', 'ODI').upper()
     try:
-        model = get_model(match_type)
-        # ODI සදහා batting_runs, අනිත් ඒවට runs
-        run_col = model.batting_runs if match_type == 'ODI' else model.runs
+        # Canonical columns: runs is batting_runs in the ODI table
+        perf = relation(format_key(match_type))
         
-        players = db.session.query(distinct(model.player_name)).filter(
-            run_col > 0
-        ).all()
+        players = db.session.query(perf.c.player_name).filter(
+            perf.c.runs > 0
+        ).distinct().all()
         
         return jsonify(sorted([p[0] for p in players if p[0]]))
     except Exception as e:
@@ -35,13 +27,12 @@ def get_grounds_for_player():
     if not player_name: return jsonify([])
 
     try:
-        model = get_model(match_type)
-        run_col = model.batting_runs if match_type == 'ODI' else model.runs
+        perf = relation(format_key(match_type))
         
-        grounds = db.session.query(distinct(model.ground)).filter(
-            model.player_name == player_name,
-            run_col > 0
-        ).all()
+        grounds = db.session.query(perf.c.ground).filter(
+            perf.c.player_name == player_name,
+            perf.c.runs > 0
+        ).distinct().all()
         
         return jsonify(sorted([g[0] for g in grounds if g[0]]))
     except Exception as e:
@@ -54,33 +45,20 @@ def get_player_stats():
     match_type = request.args.get('matchType', 'ODI').upper()
     
     try:
-        model = get_model(match_type)
-        run_col_name = 'batting_runs' if match_type == 'ODI' else 'runs'
-        sr_col_name = 'sr' if match_type == 'ODI' else 'strike_rate'
-        
-        performances = db.session.query(model).filter(
-            model.player_name == player_name,
-            model.ground == ground_name,
-            getattr(model, run_col_name) > 0
-        ).all()
+        # Pre-aggregated rows, one per opposition
+        groups = batting_rows(match_type, player_name, ground_name)
         
-        if not performances: return jsonify({'message': 'No data found'}), 404
+        if not groups: return jsonify({'message': 'No data found'}), 404
 
-        # --- CALCULATION STEP ---
-        total_matches = len(performances)
-        total_runs = sum(getattr(p, run_col_name) for p in performances)
-        total_fours = sum(p.fours for p in performances if p.fours)
-        total_sixes = sum(p.sixes for p in performances if p.sixes)
-        avg_sr = sum(getattr(p, sr_col_name, 0) for p in performances) / total_matches
-        
-        # Best Opposition
-        opp_runs = {}
-        for p in performances:
-            opp = p.opposition
-            r = getattr(p, run_col_name)
-            opp_runs[opp] = opp_runs.get(opp, 0) + r
+        # --- CALCULATION STEP (a few rows, one per opposition) ---
+        total_matches = sum(int(g[1]) for g in groups)
+        total_runs = sum(int(g[2]) for g in groups)
+        total_fours = sum(int(g[3]) for g in groups)
+        total_sixes = sum(int(g[4]) for g in groups)
+        avg_sr = sum(float(g[5]) for g in groups) / total_matches
         
-        best_opp = max(opp_runs.items(), key=lambda x: x[1])[0] if opp_runs else 'N/A'
+        # Best Opposition (groups come back ordered by runs)
+        best_opp = groups[0][0]
         avg = total_runs / total_matches if total_matches > 0 else 0
 
         return jsonify({
@@ -106,26 +84,12 @@ def get_chart_data():
     match_type = request.args.get('matchType', 'ODI').upper()
     
     try:
-        model = get_model(match_type)
-        run_col_name = 'batting_runs' if match_type == 'ODI' else 'runs'
-        
-        performances = db.session.query(model).filter(
-            model.player_name == player_name,
-            model.ground == ground_name,
-            getattr(model, run_col_name) > 0
-        ).all()
-        
-        opp_runs = {}
-        for p in performances:
-            opp = p.opposition
-            r = getattr(p, run_col_name)
-            opp_runs[opp] = opp_runs.get(opp, 0) + r
-            
-        sorted_opp = sorted(opp_runs.items(), key=lambda x: x[1], reverse=True)
+        # Pre-aggregated rows, one per opposition
+        groups = batting_rows(match_type, player_name, ground_name)
         
         return jsonify({
-            'labels': [x[0] for x in sorted_opp],
-            'data': [x[1] for x in sorted_opp]
+            'labels': [g[0] for g in groups],
+            'data': [int(g[2]) for g in groups]
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
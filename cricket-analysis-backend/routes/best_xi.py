@@ -1,10 +1,23 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 import pandas as pd
 import numpy as np
-import joblib
-import xgboost as xgb
 import os
-from models import db, ODIPerformance, T20Performance, TestPerformance
+import atexit
+import multiprocessing
+import threading
+import json
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from models import db
+from sqlalchemy import func, select
+from encoding import compile_pipeline_categories, prepare_categoricals
+from prediction_cache import prediction_cache
+from xi_solver import solve_xi, TEAM_SIZE, BOWLING_ROLES
+from data_version import get_version
+from t20_inference import InplacePredictor
+from performance_view import FORMAT_MODELS, relation
+from metrics import inference_timer
 
 best_xi_bp = Blueprint('best_xi', __name__)
 
@@ -14,135 +27,131 @@ T20_MODEL_PATH = 't20_model.json'
 
 odi_model = None
 t20_model = None
+odi_category_tables = {}  # Compiled categories of the ODI pipeline's encoders
+t20_predictor = None  # In-place predictor bound to the current t20_model
+MODEL_VERSION = 0  # Bumped on every (re)load, part of the prediction cache key
 
-try:
-    if os.path.exists(ODI_MODEL_PATH):
-        odi_model = joblib.load(ODI_MODEL_PATH)
-        print("✅ ODI AI Model Loaded!")
-    else:
-        print(f"⚠️ Warning: ODI Model '{ODI_MODEL_PATH}' not found.")
-except Exception as e:
-    print(f"❌ ODI Model Error: {e}")
-
-try:
-    if os.path.exists(T20_MODEL_PATH):
-        t20_model = xgb.Booster()
-        t20_model.load_model(T20_MODEL_PATH)
-        print("✅ T20 AI Model Loaded!")
-    else:
-        print(f"⚠️ Warning: T20 Model '{T20_MODEL_PATH}' not found.")
-except Exception as e:
-    print(f"❌ T20 Model Error: {e}")
+_models_lock = threading.Lock()
+_models_loaded = False
 
+def load_models():
+    """Load (or reload) the ODI pipeline and the T20 booster from disk"""
+    global odi_model, t20_model, odi_category_tables, MODEL_VERSION, _models_loaded
+    # Heavy imports (xgboost pulls in sklearn/scipy) only when models are needed
+    import joblib
+    import xgboost as xgb
+
+    try:
+        if os.path.exists(ODI_MODEL_PATH):
+            odi_model = joblib.load(ODI_MODEL_PATH)
+            odi_category_tables = compile_pipeline_categories(odi_model)
+            print("✅ ODI AI Model Loaded!")
+        else:
+            print(f"⚠️ Warning: ODI Model '{ODI_MODEL_PATH}' not found.")
+    except Exception as e:
+        print(f"❌ ODI Model Error: {e}")
+
+    try:
+        if os.path.exists(T20_MODEL_PATH):
+            t20_model = xgb.Booster()
+            t20_model.load_model(T20_MODEL_PATH)
+            print("✅ T20 AI Model Loaded!")
+        else:
+            print(f"⚠️ Warning: T20 Model '{T20_MODEL_PATH}' not found.")
+    except Exception as e:
+        print(f"❌ T20 Model Error: {e}")
+
+    MODEL_VERSION += 1
+    _models_loaded = True
+    prediction_cache.clear()
+
+def ensure_models_loaded():
+    """Load the models on first use (no-op once loaded or warmed up)"""
+    if not _models_loaded:
+        with _models_lock:
+            if not _models_loaded:
+                load_models()
+
+def models_status():
+    """What the Best XI side has loaded so far (for /api/health/ready)"""
+    return {"loaded": _models_loaded, "odi_model": odi_model is not None,
+            "t20_model": t20_model is not None, "model_version": MODEL_VERSION}
+
+
+# --- 2. DATA FETCHING (aggregated in the database) ---
+FEATURE_OUTPUT_COLUMNS = ['Avg_Batting_Runs', 'Avg_SR', 'Avg_Wicket_taken', 'Avg_Econ', 'Avg_Fours', 'Avg_Sixes']
+# Canonical performance columns averaged into FEATURE_OUTPUT_COLUMNS
+FEATURE_SOURCE_COLUMNS = ['runs', 'strike_rate', 'wickets', 'economy', 'fours', 'sixes']
+
+def _first_value(match_format, outer, column):
+    """Correlated subquery: first non-null value of a column for the outer row's player"""
+    inner = relation(match_format).alias()
+    col = inner.c[column]
+    return select(col).where(
+        inner.c.player_name == outer.c.player_name,
+        col.isnot(None)
+    ).order_by(inner.c.id).limit(1).scalar_subquery()
+
+def player_features_query(match_format):
+    """The GROUP BY behind get_player_data_from_db (format key already upper-cased)"""
+    outer = relation(match_format)
+
+    def avg(column):
+        # Missing values count as 0, like the old to_numeric(...).fillna(0)
+        return func.avg(func.coalesce(outer.c[column], 0))
+
+    return select(
+        outer.c.player_name,
+        _first_value(match_format, outer, 'main_role'),
+        _first_value(match_format, outer, 'bowling_style'),
+        *[avg(column) for column in FEATURE_SOURCE_COLUMNS]
+    ).where(outer.c.player_name.isnot(None)).group_by(outer.c.player_name).order_by(outer.c.player_name)
 
-# --- 2. DATA FETCHING (THE FIX) ---
 def get_player_data_from_db(match_format):
     """
-    FIXED: Uses pure SQLAlchemy to fetch data, avoiding pd.read_sql errors.
+    Per-player average stats for one format, computed with one GROUP BY query.
+
+    Returns one row per player: Player_Name, Role and Bowling_Style (first
+    recorded value) plus the float Avg_* feature columns.
     """
     match_format = match_format.upper()
-    
-    # 1. Select the correct Model
-    if match_format == 'ODI':
-        model = ODIPerformance
-    elif match_format == 'T20':
-        model = T20Performance
-    elif match_format == 'TEST':
-        model = TestPerformance
-    else:
+    if match_format not in FORMAT_MODELS:
         return pd.DataFrame()
 
     try:
-        # 2. Fetch all records using SQLAlchemy (Safer than read_sql)
-        records = model.query.all()
-        
-        if not records:
-            return pd.DataFrame()
-
-        # 3. Convert SQLAlchemy Objects to List of Dictionaries
-        # This manually grabs all columns from the database row
-        data_list = []
-        for r in records:
-            row_dict = {col.name: getattr(r, col.name) for col in r.__table__.columns}
-            data_list.append(row_dict)
-
-        # 4. Create Pandas DataFrame
-        df = pd.DataFrame(data_list)
-
+        rows = db.session.execute(player_features_query(match_format)).all()
     except Exception as e:
         print(f"DB Fetch Error: {e}")
         return pd.DataFrame()
 
-    if df.empty:
+    if not rows:
         return pd.DataFrame()
 
-    # 5. Handle 'odi' vs 'ODI' inside the DataFrame (just in case)
-    if 'match_type' in df.columns:
-        df['match_type'] = df['match_type'].str.upper()
-
-    # 6. Column Standardization
-    rename_map = {
-        'player_name': 'Player_Name',
-        'main_role': 'Role',
-        'bowling_style': 'Bowling_Style',
-        'batting_runs': 'Runs',       # ODI Name
-        'runs': 'Runs',               # T20/Test Name
-        'wicket_taken': 'Wickets',    # ODI Name
-        'wickets': 'Wickets',         # T20/Test Name
-        'sr': 'SR',                   # ODI Name
-        'strike_rate': 'SR',          # T20/Test Name
-        'econ': 'Econ',               # ODI Name
-        'economy': 'Econ',            # T20/Test Name
-        'fours': 'Fours',
-        'sixes': 'Sixes'
-    }
-    df = df.rename(columns=rename_map)
-
-    # 7. Convert to Numeric
-    numeric_cols = ['Runs', 'SR', 'Wickets', 'Econ', 'Fours', 'Sixes']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        else:
-            df[col] = 0 
-
-    # 8. Aggregation (Average Stats per Player)
-    df_agg = df.groupby('Player_Name').agg({
-        'Role': 'first',             
-        'Bowling_Style': 'first',    
-        'Runs': 'mean',              
-        'SR': 'mean',
-        'Wickets': 'mean',           
-        'Econ': 'mean',
-        'Fours': 'mean',
-        'Sixes': 'mean'
-    }).reset_index()
-
-    # Rename for ML Models
-    df_agg = df_agg.rename(columns={
-        'Runs': 'Avg_Batting_Runs',
-        'SR': 'Avg_SR',
-        'Wickets': 'Avg_Wicket_taken',
-        'Econ': 'Avg_Econ',
-        'Fours': 'Avg_Fours',
-        'Sixes': 'Avg_Sixes'
+    columns = list(zip(*rows))
+    df_agg = pd.DataFrame({
+        'Player_Name': pd.array(columns[0], dtype=object),
+        'Role': pd.array(columns[1], dtype=object),
+        'Bowling_Style': pd.array(columns[2], dtype=object)
     })
+    for name, values in zip(FEATURE_OUTPUT_COLUMNS, columns[3:]):
+        df_agg[name] = np.array(values, dtype=np.float64)
 
     return df_agg
 
 # --- 3. TEAM SELECTION LOGIC ---
-def select_best_11(df, pitch_type, match_format):
-    df = df.sort_values(by='Predicted_Score', ascending=False)
-    
-    # Normalize Roles
-    df['Role'] = df['Role'].astype(str).str.lower()
-    df['Role'] = df['Role'].replace({
-        'bat': 'Batsman', 'batsman': 'Batsman', 'rhb': 'Batsman', 'lhb': 'Batsman',
-        'bowler': 'Bowler', 'pace bowler': 'Bowler', 'spin bowler': 'Bowler',
-        'allrounder': 'Allrounder', 'batting alrounder': 'Allrounder', 'bowling alrounder': 'Allrounder',
-        'wicket keeper': 'Wicket Keeper', 'keeper': 'Wicket Keeper', 'wk batsman': 'Wicket Keeper'
-    })
-
+ROLE_ALIASES = {
+    'bat': 'Batsman', 'batsman': 'Batsman', 'rhb': 'Batsman', 'lhb': 'Batsman',
+    'bowler': 'Bowler', 'pace bowler': 'Bowler', 'spin bowler': 'Bowler',
+    'allrounder': 'Allrounder', 'batting alrounder': 'Allrounder', 'bowling alrounder': 'Allrounder',
+    'wicket keeper': 'Wicket Keeper', 'keeper': 'Wicket Keeper', 'wk batsman': 'Wicket Keeper'
+}
+
+# Bowlers + allrounders needed to bowl out the overs (5 x 10 in ODIs, 5 x 4 in T20s)
+DEFAULT_MIN_BOWLING_OPTIONS = 5
+MAX_ALTERNATIVES = 10
+
+def get_composition(pitch_type, match_format):
+    """Players per role for a format and pitch"""
     pitch_lower = pitch_type.lower()
     
     # Default Composition
@@ -161,22 +170,232 @@ def select_best_11(df, pitch_type, match_format):
         else:
             composition = {'Wicket Keeper': 1, 'Batsman': 5, 'Allrounder': 1, 'Bowler': 4}
 
-    # Selection Loop
-    final_team = []
-    for role, count in composition.items():
-        candidates = df[df['Role'] == role].head(count)
-        final_team.extend(candidates.to_dict('records'))
-        df = df.drop(candidates.index)
+    return composition
+
+def _player_indices(names, players):
+    """Positions of the given player names; unknown names raise ValueError"""
+    lookup = {name: i for i, name in enumerate(names)}
+    missing = [p for p in players if p not in lookup]
+    if missing:
+        raise ValueError(f"Unknown players: {', '.join(map(str, missing))}")
+    return [lookup[p] for p in players]
+
+def solve_with_fallback(scores, roles, composition, min_bowling_options=DEFAULT_MIN_BOWLING_OPTIONS,
+                        required=(), excluded=(), top_k=1):
+    """
+    solve_xi on plain arrays, relaxing the composition when the squad is short
+    of a role or the required players do not fit it. Returns a list of
+    (total_score, indices) tuples of exactly TEAM_SIZE players; ValueError
+    when no XI can be picked at all.
+    """
+    required = [int(i) for i in dict.fromkeys(required)]
+    banned = set(int(i) for i in excluded) - set(required)
+    selectable = np.ones(len(scores), dtype=bool)
+    selectable[list(banned)] = False
+    if len(required) > TEAM_SIZE:
+        raise ValueError(f"{len(required)} required players, but a team has {TEAM_SIZE}")
+    if selectable.sum() < TEAM_SIZE:
+        raise ValueError(f"Only {int(selectable.sum())} selectable players, {TEAM_SIZE} needed")
+
+    def attempt(ranges, min_bowling):
+        return solve_xi(scores, roles, ranges, min_bowling_options=min_bowling,
+                        required=required, excluded=banned, top_k=top_k)
+
+    solutions = attempt(composition, min_bowling_options)
+    if solutions:
+        return solutions
+
+    # Keep the bowling minimum if the selectable bowlers can cover it
+    bowling_left = int((selectable & np.isin(roles, BOWLING_ROLES)).sum())
+    min_bowling = min(min_bowling_options, bowling_left)
+
+    # 1. A role runs short: take what it has, open the remaining spots
+    available = {role: int((selectable & (roles == role)).sum()) for role in composition}
+    relaxed = {role: (min(count, available[role]), TEAM_SIZE) for role, count in composition.items()}
+    # 2. The required players overflow a role: no role minimums beyond them
+    is_required = np.isin(np.arange(len(scores)), required)
+    open_ranges = {role: (int((is_required & (roles == role)).sum()), TEAM_SIZE) for role in composition}
+
+    for ranges, bowling in ((relaxed, min_bowling), (open_ranges, min_bowling), (open_ranges, 0)):
+        solutions = attempt(ranges, bowling)
+        if solutions:
+            return solutions
+
+    # Unreachable with >= TEAM_SIZE selectable players; kept as a hard bound
+    order = required + [int(i) for i in np.argsort(-scores, kind='stable') if selectable[i] and int(i) not in required]
+    order = order[:TEAM_SIZE]
+    return [(float(scores[order].sum()), tuple(order))]
+
+def select_best_xis(df, pitch_type, match_format, required_players=(), excluded_players=(),
+                    min_bowling_options=DEFAULT_MIN_BOWLING_OPTIONS, top_k=1):
+    """
+    Best XI (and up to top_k - 1 alternatives) maximizing total Predicted_Score.
+
+    The role composition is a hard constraint; only when the squad is short
+    of a role is it relaxed to "what that role has" with the remaining spots
+    open to the best scorers. Returns a list of teams (lists of row dicts).
+    """
+    # Normalize Roles
+    roles = df['Role'].astype(str).str.lower().replace(ROLE_ALIASES).to_numpy()
+    scores = df['Predicted_Score'].to_numpy(dtype=np.float64)
+    names = df['Player_Name'].tolist()
+    required = _player_indices(names, required_players)
+    excluded = _player_indices(names, excluded_players)
+
+    composition = get_composition(pitch_type, match_format)
+    solutions = solve_with_fallback(scores, roles, composition, min_bowling_options, required, excluded, top_k)
+
+    records = df.assign(Role=roles)
+    return [records.iloc[list(indices)].to_dict('records') for _, indices in solutions]
+
+def select_best_11(df, pitch_type, match_format):
+    teams = select_best_xis(df, pitch_type, match_format)
+    return teams[0] if teams else []
 
-    # Fill remaining spots if needed
-    if len(final_team) < 11:
-        needed = 11 - len(final_team)
-        extras = df.head(needed)
-        final_team.extend(extras.to_dict('records'))
+# --- 4. PREDICTION (Strict Type Handling for Model) ---
+CAT_FEATURES = ['main_role', 'Pitch_Type', 'weather', 'Opposition', 'Bowling_Style']
+NUM_FEATURES = ['Avg_Batting_Runs', 'Avg_Wicket_taken', 'Avg_SR', 'Avg_Econ', 'Avg_Fours', 'Avg_Sixes']
 
-    return final_team[:11]
+def _condition_column(value):
+    """A match condition as a string scalar, or per-row strings for stacked frames"""
+    if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+        return np.asarray(value, dtype=object).astype(str)
+    return str(value)
+
+def build_feature_frame(df_data, pitch_type, weather, opposition):
+    """
+    Add the match conditions and clean the model input columns of a player frame.
+    Conditions may be scalars or one value per row (scenario sweeps).
+    """
+    # 2. Assign Frontend Inputs to DataFrame (හැම ප්ලේයර්ටම අදාළයි)
+    # මෙතන අපි දත්ත පුරවන්නේ හරියටම Model එක ඉල්ලන විදියට (Strings නම් Strings)
+    df_data['Pitch_Type'] = _condition_column(pitch_type)
+    df_data['weather'] = _condition_column(weather)
+    df_data['Opposition'] = _condition_column(opposition)
+    
+    # Role සහ Bowling Style දැනටමත් DB එකෙන් එනවා, ඒත් හිස් නම් 'Unknown' දාමු
+    if 'Role' in df_data.columns:
+         df_data['main_role'] = df_data['Role'] # Model එකේ නම 'main_role' නම්
+    else:
+         df_data['main_role'] = 'Unknown'
+
+    if 'Bowling_Style' not in df_data.columns:
+        df_data['Bowling_Style'] = 'None'
+
+    # --- 🔥 THE REAL FIX: Data Type Cleaning 🔥 ---
+    
+    # A. CATEGORICAL COLUMNS (වචන) -> ODI pipeline එකේ categories වලට (unknown -> 'Unknown')
+    prepare_categoricals(df_data, odi_category_tables, CAT_FEATURES)
+
+    # B. NUMERICAL COLUMNS (ඉලක්කම්) -> Float/Int වලට හරවන්න ඕනේ
+    for col in NUM_FEATURES:
+        if col not in df_data.columns:
+            df_data[col] = 0.0
+        
+        # වචන තිබුණොත් අයින් කරලා ඉලක්කම් බවට හරවනවා
+        df_data[col] = pd.to_numeric(df_data[col], errors='coerce').fillna(0.0)
+
+    return df_data
+
+def get_t20_predictor():
+    """InplacePredictor for the loaded T20 booster (rebuilt after a reload)"""
+    global t20_predictor
+    if t20_predictor is None or t20_predictor.booster is not t20_model:
+        t20_predictor = InplacePredictor(t20_model, NUM_FEATURES)
+    return t20_predictor
+
+def score_players(df_data, match_type):
+    """3. PREDICTION WITH MODEL - sets 'Predicted_Score' on a feature frame"""
+    ensure_models_loaded()
+    if match_type == 'ODI' and odi_model:
+        # Model එකට යවන Column ලිස්ට් එක (හරියටම Train කරපු පිළිවෙලට)
+        model_cols = CAT_FEATURES + NUM_FEATURES
+        
+        try:
+            # දත්ත ටික හරියටම සකස් වුණා, දැන් Predict කරනවා
+            with inference_timer('odi'):
+                preds = odi_model.predict(df_data[model_cols])
+            
+            # Result Handling
+            if preds.ndim > 1:
+                df_data['Predicted_Score'] = preds[:, 0] + preds[:, 1]
+            else:
+                df_data['Predicted_Score'] = preds
+            
+            print("✅ ODI Model Prediction Successful")
+
+        except Exception as model_error:
+            print(f"❌ Model Error Details: {model_error}")
+            raise model_error # ඇත්ත Error එක පෙන්නන්න
+
+    elif match_type == 'T20' and t20_model:
+        # T20 Model එකට ඕනේ Numbers විතරයි
+        with inference_timer('t20'):
+            df_data['Predicted_Score'] = get_t20_predictor().predict(df_data)
+
+    else:
+        # Test Match හෝ Model නැති විට
+        print(f"ℹ️ Using Calculation Logic for {match_type}")
+        wkt_points = 25 if match_type == 'TEST' else 20
+        df_data['Predicted_Score'] = (
+            (df_data['Avg_Batting_Runs'] * 1.0) + 
+            (df_data['Avg_Wicket_taken'] * wkt_points) + 
+            (df_data['Avg_Fours'] * 1) + 
+            (df_data['Avg_Sixes'] * 2)
+        )
+
+    return df_data
+
+def predict_scores(match_type, pitch_type, weather, opposition):
+    """
+    Per-player predicted scores (Player_Name, Role, Predicted_Score) for the
+    given conditions, served from the prediction cache when possible.
+    Returns an empty frame when the format has no data.
+    """
+    ensure_models_loaded()
+    key = (match_type, str(pitch_type), str(weather), str(opposition), get_version(), MODEL_VERSION)
+    cached = prediction_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # 1. Get Data from DB
+    df_data = get_player_data_from_db(match_type)
+    if df_data.empty:
+        return df_data
+
+    df_data = score_players(build_feature_frame(df_data, pitch_type, weather, opposition), match_type)
+    scores = df_data[['Player_Name', 'Role', 'Predicted_Score']].reset_index(drop=True)
+    prediction_cache.put(key, scores)
+    return scores
+
+def team_payload(team):
+    """JSON shape of one XI"""
+    return [{
+        "player_name": p['Player_Name'],
+        "role": p['Role'],
+        "predicted_score": round(float(p.get('Predicted_Score', 0)), 2)
+    } for p in team]
+
+def team_result(df_scores, data, match_type, pitch_type):
+    """/api/predict-team response body for scored players (ValueError on bad options)"""
+    alternatives = min(int(data.get('alternatives', 0) or 0), MAX_ALTERNATIVES)
+    teams = select_best_xis(
+        df_scores, pitch_type, match_type,
+        required_players=data.get('required_players') or [],
+        excluded_players=data.get('excluded_players') or [],
+        min_bowling_options=int(data.get('min_bowling_options', DEFAULT_MIN_BOWLING_OPTIONS)),
+        top_k=1 + max(alternatives, 0)
+    )
+
+    result = {
+        "status": "success",
+        "match_details": {"format": match_type, "pitch": pitch_type},
+        "team": team_payload(teams[0])
+    }
+    if alternatives > 0:
+        result["alternatives"] = [team_payload(team) for team in teams[1:]]
+    return result
 
-# --- 4. PREDICTION ENDPOINT (Strict Type Handling for Model) ---
 @best_xi_bp.route('/api/predict-team', methods=['POST'])
 def predict_team():
     try:
@@ -186,120 +405,233 @@ def predict_team():
         weather = data.get('weather', 'Clear')      # Frontend එකෙන් එන Weather
         opposition = data.get('opposition', 'India') # Frontend එකෙන් එන Opposition
         
-        # 1. Get Data from DB
-        df_data = get_player_data_from_db(match_type)
+        # 1-3. Data from DB + model scores (cached per conditions)
+        df_scores = predict_scores(match_type, pitch_type, weather, opposition)
         
-        if df_data.empty:
+        if df_scores.empty:
             return jsonify({"status": "error", "message": f"No player data found for {match_type} in Database."}), 404
 
-        # 2. Assign Frontend Inputs to DataFrame (හැම ප්ලේයර්ටම අදාළයි)
-        # මෙතන අපි දත්ත පුරවන්නේ හරියටම Model එක ඉල්ලන විදියට (Strings නම් Strings)
-        df_data['Pitch_Type'] = str(pitch_type)
-        df_data['weather'] = str(weather)
-        df_data['Opposition'] = str(opposition)
-        
-        # Role සහ Bowling Style දැනටමත් DB එකෙන් එනවා, ඒත් හිස් නම් 'Unknown' දාමු
-        if 'Role' in df_data.columns:
-             df_data['main_role'] = df_data['Role'] # Model එකේ නම 'main_role' නම්
-        else:
-             df_data['main_role'] = 'Unknown'
+        # 4. Select Best XI (+ optional constraints / alternative XIs)
+        try:
+            result = team_result(df_scores, data, match_type, pitch_type)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
 
-        if 'Bowling_Style' not in df_data.columns:
-            df_data['Bowling_Style'] = 'None'
+        return jsonify(result)
 
-        # --- 🔥 THE REAL FIX: Data Type Cleaning 🔥 ---
-        
-        # A. CATEGORICAL COLUMNS (වචන) -> String වලට හරවන්න ඕනේ (0 දාන්න බෑ)
-        cat_features = ['main_role', 'Pitch_Type', 'weather', 'Opposition', 'Bowling_Style']
-        
-        for col in cat_features:
-            # Column එක නැත්නම් හදනවා
-            if col not in df_data.columns:
-                df_data[col] = 'Unknown'
-            
-            # Nan/Null තිබුණොත් 'Unknown' දාලා String බවට හරවනවා
-            df_data[col] = df_data[col].fillna('Unknown').astype(str)
+    except Exception as e:
+        import traceback
+        traceback.print_exc() # Error එක Terminal එකේ පෙන්නන්න
+        return jsonify({"status": "error", "message": f"Error: {str(e)}"}), 500
 
-        # B. NUMERICAL COLUMNS (ඉලක්කම්) -> Float/Int වලට හරවන්න ඕනේ
-        num_features = ['Avg_Batting_Runs', 'Avg_Wicket_taken', 'Avg_SR', 'Avg_Econ', 'Avg_Fours', 'Avg_Sixes']
-        
-        for col in num_features:
-            if col not in df_data.columns:
-                df_data[col] = 0.0
-            
-            # වචන තිබුණොත් අයින් කරලා ඉලක්කම් බවට හරවනවා
-            df_data[col] = pd.to_numeric(df_data[col], errors='coerce').fillna(0.0)
+@best_xi_bp.route('/api/ml/reload-models', methods=['POST'])
+def reload_models():
+    """Reload the model files from disk and invalidate cached predictions"""
+    load_models()
+    return jsonify({
+        "status": "success",
+        "model_version": MODEL_VERSION,
+        "odi_model": odi_model is not None,
+        "t20_model": t20_model is not None
+    })
 
-        # 3. PREDICTION WITH MODEL
-        if match_type == 'ODI' and odi_model:
-            # Model එකට යවන Column ලිස්ට් එක (හරියටම Train කරපු පිළිවෙලට)
-            model_cols = cat_features + num_features
-            
-            try:
-                # දත්ත ටික හරියටම සකස් වුණා, දැන් Predict කරනවා
-                preds = odi_model.predict(df_data[model_cols])
-                
-                # Result Handling
-                if preds.ndim > 1:
-                    df_data['Predicted_Score'] = preds[:, 0] + preds[:, 1]
-                else:
-                    df_data['Predicted_Score'] = preds
-                
-                print("✅ ODI Model Prediction Successful")
-
-            except Exception as model_error:
-                print(f"❌ Model Error Details: {model_error}")
-                raise model_error # ඇත්ත Error එක පෙන්නන්න
-
-        elif match_type == 'T20' and t20_model:
-            # T20 Model එකට ඕනේ Numbers විතරයි
-            dtest = xgb.DMatrix(df_data[num_features])
-            preds = t20_model.predict(dtest)
-            df_data['Predicted_Score'] = preds
+@best_xi_bp.route('/api/ml/cache-stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({"model_version": MODEL_VERSION, **prediction_cache.stats()})
+    
 
-        else:
-            # Test Match හෝ Model නැති විට
-            print(f"ℹ️ Using Calculation Logic for {match_type}")
-            wkt_points = 25 if match_type == 'TEST' else 20
-            df_data['Predicted_Score'] = (
-                (df_data['Avg_Batting_Runs'] * 1.0) + 
-                (df_data['Avg_Wicket_taken'] * wkt_points) + 
-                (df_data['Avg_Fours'] * 1) + 
-                (df_data['Avg_Sixes'] * 2)
+# --- 5. SCENARIO SWEEP (every pitch x weather x opposition in one pass) ---
+MAX_SWEEP_SCENARIOS = 1000
+# Scenarios scored per model call; a streamed sweep sends its first line after one batch
+SWEEP_SCORE_BATCH = max(1, int(os.getenv('SWEEP_SCORE_BATCH', 64)))
+# Size of the one selection pool; a request's "workers" is clamped to it
+SWEEP_WORKERS = max(1, int(os.getenv('SWEEP_WORKERS', os.cpu_count() or 1)))
+_selection_pool = None
+_selection_pool_lock = threading.Lock()
+
+def get_selection_pool():
+    """Shared process pool for the XI selection step (created on first use)"""
+    global _selection_pool
+    with _selection_pool_lock:
+        if _selection_pool is None:
+            # forkserver / spawn: never fork the multi-threaded server process
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _selection_pool = ProcessPoolExecutor(max_workers=SWEEP_WORKERS,
+                                                  mp_context=multiprocessing.get_context(method))
+        return _selection_pool
+
+@atexit.register
+def shutdown_selection_pool():
+    global _selection_pool
+    with _selection_pool_lock:
+        if _selection_pool is not None:
+            _selection_pool.shutdown(wait=True, cancel_futures=True)
+            _selection_pool = None
+
+def _select_scenario(task):
+    """Pool worker: best XI indices for one scenario (plain arrays in, tuple out)"""
+    scores, roles, composition, min_bowling_options = task
+    total, indices = solve_with_fallback(scores, roles, composition, min_bowling_options)[0]
+    return total, indices
+
+def score_scenarios(df_players, match_type, scenarios):
+    """
+    Predicted scores for every (pitch, weather, opposition) scenario.
+
+    Builds one stacked feature frame (players x scenarios) and makes a
+    single model call. Returns an array of shape (len(scenarios), n_players).
+    """
+    n_players = len(df_players)
+    pitches, weathers, oppositions = (np.repeat(np.array(values, dtype=object), n_players) for values in zip(*scenarios))
+
+    stacked = df_players.iloc[np.tile(np.arange(n_players), len(scenarios))].reset_index(drop=True)
+    stacked = score_players(build_feature_frame(stacked, pitches, weathers, oppositions), match_type)
+    return stacked['Predicted_Score'].to_numpy(dtype=np.float64).reshape(len(scenarios), n_players)
+
+def build_scenarios(pitch_types, weathers, oppositions):
+    """Every (pitch, weather, opposition) combination, checked against MAX_SWEEP_SCENARIOS"""
+    scenarios = list(itertools.product(pitch_types, weathers, oppositions))
+    if not scenarios:
+        raise ValueError("No scenarios requested")
+    if len(scenarios) > MAX_SWEEP_SCENARIOS:
+        raise ValueError(f"Too many scenarios ({len(scenarios)} > {MAX_SWEEP_SCENARIOS})")
+    return scenarios
+
+def run_sweep(match_type, pitch_types, weathers, oppositions, min_bowling_options=DEFAULT_MIN_BOWLING_OPTIONS, workers=0):
+    """
+    Best XI for every scenario. Returns (players, roles, scenario_count, results)
+    where results is a lazy iterator of (pitch, weather, opposition, total_score,
+    indices, scores) in scenario order. Scenarios are checked (ValueError) and
+    the features loaded before it returns; iterating does no database access.
+    """
+    scenarios = build_scenarios(pitch_types, weathers, oppositions)
+
+    # Features are loaded once for the whole sweep
+    df_players = get_player_data_from_db(match_type)
+    if df_players.empty:
+        return [], [], 0, iter(())
+
+    roles = sweep_roles(df_players)
+    results = iter_sweep(df_players, roles, match_type, scenarios, min_bowling_options, workers)
+    return df_players['Player_Name'].tolist(), roles.tolist(), len(scenarios), results
+
+def sweep_roles(df_players):
+    return df_players['Role'].astype(str).str.lower().replace(ROLE_ALIASES).to_numpy()
+
+def iter_sweep(df_players, roles, match_type, scenarios, min_bowling_options=DEFAULT_MIN_BOWLING_OPTIONS, workers=0):
+    """
+    Yield each scenario's result as soon as its XI is picked. Scores come from
+    one model call per SWEEP_SCORE_BATCH scenarios; with workers > 1 at most
+    `workers` selections are in the pool at once, so one request never
+    occupies more pool processes.
+    """
+    workers = min(workers or 0, SWEEP_WORKERS)
+    pool = get_selection_pool() if workers > 1 else None
+    pending = deque()
+
+    def finished(pick, item):
+        (pitch, weather, opposition), row = item
+        total, indices = pick
+        return pitch, weather, opposition, total, indices, row[list(indices)]
+
+    for start in range(0, len(scenarios), SWEEP_SCORE_BATCH):
+        batch = scenarios[start:start + SWEEP_SCORE_BATCH]
+        scores = score_scenarios(df_players, match_type, batch)
+        for scenario, row in zip(batch, scores):
+            task = (row, roles, get_composition(scenario[0], match_type), min_bowling_options)
+            if pool is None:
+                yield finished(_select_scenario(task), (scenario, row))
+                continue
+            pending.append((pool.submit(_select_scenario, task), (scenario, row)))
+            if len(pending) >= workers:
+                future, item = pending.popleft()
+                yield finished(future.result(), item)
+    while pending:
+        future, item = pending.popleft()
+        yield finished(future.result(), item)
+
+def sweep_players(df_players, match_type, scenarios, min_bowling_options=DEFAULT_MIN_BOWLING_OPTIONS, workers=0):
+    """The whole sweep on an already loaded player feature frame: (players, roles, results list)"""
+    roles = sweep_roles(df_players)
+    results = list(iter_sweep(df_players, roles, match_type, scenarios, min_bowling_options, workers))
+    return df_players['Player_Name'].tolist(), roles.tolist(), results
+
+def scenario_payload(result):
+    """Compact JSON for one scenario: team as indices into the players list"""
+    pitch, weather, opposition, total, indices, scores = result
+    return {
+        "pitch_type": pitch,
+        "weather": weather,
+        "opposition": opposition,
+        "total_score": round(float(total), 2),
+        "team": [int(i) for i in indices],
+        "scores": [round(float(x), 2) for x in scores]
+    }
+
+def sweep_header(match_type, players, roles, scenario_count):
+    return {"status": "success", "format": match_type, "players": players, "roles": roles, "scenario_count": scenario_count}
+
+@best_xi_bp.route('/api/predict-team/sweep', methods=['POST'])
+def predict_team_sweep():
+    """
+    Best XI for every requested pitch x weather x opposition combination.
+    Omitted lists default to the full dropdown values; "stream": true returns
+    NDJSON: a header line, then one line per scenario as soon as it is picked
+    (an error after the header ends the stream with a {"status": "error"} line).
+    """
+    try:
+        data = request.json or {}
+        match_type = data.get('match_type', 'ODI').upper()
+        try:
+            players, roles, scenario_count, results = run_sweep(
+                match_type,
+                data.get('pitch_types') or PITCH_TYPES,
+                data.get('weathers') or WEATHER_CONDITIONS,
+                data.get('oppositions') or OPPOSITIONS,
+                min_bowling_options=int(data.get('min_bowling_options', DEFAULT_MIN_BOWLING_OPTIONS)),
+                workers=int(data.get('workers', 0) or 0)
             )
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
 
-        # 4. Select Best XI
-        final_team = select_best_11(df_data, pitch_type, match_type)
+        if not players:
+            return jsonify({"status": "error", "message": f"No player data found for {match_type} in Database."}), 404
+
+        header = sweep_header(match_type, players, roles, scenario_count)
 
-        response = []
-        for p in final_team:
-            response.append({
-                "player_name": p['Player_Name'],
-                "role": p['Role'],
-                "predicted_score": round(float(p.get('Predicted_Score', 0)), 2)
-            })
+        if data.get('stream'):
+            def generate():
+                yield json.dumps(header) + "\n"
+                try:
+                    for result in results:
+                        yield json.dumps(scenario_payload(result)) + "\n"
+                except Exception as e:
+                    import traceback
+                    traceback.print_exc()
+                    yield json.dumps({"status": "error", "message": f"Error: {str(e)}"}) + "\n"
+            return Response(generate(), mimetype='application/x-ndjson')
 
-        return jsonify({
-            "status": "success",
-            "match_details": {"format": match_type, "pitch": pitch_type},
-            "team": response
-        })
+        return jsonify({**header, "scenarios": [scenario_payload(r) for r in results]})
 
     except Exception as e:
         import traceback
-        traceback.print_exc() # Error එක Terminal එකේ පෙන්නන්න
+        traceback.print_exc()
         return jsonify({"status": "error", "message": f"Error: {str(e)}"}), 500
-    
 
-# --- 5. DROPDOWNS ---
+
+# --- 6. DROPDOWNS ---
+PITCH_TYPES = ["Batting Friendly", "Bowling Friendly", "Spin Friendly", "Balanced", "Green", "Dusty"]
+WEATHER_CONDITIONS = ["Clear", "Sunny", "Cloudy", "Overcast", "Rainy", "Humid", "Dry"]
+OPPOSITIONS = ["India", "Australia", "England", "New Zealand", "Pakistan", "South Africa", "Bangladesh", "West Indies", "Afghanistan"]
+
 @best_xi_bp.route('/api/ml/match-types', methods=['GET'])
 def get_match_types(): return jsonify(["ODI", "T20", "TEST"])
 
 @best_xi_bp.route('/api/ml/pitch-types', methods=['GET'])
-def get_pitch_types(): return jsonify(["Batting Friendly", "Bowling Friendly", "Spin Friendly", "Balanced", "Green", "Dusty"])
+def get_pitch_types(): return jsonify(PITCH_TYPES)
 
 @best_xi_bp.route('/api/ml/weather-conditions', methods=['GET'])
-def get_ml_weather_conditions(): return jsonify(["Clear", "Sunny", "Cloudy", "Overcast", "Rainy", "Humid", "Dry"])
+def get_ml_weather_conditions(): return jsonify(WEATHER_CONDITIONS)
 
 @best_xi_bp.route('/api/ml/oppositions', methods=['GET'])
-def get_ml_oppositions(): return jsonify(["India", "Australia", "England", "New Zealand", "Pakistan", "South Africa", "Bangladesh", "West Indies", "Afghanistan"])
\ No newline at end of file
+def get_ml_oppositions(): return jsonify(OPPOSITIONS)
@@ -1,29 +1,22 @@
 from flask import Blueprint, jsonify, request
-from models import db, ODIPerformance, T20Performance, TestPerformance
-from sqlalchemy import func, distinct
+from models import db
+from player_aggregates import bowling_rows
+from stats_kernels import summarize_bowling
+from performance_view import format_key, relation
 
 bowling_bp = Blueprint('bowling', __name__)
 
-def get_model(match_type):
-    # Match type එක upper case කරලා check කිරීම වඩාත් ආරක්ෂිතයි
-    m_type = match_type.upper()
-    if m_type == 'ODI': return ODIPerformance
-    elif m_type == 'T20': return T20Performance
-    elif m_type == 'TEST': return TestPerformance
-    return ODIPerformance
-
 @bowling_bp.route('/api/bowling/players', methods=['GET'])
 def get_bowling_players():
     match_type = request.args.get('matchType', 'ODI').upper()
     
     try:
-        model = get_model(match_type)
-        # ODI සදහා wicket_taken, අනිත් ඒවා සදහා wickets
-        wicket_col = model.wicket_taken if match_type == 'ODI' else model.wickets
+        # Canonical columns: wickets is wicket_taken in the ODI table
+        perf = relation(format_key(match_type))
         
-        players = db.session.query(distinct(model.player_name)).filter(
-            wicket_col > 0
-        ).all()
+        players = db.session.query(perf.c.player_name).filter(
+            perf.c.wickets > 0
+        ).distinct().all()
         
         players_list = sorted([p[0] for p in players if p[0]])
         return jsonify(players_list)
@@ -40,13 +33,12 @@ def get_bowling_grounds_for_player():
     if not player_name: return jsonify([])
 
     try:
-        model = get_model(match_type)
-        wicket_col = model.wicket_taken if match_type == 'ODI' else model.wickets
+        perf = relation(format_key(match_type))
         
-        grounds = db.session.query(distinct(model.ground)).filter(
-            model.player_name == player_name,
-            wicket_col > 0
-        ).all()
+        grounds = db.session.query(perf.c.ground).filter(
+            perf.c.player_name == player_name,
+            perf.c.wickets > 0
+        ).distinct().all()
         
         return jsonify(sorted([g[0] for g in grounds if g[0]]))
     except Exception as e:
@@ -62,46 +54,14 @@ def get_bowling_stats():
         return jsonify({'error': 'Missing params'}), 400
     
     try:
-        model = get_model(match_type)
-        wicket_col = model.wicket_taken if match_type == 'ODI' else model.wickets
-        
-        performances = db.session.query(model).filter(
-            model.player_name == player_name,
-            model.ground == ground_name,
-            wicket_col > 0
-        ).all()
+        # Pre-aggregated rows (one per opposition), ratios in NumPy
+        groups = bowling_rows(match_type, player_name, ground_name)
+        summary = summarize_bowling(*zip(*groups)) if groups else None
 
-        if not performances: 
+        if summary is None: 
             return jsonify({'message': 'No data found'}), 404
 
-        # --- CALCULATION STEP ---
-        total_matches = len(performances)
-        total_wickets = sum(getattr(p, 'wicket_taken' if match_type == 'ODI' else 'wickets') for p in performances)
-        total_runs = sum(p.runs_conceded for p in performances)
-        
-        # Economy එක ODI වල 'econ', අනිත් ඒවගේ 'economy'
-        econ_attr = 'econ' if match_type == 'ODI' else 'economy'
-        avg_econ = sum(getattr(p, econ_attr, 0) for p in performances) / total_matches
-
-        # Best Opposition Logic
-        opp_wkts = {}
-        for p in performances:
-            opp = p.opposition
-            if opp not in opp_wkts: opp_wkts[opp] = 0
-            w = getattr(p, 'wicket_taken' if match_type == 'ODI' else 'wickets')
-            opp_wkts[opp] += w
-            
-        best_opp = max(opp_wkts.items(), key=lambda x: x[1])[0] if opp_wkts else 'N/A'
-        avg = (total_runs / total_wickets) if total_wickets > 0 else 0
-
-        return jsonify({
-            "matches": total_matches,
-            "wickets": total_wickets,
-            "runsConceded": total_runs,
-            "economy": round(avg_econ, 2),
-            "average": round(avg, 2),
-            "bestOpposition": best_opp
-        })
+        return jsonify(summary)
 
     except Exception as e:
         print(f"Stats Error: {e}")
@@ -0,0 +1,135 @@
+from flask import Blueprint, jsonify, request
+import numpy as np
+from sqlalchemy import case, func, select
+from models import db
+from performance_view import FORMAT_MODELS, relation
+from stats_kernels import overs_to_balls, balls_to_overs
+
+career_bp = Blueprint('career', __name__)
+
+# ----------------------------------------------------------------
+# Career profile: one aggregate query per format, in series
+# ----------------------------------------------------------------
+SPLITS = ['opposition', 'ground', 'pitch_type', 'weather']
+SPLIT_KEYS = {'opposition': 'byOpposition', 'ground': 'byGround', 'pitch_type': 'byPitchType', 'weather': 'byWeather'}
+METRICS = ['matches', 'bat_innings', 'runs', 'balls_faced', 'fours', 'sixes',
+           'bowl_innings', 'wickets', 'balls_bowled', 'runs_conceded']
+UNKNOWN = 'Unknown'  # Split value for rows without a pitch type / weather
+
+def career_query(player_name, match_type):
+    """Per (format, opposition, ground, pitch, weather, overs) totals for one player in one format"""
+    return aggregate_query(relation(match_type), player_name)
+
+def aggregate_query(perf, player_name):
+    """career_query over any canonical-column relation with a match_type column"""
+    # Same innings rules as the player/ground aggregates
+    is_bat = perf.c.runs > 0
+    is_bowl = perf.c.wickets > 0
+    overs = func.coalesce(perf.c.overs, 0.0)
+
+    def total(condition, column):
+        return func.sum(case((condition, func.coalesce(column, 0)), else_=0))
+
+    # Grouped by overs too, so overs -> balls is exact (done in NumPy)
+    keys = [perf.c.match_type, perf.c.opposition, perf.c.ground,
+            func.coalesce(perf.c.pitch_type, UNKNOWN), func.coalesce(perf.c.weather, UNKNOWN), overs]
+    return select(
+        *keys,
+        func.count(),
+        func.sum(case((is_bat, 1), else_=0)),
+        total(is_bat, perf.c.runs),
+        total(is_bat, perf.c.balls_faced),
+        total(is_bat, perf.c.fours),
+        total(is_bat, perf.c.sixes),
+        func.sum(case((is_bowl, 1), else_=0)),
+        total(is_bowl, perf.c.wickets),
+        total(is_bowl, perf.c.runs_conceded)
+    ).where(perf.c.player_name == player_name).group_by(*keys)
+
+def fetch_career(player_name):
+    """
+    (format keys, split keys, metrics matrix) of one player, None without records.
+
+    The formats are queried one after another on the request's connection:
+    each is an index search on player_name, and on SQLite the three in
+    series beat one UNION ALL query grouped by match_type.
+    """
+    rows = []
+    for match_type in FORMAT_MODELS:
+        rows += db.session.execute(career_query(player_name, match_type)).all()
+    if not rows:
+        return None
+
+    columns = list(zip(*rows))
+    formats = np.asarray(columns[0], dtype=object).astype(str)
+    keys = {name: np.asarray(columns[i + 1], dtype=object).astype(str) for i, name in enumerate(SPLITS)}
+    (matches, bat_innings, runs, balls_faced, fours, sixes,
+     bowl_innings, wickets, runs_conceded) = np.asarray(columns[6:], dtype=np.int64)
+    balls_bowled = overs_to_balls(columns[5]) * bowl_innings
+    metrics = np.column_stack([matches, bat_innings, runs, balls_faced, fours, sixes,
+                               bowl_innings, wickets, balls_bowled, runs_conceded])
+    return formats, keys, metrics
+
+def _figures(totals):
+    """Batting and bowling figures from one row of summed METRICS"""
+    t = dict(zip(METRICS, (int(v) for v in totals)))
+    return {
+        "matches": t['matches'],
+        "batting": {
+            "innings": t['bat_innings'],
+            "runs": t['runs'],
+            "ballsFaced": t['balls_faced'],
+            "fours": t['fours'],
+            "sixes": t['sixes'],
+            "average": round(t['runs'] / t['bat_innings'], 2) if t['bat_innings'] > 0 else 0,
+            "strikeRate": round(t['runs'] * 100 / t['balls_faced'], 2) if t['balls_faced'] > 0 else 0
+        },
+        "bowling": {
+            "innings": t['bowl_innings'],
+            "wickets": t['wickets'],
+            "balls": t['balls_bowled'],
+            "overs": balls_to_overs(t['balls_bowled']),
+            "runsConceded": t['runs_conceded'],
+            "economy": round(t['runs_conceded'] * 6 / t['balls_bowled'], 2) if t['balls_bowled'] > 0 else 0,
+            "average": round(t['runs_conceded'] / t['wickets'], 2) if t['wickets'] > 0 else 0,
+            "strikeRate": round(t['balls_bowled'] / t['wickets'], 2) if t['wickets'] > 0 else 0
+        }
+    }
+
+def summarize(keys, metrics):
+    """Totals plus one entry per split value, most matches first"""
+    profile = _figures(metrics.sum(axis=0))
+    for split in SPLITS:
+        names, inverse = np.unique(keys[split], return_inverse=True)
+        sums = np.zeros((len(names), metrics.shape[1]), dtype=np.int64)
+        np.add.at(sums, inverse, metrics)
+        order = np.lexsort((names, -sums[:, 0]))
+        profile[SPLIT_KEYS[split]] = [{split: str(names[i]), **_figures(sums[i])} for i in order]
+    return profile
+
+@career_bp.route('/api/career', methods=['GET'])
+def get_career():
+    """?player=...: per-format and combined batting / bowling profile"""
+    player_name = request.args.get('player')
+    if not player_name:
+        return jsonify({'error': 'Missing params'}), 400
+
+    try:
+        career = fetch_career(player_name)
+        if career is None:
+            return jsonify({'message': 'No data found'}), 404
+
+        formats, keys, metrics = career
+        profiles = {}
+        for m in FORMAT_MODELS:
+            rows = formats == m
+            if rows.any():
+                profiles[m] = summarize({s: keys[s][rows] for s in SPLITS}, metrics[rows])
+        return jsonify({
+            "player": player_name,
+            "formats": profiles,
+            "combined": summarize(keys, metrics)
+        })
+    except Exception as e:
+        print(f"Career Error: {e}")
+        return jsonify({"error": str(e)}), 500
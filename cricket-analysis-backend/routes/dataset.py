@@ -1,7 +1,15 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from models import db, ODIPerformance, T20Performance, TestPerformance
+from sqlalchemy import select, and_, or_
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+import base64
+import json
+from player_aggregates import apply_record
+from data_version import bump_version
+from prediction_cache import prediction_cache
+from bulk_import import import_file, detect_format
+from performance_view import model_for
 
 dataset_bp = Blueprint('dataset', __name__)
 
@@ -104,7 +112,10 @@ def add_record():
             )
 
         db.session.add(new_record)
+        apply_record(new_record)
+        bump_version()
         db.session.commit()
+        prediction_cache.clear()
         return jsonify({"message": f"{match_type} Record added successfully!"}), 201
 
     except Exception as e:
@@ -121,32 +132,119 @@ def check_condition():
     opposition = request.args.get('opposition')
     m_type = request.args.get('match_type', 'ODI').upper()
     
-    if m_type == 'ODI':
-        model = ODIPerformance
-    elif m_type == 'T20':
-        model = T20Performance
-    else:
-        model = TestPerformance
-        
+    # Unknown values fall through to the Test table, as before
+    model = model_for(m_type, default='TEST')
     exists = model.query.filter_by(player_name=player_name, opposition=opposition).first() is not None
     return jsonify({"exists": exists}), 200
 
 # ----------------------------------------------------------------
-# 3. GET ALL RECORDS
+# 3. GET RECORDS (keyset pages on (date, id) or streamed)
 # ----------------------------------------------------------------
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 500  # Rows per DB fetch / response chunk while streaming
+
+# Query param -> column, compared with = in SQL
+RECORD_FILTERS = {'player': 'player_name', 'opposition': 'opposition', 'ground': 'ground'}
+
+def encode_cursor(record):
+    """Opaque cursor pointing just after `record` in (date desc, id desc) order"""
+    date_value = record.date.isoformat() if hasattr(record.date, 'isoformat') else record.date
+    raw = json.dumps([date_value, record.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """cursor -> (date or None, id); ValueError if it was not made by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        date_value, record_id = json.loads(raw)
+        date_value = datetime.strptime(date_value, '%Y-%m-%d').date() if date_value else None
+        return date_value, int(record_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def records_query(model, args, cursor=None):
+    """
+    Newest first: date desc, then id desc, rows without a date last.
+    Filters and the cursor are applied in SQL.
+    """
+    stmt = select(model)
+    for param, column in RECORD_FILTERS.items():
+        if args.get(param):
+            stmt = stmt.where(getattr(model, column) == args[param])
+
+    if cursor is not None:
+        date_value, record_id = cursor
+        if date_value is None:
+            stmt = stmt.where(model.date.is_(None), model.id < record_id)
+        else:
+            stmt = stmt.where(or_(
+                model.date < date_value,
+                and_(model.date == date_value, model.id < record_id),
+                model.date.is_(None)
+            ))
+    # NULL dates already sort last under DESC in MySQL and SQLite; ordering on
+    # plain (date, id) lets the ix_*_date_id index return rows pre-sorted
+    return stmt.order_by(model.date.desc(), model.id.desc())
+
+def _record_batches(stmt):
+    """to_dict() rows in batches of STREAM_BATCH_SIZE (only one batch in memory)"""
+    result = db.session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+    for partition in result.scalars().partitions():
+        yield [record.to_dict() for record in partition]
+
+def json_array_chunks(stmt):
+    """One JSON array, sent a batch at a time"""
+    dumps = current_app.json.dumps
+    yield '['
+    separator = ''
+    for batch in _record_batches(stmt):
+        yield separator + ','.join(dumps(row) for row in batch)
+        separator = ','
+    yield ']'
+
+def ndjson_chunks(stmt):
+    """One JSON object per line"""
+    dumps = current_app.json.dumps
+    for batch in _record_batches(stmt):
+        yield ''.join(dumps(row) + '\n' for row in batch)
+
 @dataset_bp.route('/api/dataset/records', methods=['GET'])
 def list_records():
+    """
+    No paging params: every (filtered) record as a JSON list, streamed.
+    ?limit=&cursor=: one page plus next_cursor. ?stream=ndjson: NDJSON rows.
+    Filters: player, opposition, ground.
+    """
     m_type = request.args.get('match_type', 'ODI').upper()
     try:
-        if m_type == 'ODI':
-            model = ODIPerformance
-        elif m_type == 'T20':
-            model = T20Performance
-        else:
-            model = TestPerformance
-            
-        records = model.query.order_by(model.date.desc()).all()
-        return jsonify([r.to_dict() for r in records])
+        model = model_for(m_type, default='TEST')
+
+        try:
+            cursor = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        stmt = records_query(model, request.args, cursor)
+
+        if request.args.get('stream') == 'ndjson':
+            if limit is not None:
+                stmt = stmt.limit(max(limit, 0))
+            return Response(stream_with_context(ndjson_chunks(stmt)), mimetype='application/x-ndjson')
+
+        if limit is None and cursor is None:
+            return Response(stream_with_context(json_array_chunks(stmt)), mimetype='application/json')
+
+        limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+        records = db.session.execute(stmt.limit(limit + 1)).scalars().all()
+        page, has_more = records[:limit], len(records) > limit
+        return jsonify({
+            "records": [r.to_dict() for r in page],
+            "limit": limit,
+            "has_more": has_more,
+            "next_cursor": encode_cursor(page[-1]) if has_more else None
+        })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -156,18 +254,40 @@ def list_records():
 @dataset_bp.route('/api/dataset/records/<int:record_id>', methods=['DELETE'])
 def delete_record(record_id):
     m_type = request.args.get('match_type', 'ODI').upper()
+    # Outside the try: a missing id is a 404, not a 500
+    record = db.get_or_404(model_for(m_type, default='TEST'), record_id)
     try:
-        if m_type == 'ODI':
-            model = ODIPerformance
-        elif m_type == 'T20':
-            model = T20Performance
-        else:
-            model = TestPerformance
-            
-        record = model.query.get_or_404(record_id)
+        apply_record(record, sign=-1)
         db.session.delete(record)
+        bump_version()
         db.session.commit()
+        prediction_cache.clear()
         return jsonify({"message": "Record deleted successfully!"}), 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# ----------------------------------------------------------------
+# 5. BULK IMPORT (CSV / NDJSON upload)
+# ----------------------------------------------------------------
+@dataset_bp.route('/api/dataset/import', methods=['POST'])
+def bulk_import_records():
+    """
+    multipart/form-data: file, match_type, optional format (csv|ndjson) and
+    dry_run. Returns counts plus a per-row rejection report.
+    """
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    match_type = request.form.get('match_type', 'ODI').upper()
+    file_format = request.form.get('format') or detect_format(upload.filename)
+    dry_run = request.form.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    try:
+        report = import_file(upload.stream, match_type, file_format, dry_run=dry_run)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Bulk Import Error: {e}")
+        return jsonify({"error": str(e)}), 500
+    return jsonify(report), (200 if dry_run else 201)
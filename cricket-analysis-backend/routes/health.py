@@ -0,0 +1,35 @@
+from flask import Blueprint, Response, current_app, jsonify
+import startup
+from db_pool import pool_stats
+from metrics import render_prometheus
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/api/health/ready', methods=['GET'])
+def get_readiness():
+    """What is loaded so far; 503 until the database is initialized and warm-up is over"""
+    state = startup.readiness()
+    return jsonify(state), (200 if state['ready'] else 503)
+
+@health_bp.route('/api/health/pool', methods=['GET'])
+def get_pool_stats():
+    """Database pool: profile, checkout wait times, timeouts and saturation"""
+    return jsonify({"profile": current_app.config.get('DB_PROFILE'), **pool_stats()}), 200
+
+# Pool numbers exported next to the request / SQL / inference metrics
+POOL_SAMPLES = [
+    ('cricket_db_pool_checkouts_total', 'counter', 'Connections checked out of the pool', 'checkouts'),
+    ('cricket_db_pool_checkout_wait_seconds_total', 'counter', 'Time spent waiting for a pooled connection', 'wait_seconds'),
+    ('cricket_db_pool_checkout_timeouts_total', 'counter', 'Checkouts that hit pool_timeout', 'timeouts'),
+    ('cricket_db_pool_checked_out', 'gauge', 'Connections in use', 'checked_out'),
+    ('cricket_db_pool_peak_checked_out', 'gauge', 'Most connections in use at once', 'peak_checked_out'),
+    ('cricket_db_pool_capacity', 'gauge', 'pool_size + max_overflow', 'capacity'),
+    ('cricket_db_pool_saturation', 'gauge', 'checked_out / capacity', 'saturation'),
+]
+
+@health_bp.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text format; everything is aggregated only when scraped"""
+    stats = pool_stats()
+    extra = [(name, kind, help_text, stats[key]) for name, kind, help_text, key in POOL_SAMPLES if key in stats]
+    return Response(render_prometheus(extra), mimetype='text/plain; version=0.0.4')
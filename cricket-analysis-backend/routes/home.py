@@ -1,79 +1,103 @@
-from flask import Blueprint, jsonify
-import data_loader
+from flask import Blueprint, jsonify, request
+from sqlalchemy import func
+import hashlib
+import json
+import threading
+from models import db, PlayerGroundAggregate
+from data_version import get_version
 
 home_bp = Blueprint('home', __name__)
 
-def get_stats_for_match_type(match_type):
-    """Get statistics for a specific match type"""
+# Precomputed homepage payload, rebuilt only when the dataset version changes
+_snapshot = {'version': None, 'payload': None, 'etag': None}
+_snapshot_lock = threading.Lock()
+
+# Homepage keys -> aggregate table format keys
+HOME_MATCH_TYPES = {'ODI': 'ODI', 'T20': 'T20', 'Test': 'TEST'}
+
+def _top_player(match_type, column):
+    """(player_name, total) with the highest sum of an aggregate column"""
+    a = PlayerGroundAggregate
+    total = func.sum(getattr(a, column))
+    return db.session.query(a.player_name, total).filter(
+        a.match_type == match_type
+    ).group_by(a.player_name).order_by(total.desc(), a.player_name).first()
+
+def compute_stats(match_type):
+    """Statistics for a specific match type (raises on database errors)"""
+    m_type = HOME_MATCH_TYPES.get(match_type, match_type.upper())
+    a = PlayerGroundAggregate
+    total_runs, total_wickets = db.session.query(
+        func.coalesce(func.sum(a.runs), 0),
+        func.coalesce(func.sum(a.wickets), 0)
+    ).filter(a.match_type == m_type).one()
+
+    # Top Batsman
+    top_batsman, top_batsman_runs = _top_player(m_type, 'runs') or ("N/A", 0)
+
+    # Top Bowler
+    top_bowler, top_bowler_wickets = _top_player(m_type, 'wickets') or ("N/A", 0)
+
+    return {
+        'totalRuns': int(total_runs),
+        'totalWickets': int(total_wickets),
+        'topScorer': {'name': top_batsman, 'stat': f"{int(top_batsman_runs)} Runs"},
+        'topBowler': {'name': top_bowler, 'stat': f"{int(top_bowler_wickets)} Wickets"}
+    }
+
+def _stats_or_empty(match_type):
+    """(stats, ok): zeros and ok=False when the queries fail"""
     try:
-        df_bat = data_loader.get_dataset(match_type, 'batting')
-        df_bowl = data_loader.get_dataset(match_type, 'bowling')
-        
-        # Get total runs
-        total_runs = 0
-        if not df_bat.empty:
-            if 'runs' in df_bat.columns:
-                total_runs = int(df_bat['runs'].sum())
-            elif 'Runs' in df_bat.columns:
-                total_runs = int(df_bat['Runs'].sum())
-        
-        # Get total wickets
-        total_wickets = 0
-        if not df_bowl.empty:
-            if 'wickets' in df_bowl.columns:
-                total_wickets = int(df_bowl['wickets'].sum())
-            elif 'Wkts' in df_bowl.columns:
-                total_wickets = int(df_bowl['Wkts'].sum())
-        
-        # Top Batsman
-        top_batsman = "N/A"
-        top_batsman_runs = 0
-        if not df_bat.empty:
-            player_col = 'player_name' if 'player_name' in df_bat.columns else ('Player Name' if 'Player Name' in df_bat.columns else None)
-            runs_col = 'runs' if 'runs' in df_bat.columns else ('Runs' if 'Runs' in df_bat.columns else None)
-            
-            if player_col and runs_col:
-                stats = df_bat.groupby(player_col)[runs_col].sum()
-                top_batsman = stats.idxmax()
-                top_batsman_runs = int(stats.max())
-        
-        # Top Bowler
-        top_bowler = "N/A"
-        top_bowler_wickets = 0
-        if not df_bowl.empty:
-            player_col = 'player_name' if 'player_name' in df_bowl.columns else ('Player Name' if 'Player Name' in df_bowl.columns else None)
-            wickets_col = 'wickets' if 'wickets' in df_bowl.columns else ('Wkts' if 'Wkts' in df_bowl.columns else None)
-            
-            if player_col and wickets_col:
-                stats = df_bowl.groupby(player_col)[wickets_col].sum()
-                top_bowler = stats.idxmax()
-                top_bowler_wickets = int(stats.max())
-        
-        return {
-            'totalRuns': total_runs,
-            'totalWickets': total_wickets,
-            'topScorer': {'name': top_batsman, 'stat': f"{top_batsman_runs} Runs"},
-            'topBowler': {'name': top_bowler, 'stat': f"{top_bowler_wickets} Wickets"}
-        }
+        return compute_stats(match_type), True
     except Exception as e:
+        db.session.rollback()
         print(f"Error getting stats for {match_type}: {e}")
         return {
             'totalRuns': 0,
             'totalWickets': 0,
             'topScorer': {'name': 'N/A', 'stat': '0 Runs'},
             'topBowler': {'name': 'N/A', 'stat': '0 Wickets'}
-        }
+        }, False
+
+def get_stats_for_match_type(match_type):
+    """Get statistics for a specific match type (zeros on error)"""
+    return _stats_or_empty(match_type)[0]
+
+def get_snapshot():
+    """
+    Homepage snapshot for the current dataset version (rebuilt on change).
+
+    If any format fails, the zeros are served without an ETag and not
+    cached, so the next request tries again.
+    """
+    global _snapshot
+    version = get_version()
+    snapshot = _snapshot
+    if snapshot['version'] == version:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot['version'] != version:
+            results = {key: _stats_or_empty(key) for key in HOME_MATCH_TYPES}
+            payload = {key: stats for key, (stats, _) in results.items()}
+            if not all(ok for _, ok in results.values()):
+                return {'version': version, 'payload': payload, 'etag': None}
+            digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+            # Swap in a new dict so readers never see a half-updated snapshot
+            _snapshot = {'version': version, 'payload': payload, 'etag': f"v{version}-{digest}"}
+        return _snapshot
 
 @home_bp.route('/api/homepage-stats', methods=['GET'])
 def get_homepage_stats():
-    """Get homepage stats for all match types"""
+    """Get homepage stats for all match types (ETag / If-None-Match aware)"""
     try:
-        stats_data = {
-            'ODI': get_stats_for_match_type('ODI'),
-            'T20': get_stats_for_match_type('T20'),
-            'Test': get_stats_for_match_type('Test')
-        }
-        
-        return jsonify(stats_data)
+        snapshot = get_snapshot()
+        response = jsonify(snapshot['payload'])
+        # Browsers must revalidate, which costs them a 304 at most
+        response.headers['Cache-Control'] = 'no-cache'
+        if snapshot['etag'] is None:
+            return response  # Partial (failed) snapshot: never answered with a 304
+        response.set_etag(snapshot['etag'])
+        return response.make_conditional(request)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,83 @@
+from flask import Blueprint, jsonify, request
+from routes.best_xi import (
+    get_player_data_from_db, build_scenarios, DEFAULT_MIN_BOWLING_OPTIONS,
+    PITCH_TYPES, WEATHER_CONDITIONS, OPPOSITIONS
+)
+from prediction_jobs import job_manager, predict_team_task, sweep_task, QueueFullError
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# ----------------------------------------------------------------
+# Asynchronous versions of /api/predict-team and /api/predict-team/sweep.
+# Player features are read here (one DB query); the model work runs in
+# the job pool so heavy requests never hold a Flask request thread.
+# ----------------------------------------------------------------
+def _submit(kind, task, *args):
+    try:
+        job_id = job_manager.submit(kind, task, *args)
+    except QueueFullError as e:
+        return jsonify({"status": "error", "message": str(e)}), 429
+    return jsonify({"status": "queued", "job_id": job_id, "status_url": f"/api/jobs/{job_id}"}), 202
+
+def _no_data(match_type):
+    return jsonify({"status": "error", "message": f"No player data found for {match_type} in Database."}), 404
+
+@jobs_bp.route('/api/jobs/predict-team', methods=['POST'])
+def submit_predict_team():
+    data = request.get_json() or {}
+    match_type = data.get('match_type', 'ODI').upper()
+
+    df_players = get_player_data_from_db(match_type)
+    if df_players.empty:
+        return _no_data(match_type)
+
+    return _submit(
+        'predict-team', predict_team_task, df_players, data, match_type,
+        data.get('pitch_type', 'Balanced'), data.get('weather', 'Clear'), data.get('opposition', 'India')
+    )
+
+@jobs_bp.route('/api/jobs/predict-team/sweep', methods=['POST'])
+def submit_sweep():
+    data = request.get_json() or {}
+    match_type = data.get('match_type', 'ODI').upper()
+    try:
+        scenarios = build_scenarios(
+            data.get('pitch_types') or PITCH_TYPES,
+            data.get('weathers') or WEATHER_CONDITIONS,
+            data.get('oppositions') or OPPOSITIONS
+        )
+        min_bowling_options = int(data.get('min_bowling_options', DEFAULT_MIN_BOWLING_OPTIONS))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    df_players = get_player_data_from_db(match_type)
+    if df_players.empty:
+        return _no_data(match_type)
+
+    return _submit('sweep', sweep_task, df_players, match_type, scenarios, min_bowling_options)
+
+# ----------------------------------------------------------------
+# Polling / cancel / pool stats
+# ----------------------------------------------------------------
+@jobs_bp.route('/api/jobs/stats', methods=['GET'])
+def get_job_stats():
+    return jsonify(job_manager.stats())
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status; the result is included once the job is done"""
+    info = job_manager.get(job_id)
+    if info is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify(info)
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a job that has not started yet"""
+    cancelled = job_manager.cancel(job_id)
+    if cancelled is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    if not cancelled:
+        return jsonify({"status": "error", "message": "Job already running or finished",
+                        "job": job_manager.get(job_id, include_result=False)}), 409
+    return jsonify({"status": "cancelled", "job_id": job_id})
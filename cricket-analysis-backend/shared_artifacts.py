@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# Read-only, memory-mapped copies of models and frames
+# ==========================================
+# Written once by the master process before it forks; every worker maps the
+# same files, so the pages live once in the OS page cache instead of once
+# per worker. Default location is per master pid; set ARTIFACT_DIR to pin it.
+ARTIFACT_DIR = os.getenv('ARTIFACT_DIR') or os.path.join(tempfile.gettempdir(), f'cricket-artifacts-{os.getpid()}')
+
+def _path(*parts):
+    return os.path.join(ARTIFACT_DIR, *parts)
+
+def share_array(array, name):
+    """Save a NumPy array as .npy and return a read-only memmap of it"""
+    path = _path(f'{name}.npy')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, np.ascontiguousarray(array))
+    return np.load(path, mmap_mode='r')
+
+def _column_parts(series):
+    """Split a column into plain NumPy arrays + how to rebuild it"""
+    values = series.array
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category', {'codes': values.codes}, series.dtype
+    if isinstance(values, pd.arrays.IntegerArray) or isinstance(values, pd.arrays.BooleanArray):
+        return 'masked', {'data': values._data, 'mask': values._mask}, series.dtype
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+        return 'numpy', {'values': series.to_numpy()}, series.dtype
+    # Text / object columns: Python objects can't be mapped, their codes can
+    column = pd.Categorical(series.to_numpy(dtype=object))
+    return 'category', {'codes': column.codes}, column.dtype
+
+def share_frame(df, name):
+    """
+    Store a DataFrame as one .npy file per array and return an equivalent
+    frame whose columns are read-only memmaps (text -> categorical codes).
+    """
+    shutil.rmtree(_path(name), ignore_errors=True)
+    os.makedirs(_path(name))
+    layout = []
+    for i, column in enumerate(df.columns):
+        kind, arrays, dtype = _column_parts(df[column])
+        for part, array in arrays.items():
+            np.save(_path(name, f'{i}.{part}.npy'), np.ascontiguousarray(array))
+        layout.append((column, kind, list(arrays), dtype))
+    joblib.dump({'index': df.index, 'layout': layout}, _path(name, 'layout.joblib'))
+    return load_frame(name)
+
+def load_frame(name):
+    """Frame written by share_frame, columns memory-mapped read-only"""
+    meta = joblib.load(_path(name, 'layout.joblib'))
+    columns = {}
+    for i, (column, kind, parts, dtype) in enumerate(meta['layout']):
+        arrays = {part: np.load(_path(name, f'{i}.{part}.npy'), mmap_mode='r') for part in parts}
+        if kind == 'category':
+            columns[column] = pd.Categorical.from_codes(arrays['codes'], dtype=dtype, validate=False)
+        elif kind == 'masked':
+            array_type = pd.arrays.BooleanArray if dtype == 'boolean' else pd.arrays.IntegerArray
+            columns[column] = array_type(arrays['data'], arrays['mask'])
+        else:
+            columns[column] = arrays['values']
+    # copy=False keeps one block per column, so nothing is consolidated (copied)
+    return pd.DataFrame(columns, index=meta['index'], copy=False)
+
+def share_model(model, name):
+    """
+    joblib dump + load(mmap_mode='r'): NumPy arrays inside the model become
+    read-only memmaps (estimators that copy arrays on unpickle, e.g. tree
+    node arrays, keep a private copy that is still shared copy-on-write).
+    """
+    path = _path(f'{name}.joblib')
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    joblib.dump(model, path)
+    return joblib.load(path, mmap_mode='r')
+
+def cleanup():
+    """Remove the artifact directory (master shutdown)"""
+    shutil.rmtree(ARTIFACT_DIR, ignore_errors=True)
@@ -0,0 +1,158 @@
+import gc
+import os
+import sqlite3
+import threading
+import time
+from models import db
+import data_loader
+import player_aggregates
+import bulk_import
+from db_pool import reset_pool_stats
+from routes import best_xi
+
+# ==========================================
+# Deferred startup work (tables, aggregates, models, ML dataset)
+# ==========================================
+# Set WARMUP_ON_START=1 under a WSGI server to warm up right after import;
+# `python app.py` always warms up in the background.
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', '0') == '1'
+# After a failed database init, requests wait this long before another try
+DB_RETRY_SECONDS = float(os.getenv('DB_RETRY_SECONDS', 10))
+
+_db_lock = threading.Lock()
+_db_ready = False
+_db_error = None
+_db_failed_at = None   # time.monotonic() of the last failed init
+_db_init_thread = None
+_memory_keeper = None  # Open connection that keeps the in-memory database alive
+
+_warmup_lock = threading.Lock()
+_warmup = {'status': 'idle', 'started_at': None, 'seconds': None, 'error': None}
+
+def init_database(app):
+    """db.create_all() + first aggregate build, once per process. Returns True when done"""
+    global _db_ready, _db_error, _db_failed_at
+    if _db_ready:
+        return True
+    with _db_lock:
+        if not _db_ready:
+            with app.app_context():
+                try:
+                    db.create_all()
+                    print("✓ Database tables created/verified successfully")
+                    if app.config.get('SEED_FROM_CSV'):
+                        seed_memory_database()
+                    player_aggregates.ensure_built()
+                    _db_ready, _db_error, _db_failed_at = True, None, None
+                except Exception as e:
+                    _db_error, _db_failed_at = str(e), time.monotonic()
+                    print(f"✗ Database Error: {e}")
+    return _db_ready
+
+def database_available(app):
+    """
+    Request path: True once the database is initialized. Never runs the
+    DDL in the request; starts init_database on a background thread (one
+    at a time, and only DB_RETRY_SECONDS after a failure) and returns False.
+    """
+    global _db_init_thread
+    if _db_ready:
+        return True
+    with _warmup_lock:
+        running = _db_init_thread is not None and _db_init_thread.is_alive()
+        backing_off = _db_failed_at is not None and time.monotonic() - _db_failed_at < DB_RETRY_SECONDS
+        if not running and not backing_off:
+            _db_init_thread = threading.Thread(target=init_database, args=(app,), name='db-init', daemon=True)
+            _db_init_thread.start()
+    return False
+
+def seed_memory_database():
+    """In-memory profile: keep the database alive and load the bundled CSVs once"""
+    global _memory_keeper
+    if _memory_keeper is None:
+        # The shared-cache database lives only while a connection is open;
+        # pooled connections come and go (engine.dispose()), this one stays
+        url = db.engine.url
+        _memory_keeper = sqlite3.connect(f"{url.database}?mode=memory&cache=shared", uri=True, check_same_thread=False)
+    counts = bulk_import.seed_from_csv()
+    if counts:
+        print(f"✓ In-memory database seeded from CSV: {counts}")
+
+def init_cli_database(app):
+    """CLI commands: a memory-profile process starts empty, create and seed it first"""
+    if app.config.get('SEED_FROM_CSV') and not init_database(app):
+        raise SystemExit(f"✗ Database Error: {_db_error}")
+
+def warm_up(app):
+    """Do every deferred load now instead of on the first requests that need it"""
+    _warmup.update(status='running', started_at=time.time(), error=None)
+    start = time.perf_counter()
+    try:
+        init_database(app)
+        best_xi.ensure_models_loaded()
+        data_loader.ensure_ml_loaded()
+        _warmup['status'] = 'done'
+        print(f"✓ Warm-up finished in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        _warmup.update(status='failed', error=str(e))
+        print(f"✗ Warm-up Error: {e}")
+    _warmup['seconds'] = round(time.perf_counter() - start, 3)
+
+def start_warmup(app):
+    """Run warm_up on a daemon thread (once per process)"""
+    with _warmup_lock:
+        if _warmup['status'] != 'idle':
+            return False
+        _warmup['status'] = 'running'
+    threading.Thread(target=warm_up, args=(app,), name='warmup', daemon=True).start()
+    return True
+
+def readiness():
+    """Load state of every deferred component; ready once the database is initialized"""
+    return {
+        "ready": _db_ready and _warmup['status'] != 'running',
+        "database": {"ready": _db_ready, "error": _db_error},
+        "warmup": dict(_warmup),
+        "best_xi_models": best_xi.models_status(),
+        "ml": data_loader.ml_status()
+    }
+
+# ==========================================
+# Pre-fork serving mode (gunicorn preload_app, see gunicorn.conf.py)
+# ==========================================
+def share_loaded_artifacts():
+    """Swap the loaded ML frame / models for memory-mapped read-only copies"""
+    import shared_artifacts
+    if not data_loader.df_players_ml.empty:
+        data_loader.df_players_ml = shared_artifacts.share_frame(data_loader.df_players_ml, 'players_ml')
+    if data_loader.model is not None:
+        data_loader.model = shared_artifacts.share_model(data_loader.model, 'best_xi_model')
+    if best_xi.odi_model is not None:
+        best_xi.odi_model = shared_artifacts.share_model(best_xi.odi_model, 'odi_model')
+    # The T20 booster lives in native (xgboost) memory, which Python never
+    # writes to, so its pages simply stay shared after fork
+
+def prepare_for_fork(app):
+    """
+    Master process: load everything the routes use synchronously, move it
+    to memory-mapped artifacts and freeze the GC so forked workers share the
+    pages. The raw per-format frames (data_loader.datasets) are not loaded:
+    the routes read the database / aggregates instead.
+    """
+    if app.config.get('DB_PROFILE') == 'memory':
+        # The SQLite memory database (and its connections) cannot be shared
+        # by forked workers; each would be left with a broken copy
+        raise RuntimeError("DB_PROFILE=memory is single-process; use sqlite or mysql with gunicorn")
+    start = time.perf_counter()
+    warm_up(app)
+    share_loaded_artifacts()
+    # Objects created so far never get GC header writes in the workers
+    gc.collect()
+    gc.freeze()
+    print(f"✓ Preloaded for fork in {time.perf_counter() - start:.2f}s ({gc.get_freeze_count()} objects frozen)")
+
+def reset_after_fork(app):
+    """Worker process: drop DB connections inherited from the master"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+    reset_pool_stats()  # Pool metrics are per worker
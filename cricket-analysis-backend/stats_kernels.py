@@ -0,0 +1,66 @@
+import numpy as np
+
+# ==========================================
+# Overs <-> balls
+# ==========================================
+def overs_to_balls(overs):
+    """
+    Convert cricket overs notation to balls (9.3 overs -> 57 balls).
+
+    Works on scalars or arrays; NaN/None count as 0 overs.
+    """
+    overs = np.nan_to_num(np.asarray(overs, dtype=np.float64))
+    whole = np.floor(overs + 1e-9)
+    part = np.rint((overs - whole) * 10)
+    return (whole * 6 + part).astype(np.int64)
+
+def balls_to_overs(balls):
+    """Balls back to overs notation (57 -> 9.3)"""
+    balls = int(balls)
+    return float(f"{balls // 6}.{balls % 6}")
+
+# ==========================================
+# Bowling figures (shared by ODI / T20 / Test)
+# ==========================================
+def summarize_bowling(opposition, innings, balls, wickets, runs, first_id):
+    """
+    Bowling figures from per-group totals (balls already converted).
+
+    Each argument is a sequence with one entry per group; groups for the same
+    opposition are merged. Returns None when there are no groups.
+    """
+    if len(opposition) == 0:
+        return None
+
+    opposition = np.asarray(opposition, dtype=object).astype(str)
+    innings = np.asarray(innings, dtype=np.int64)
+    balls = np.asarray(balls, dtype=np.int64)
+    wickets = np.asarray(wickets, dtype=np.int64)
+    runs = np.asarray(runs, dtype=np.int64)
+    first_id = np.asarray(first_id, dtype=np.int64)
+
+    total_balls = int(balls.sum())
+    total_wickets = int(wickets.sum())
+    total_runs = int(runs.sum())
+
+    # Per-opposition wickets
+    names, inverse = np.unique(opposition, return_inverse=True)
+    opp_wickets = np.bincount(inverse, weights=wickets, minlength=len(names)).astype(np.int64)
+    opp_first = np.full(len(names), np.iinfo(np.int64).max)
+    np.minimum.at(opp_first, inverse, first_id)
+
+    # Most wickets wins; ties go to the opposition met first
+    best = np.lexsort((opp_first, -opp_wickets))[0]
+
+    return {
+        "matches": int(innings.sum()),
+        "wickets": total_wickets,
+        "runsConceded": total_runs,
+        "balls": total_balls,
+        "overs": balls_to_overs(total_balls),
+        "economy": round(total_runs * 6 / total_balls, 2) if total_balls > 0 else 0,
+        "average": round(total_runs / total_wickets, 2) if total_wickets > 0 else 0,
+        "strikeRate": round(total_balls / total_wickets, 2) if total_wickets > 0 else 0,
+        "bestOpposition": str(names[best]),
+        "oppositionWickets": {str(n): int(w) for n, w in zip(names, opp_wickets)}
+    }
@@ -0,0 +1,41 @@
+import threading
+import numpy as np
+
+# ==========================================
+# DMatrix-free T20 inference on reusable float32 buffers
+# ==========================================
+class InplacePredictor:
+    """
+    Booster.inplace_predict over a preallocated C-contiguous float32 matrix.
+
+    Each thread keeps its own buffer per row count (squad size), so
+    concurrent requests neither share scratch memory nor wait on a lock;
+    inplace_predict itself is thread safe for tree boosters.
+    """
+
+    def __init__(self, booster, feature_names, max_buffers=8):
+        self.booster = booster
+        # Column order the booster was trained with, when it recorded one
+        self.feature_names = list(booster.feature_names or feature_names)
+        self.max_buffers = max_buffers
+        self._local = threading.local()
+
+    def _buffer(self, n_rows):
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buffer = buffers.get(n_rows)
+        if buffer is None:
+            # Few distinct squad sizes in practice; start over if a sweep adds many
+            if len(buffers) >= self.max_buffers:
+                buffers.clear()
+            buffer = buffers[n_rows] = np.empty((n_rows, len(self.feature_names)), dtype=np.float32)
+        return buffer
+
+    def predict(self, df):
+        """Predictions for the feature columns of df (float32 array, one per row)"""
+        buffer = self._buffer(len(df))
+        for j, column in enumerate(self.feature_names):
+            # Casts straight into the buffer column, no intermediate frame
+            buffer[:, j] = df[column].to_numpy()
+        return self.booster.inplace_predict(buffer, validate_features=False)
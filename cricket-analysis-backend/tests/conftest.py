@@ -0,0 +1,35 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# A throw-away SQLite database, set before config.py reads the environment
+_DB_DIR = tempfile.mkdtemp(prefix='cricket-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop('DB_PROFILE', None)
+os.environ['WARMUP_ON_START'] = '0'
+os.environ['CSV_CACHE_DIR'] = os.path.join(_DB_DIR, 'csv-cache')
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture(scope='session')
+def app():
+    """The Flask app on the test database, seeded once from the bundled CSVs"""
+    os.chdir(BACKEND_DIR)
+    from app import app as flask_app
+    import bulk_import
+    import startup
+
+    startup.init_database(flask_app)
+    with flask_app.app_context():
+        bulk_import.seed_from_csv()
+    return flask_app
+
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield app
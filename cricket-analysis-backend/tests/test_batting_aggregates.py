@@ -0,0 +1,91 @@
+import pytest
+
+from models import db
+from player_aggregates import FORMATS, apply_record, batting_rows
+
+
+def python_loop(spec, player_name, ground_name):
+    """The batting endpoints before the SQL aggregation: every raw row, summed in Python"""
+    model = spec['model']
+    performances = db.session.query(model).filter(
+        model.player_name == player_name,
+        model.ground == ground_name,
+        getattr(model, spec['runs']) > 0
+    ).order_by(model.id).all()
+    if not performances:
+        return None
+
+    opp_runs = {}
+    for p in performances:
+        opp_runs[p.opposition] = opp_runs.get(p.opposition, 0) + getattr(p, spec['runs'])
+    return {
+        'matches': len(performances),
+        'runs': sum(getattr(p, spec['runs']) for p in performances),
+        'fours': sum(p.fours for p in performances if p.fours),
+        'sixes': sum(p.sixes for p in performances if p.sixes),
+        'sr': sum(getattr(p, spec['sr'], 0) for p in performances) / len(performances),
+        'best': max(opp_runs.items(), key=lambda x: x[1])[0],
+        'chart': sorted(opp_runs.items(), key=lambda x: x[1], reverse=True)
+    }
+
+
+def sql_aggregates(match_type, player_name, ground_name):
+    """The same numbers from batting_rows, as the endpoints compute them"""
+    groups = batting_rows(match_type, player_name, ground_name)
+    if not groups:
+        return None
+    matches = sum(int(g[1]) for g in groups)
+    return {
+        'matches': matches,
+        'runs': sum(int(g[2]) for g in groups),
+        'fours': sum(int(g[3]) for g in groups),
+        'sixes': sum(int(g[4]) for g in groups),
+        'sr': sum(float(g[5]) for g in groups) / matches,
+        'best': groups[0][0],
+        'chart': [(g[0], int(g[2])) for g in groups]
+    }
+
+
+def add_edge_cases(spec):
+    """Not-out innings (with / without runs, missing boundaries) at a new ground"""
+    model = spec['model']
+    template = model.query.filter(getattr(model, spec['runs']) > 0).order_by(model.id).first()
+    values = {c.name: getattr(template, c.name) for c in model.__table__.columns if c.name != 'id'}
+    values.update(ground='Parity Test Oval', dismissal='Not Out', fours=None, sixes=None)
+    rows = [
+        {spec['runs']: 37, spec['sr']: 88.1, 'opposition': 'Kenya'},
+        {spec['runs']: 0, spec['sr']: 0.0, 'opposition': 'Ireland'},          # Not out, no runs: no innings
+        {spec['runs']: 37, spec['sr']: 120.5, 'opposition': 'Ireland', 'fours': 4},  # Ties with Kenya
+    ]
+    for row in rows:
+        record = model(**{**values, **row})
+        db.session.add(record)
+        apply_record(record)
+    db.session.commit()
+    return template.player_name
+
+
+@pytest.mark.parametrize('match_type', list(FORMATS))
+def test_sql_aggregates_match_python_loop(app_context, match_type):
+    spec = FORMATS[match_type]
+    model = spec['model']
+    edge_player = add_edge_cases(spec)
+
+    # Every player/ground, including those with no batting innings at all
+    pairs = db.session.query(model.player_name, model.ground).distinct().all()
+    assert (edge_player, 'Parity Test Oval') in pairs
+    zero_innings = 0
+    for player_name, ground_name in pairs:
+        expected = python_loop(spec, player_name, ground_name)
+        actual = sql_aggregates(match_type, player_name, ground_name)
+        if expected is None:
+            zero_innings += 1
+            assert actual is None, (player_name, ground_name)
+            continue
+        assert actual['sr'] == pytest.approx(expected['sr'])
+        assert {k: v for k, v in actual.items() if k != 'sr'} == {k: v for k, v in expected.items() if k != 'sr'}, \
+            (player_name, ground_name)
+
+    edge = sql_aggregates(match_type, edge_player, 'Parity Test Oval')
+    assert edge['matches'] == 2 and edge['fours'] == 4 and edge['best'] == 'Kenya'
+    assert zero_innings > 0
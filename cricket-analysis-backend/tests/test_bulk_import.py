@@ -0,0 +1,72 @@
+import io
+
+import pandas as pd
+import pytest
+
+import bulk_import
+from models import T20Performance
+
+
+def chunk(rows):
+    header = ['Player Name', 'Opposition', 'Ground', 'Runs_Scored', 'Pos_Bat', 'Dismissal']
+    return pd.DataFrame(rows, columns=header, dtype=str)
+
+
+def test_placeholders_are_null_for_nullable_columns():
+    records, rejections = bulk_import.coerce_chunk(chunk([
+        ['A Player', 'India', 'Galle', '12', '-', '-'],
+        ['A Player', 'India', 'Galle', '', ' ', 'Bowled'],
+    ]), 'T20')
+
+    assert rejections == []
+    assert [r['bat_position'] for r in records] == [None, None]
+    assert [r['runs'] for r in records] == [12, 0]  # Blank takes the column default
+    assert records[0]['dismissal'] is None
+
+
+def test_placeholders_are_rejected_for_required_columns():
+    records, rejections = bulk_import.coerce_chunk(chunk([
+        ['-', 'India', 'Galle', '12', '3', 'Bowled'],
+        ['A Player', ' ', 'Galle', '12', '3', 'Bowled'],
+        ['A Player', 'India', 'Galle', 'twelve', '3', 'Bowled'],
+    ]), 'T20')
+
+    assert records == []
+    assert [(r['row'], r['errors']) for r in rejections] == [
+        (2, ['player_name: required']), (3, ['opposition: required']), (4, ['runs: not a number'])
+    ]
+
+
+def test_fractional_integers_are_rejected():
+    records, rejections = bulk_import.coerce_chunk(chunk([
+        ['A Player', 'India', 'Galle', '12.5', '3', 'Bowled'],
+        ['A Player', 'India', 'Galle', '12.0', '3.7', 'Bowled'],
+    ]), 'T20')
+
+    assert records == []
+    assert [(r['row'], r['errors']) for r in rejections] == [
+        (2, ['runs: not an integer']), (3, ['bat_position: not an integer'])
+    ]
+
+
+def test_bundled_csvs_have_no_rejections(app_context):
+    for match_type, path in bulk_import.BUNDLED_CSVS.items():
+        report = bulk_import.import_file(path, match_type, dry_run=True)
+        assert report['rejected'] == 0, report['rejections']
+
+
+def test_failed_import_does_not_refresh_derived_data(app_context, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(bulk_import, 'refresh_derived', refreshed.append)
+
+    def broken_chunk(*args):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(bulk_import, 'coerce_chunk', broken_chunk)
+    before = T20Performance.query.count()
+
+    source = io.StringIO("Player Name,Opposition,Ground\nA Player,India,Galle\n")
+    with pytest.raises(RuntimeError, match="disk full"):
+        bulk_import.import_file(source, 'T20')
+
+    assert refreshed == []
+    assert T20Performance.query.count() == before
@@ -0,0 +1,25 @@
+from sqlalchemy import func, select
+
+from models import db
+from performance_view import FORMAT_MODELS, relation
+
+
+def test_career_profile_adds_up_across_formats(app_context):
+    perf = relation('TEST')
+    player = db.session.execute(
+        select(perf.c.player_name).group_by(perf.c.player_name).order_by(func.count().desc()).limit(1)
+    ).scalar()
+    profile = app_context.test_client().get('/api/career', query_string={'player': player}).json
+
+    assert set(profile['formats']) <= set(FORMAT_MODELS) and profile['formats']
+    assert profile['combined']['matches'] == sum(p['matches'] for p in profile['formats'].values())
+    for section, figure in (('batting', 'runs'), ('bowling', 'wickets'), ('bowling', 'balls')):
+        assert profile['combined'][section][figure] == sum(p[section][figure] for p in profile['formats'].values())
+    for split in ('byOpposition', 'byGround', 'byPitchType', 'byWeather'):
+        assert sum(s['matches'] for s in profile['combined'][split]) == profile['combined']['matches']
+
+
+def test_career_missing_and_unknown_players(app_context):
+    client = app_context.test_client()
+    assert client.get('/api/career').status_code == 400
+    assert client.get('/api/career', query_string={'player': 'Nobody Known'}).status_code == 404
@@ -0,0 +1,33 @@
+from data_version import get_version
+from routes import home
+
+
+def test_failed_format_is_served_but_not_cached(app_context, monkeypatch):
+    monkeypatch.setattr(home, '_snapshot', {'version': None, 'payload': None, 'etag': None})
+    client = app_context.test_client()
+    compute_stats = home.compute_stats
+
+    def t20_down(match_type):
+        if match_type == 'T20':
+            raise RuntimeError("connection lost")
+        return compute_stats(match_type)
+    monkeypatch.setattr(home, 'compute_stats', t20_down)
+
+    response = client.get('/api/homepage-stats')
+    assert response.status_code == 200 and response.headers.get('ETag') is None
+    assert response.json['T20']['totalRuns'] == 0 and response.json['ODI']['totalRuns'] > 0
+    assert home._snapshot['payload'] is None
+
+    monkeypatch.setattr(home, 'compute_stats', compute_stats)
+    response = client.get('/api/homepage-stats')
+    assert response.headers.get('ETag') and response.json['T20']['totalRuns'] > 0
+    assert home._snapshot['payload'] == response.json
+    assert client.get('/api/homepage-stats', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_rebuild_aggregates_bumps_the_version(app_context):
+    before = get_version()
+    result = app_context.test_cli_runner().invoke(args=['rebuild-aggregates', '--match-type', 'T20'])
+
+    assert result.exit_code == 0, result.output
+    assert get_version() == before + 1
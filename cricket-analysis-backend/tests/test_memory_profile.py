@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import startup
+from conftest import BACKEND_DIR
+
+
+@pytest.mark.parametrize('command', ['check-query-plans', 'check-aggregates'])
+def test_cli_commands_seed_the_memory_database(command):
+    env = {**os.environ, 'DB_PROFILE': 'memory', 'FLASK_APP': 'app.py'}
+    env.pop('DATABASE_URL', None)
+    result = subprocess.run([sys.executable, '-m', 'flask', command], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, timeout=300)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert 'In-memory database seeded from CSV' in result.stdout
+
+
+def test_preload_rejects_the_memory_profile(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'DB_PROFILE', 'memory')
+    with pytest.raises(RuntimeError, match='single-process'):
+        startup.prepare_for_fork(app)
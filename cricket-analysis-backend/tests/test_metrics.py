@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import metrics
+from models import db
+
+
+def select_count():
+    series = metrics.sql_duration._series.get(('SELECT',))
+    return series[-1] if series else 0
+
+
+def test_failed_statements_leave_no_timing_state(app_context):
+    with db.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text('SELECT * FROM no_such_table'))
+            conn.rollback()
+
+        before = select_count()
+        conn.execute(text('SELECT 1'))
+
+        assert select_count() == before + 1
+        assert not any(str(key).startswith('metrics') for key in conn.info)
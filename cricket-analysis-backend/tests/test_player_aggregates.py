@@ -0,0 +1,73 @@
+import pytest
+
+import player_aggregates
+from models import db, PlayerGroundAggregate
+from player_aggregates import FORMATS, apply_record, check_consistency
+
+
+def copy_record(record, **changes):
+    """New raw record with the columns of an existing one"""
+    model = type(record)
+    values = {c.name: getattr(record, c.name) for c in model.__table__.columns if c.name != 'id'}
+    values.update(changes)
+    return model(**values)
+
+
+def add(record):
+    db.session.add(record)
+    apply_record(record)
+    db.session.commit()
+    return record
+
+
+def remove(record):
+    apply_record(record, sign=-1)
+    db.session.delete(record)
+    db.session.commit()
+
+
+@pytest.mark.parametrize('match_type', list(FORMATS))
+def test_add_delete_round_trips_stay_consistent(app_context, match_type):
+    spec = FORMATS[match_type]
+    model = spec['model']
+    runs, wickets = getattr(model, spec['runs']), getattr(model, spec['wickets'])
+    assert check_consistency(match_type) == []
+
+    batter = model.query.filter(runs > 0).order_by(model.id).first()
+    bowler = model.query.filter(wickets > 0).order_by(model.id).first()
+
+    # Existing keys: add copies, then delete the key's first raw records
+    added = [add(copy_record(batter)), add(copy_record(bowler)), add(copy_record(bowler))]
+    assert check_consistency(match_type) == []
+    remove(batter)
+    remove(bowler)
+    assert check_consistency(match_type) == []
+
+    # A new key: first insert, second insert, then back to no row at all
+    new_key = {'opposition': 'Test Opposition XI'}
+    fresh = [add(copy_record(added[0], **new_key)), add(copy_record(added[1], **new_key))]
+    assert check_consistency(match_type) == []
+    for record in fresh:
+        remove(record)
+    assert PlayerGroundAggregate.query.filter_by(match_type=match_type, **new_key).count() == 0
+
+    for record in added:
+        remove(record)
+    add(copy_record(batter))
+    add(copy_record(bowler))
+    assert check_consistency(match_type) == []
+
+
+def test_rebuild_matches_incremental_updates(app_context):
+    assert player_aggregates.rebuild() and check_consistency() == []
+
+
+def test_delete_endpoint(app_context):
+    model = FORMATS['T20']['model']
+    record = add(copy_record(model.query.order_by(model.id).first()))
+    client = app_context.test_client()
+    url = f'/api/dataset/records/{record.id}'
+
+    assert client.delete(url, query_string={'match_type': 'T20'}).status_code == 200
+    assert client.delete(url, query_string={'match_type': 'T20'}).status_code == 404
+    assert check_consistency('T20') == []
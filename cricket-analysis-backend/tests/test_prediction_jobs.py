@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import metrics
+from prediction_jobs import JobManager
+
+
+class BrokenPool:
+    def submit(self, *args):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+class InlinePool:
+    """Runs tasks in the calling thread"""
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def timed_inference(model):
+    with metrics.inference_timer(model):
+        time.sleep(0.001)
+    return model
+
+
+def inference_count(model):
+    series = metrics.inference_latency._series.get((model,))
+    return series[-1] if series else 0
+
+
+def wait_for(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        info = manager.get(job_id)
+        if info['status'] in ('done', 'failed', 'cancelled'):
+            return info
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {info['status']}")
+
+
+def test_broken_pool_fails_the_job_and_keeps_dispatching(monkeypatch):
+    manager = JobManager(workers=1, queue_size=4)
+    # The first pool and its replacement are both broken; the third one works
+    pools = iter([BrokenPool(), BrokenPool(), InlinePool()])
+
+    def get_executor():
+        if manager._executor is None:
+            manager._executor = next(pools)
+        return manager._executor
+    monkeypatch.setattr(manager, '_get_executor', get_executor)
+
+    failed = wait_for(manager, manager.submit('test', sum, [1, 2]))
+    assert failed['status'] == 'failed' and 'worker died' in failed['error']
+
+    # The dispatcher survived and the freed slot is usable
+    done = wait_for(manager, manager.submit('test', sum, [1, 2]))
+    assert done['status'] == 'done' and done['result'] == 3
+    assert manager.stats()['failed'] == 1 and manager.stats()['running'] == 0
+
+
+def test_fork_start_method_is_rejected():
+    with pytest.raises(ValueError):
+        JobManager(start_method='fork')
+
+
+def test_job_inference_is_recorded_by_the_manager(monkeypatch):
+    manager = JobManager(workers=1, queue_size=4)
+    monkeypatch.setattr(manager, '_get_executor', InlinePool)
+    before = inference_count('job-test')
+
+    done = wait_for(manager, manager.submit('test', timed_inference, 'job-test'))
+
+    assert done['status'] == 'done' and done['result'] == 'job-test'
+    # Once, from the returned timings (a real worker's own histogram is never scraped)
+    assert inference_count('job-test') == before + 1
@@ -0,0 +1,44 @@
+from sqlalchemy import func, select, union_all
+
+from models import T20Performance
+from performance_view import FORMAT_MODELS, format_select
+from player_aggregates import FORMATS
+from query_plans import ALLOWED_FULL_SCANS, check_query_plans, ensure_indexes, explain, full_scans
+
+
+def test_endpoint_queries_use_indexes(app_context):
+    results = check_query_plans()
+
+    assert {r['match_type'] for r in results} == set(FORMATS)
+    assert all(r['plan'] for r in results)
+    unexpected = [(r['match_type'], r['query'], r['full_scans']) for r in results if r['full_scans'] and not r['allowed']]
+    assert unexpected == []
+    # Only allow-listed queries may scan, and the allow-list has no dead entries
+    assert {r['query'] for r in results if r['allowed']} == set(ALLOWED_FULL_SCANS)
+
+
+def test_table_scan_is_flagged(app_context):
+    # No index on notes: the check must flag it, or the test above proves nothing
+    plan = explain(select(T20Performance.id).where(T20Performance.notes == 'x'))
+    assert full_scans(plan)
+
+
+def test_non_covering_index_scan_is_flagged(app_context):
+    # Every row in index order, then a lookup per row for the other columns
+    plan = explain(select(T20Performance).order_by(T20Performance.date, T20Performance.id))
+    assert any('USING INDEX' in row and 'COVERING' not in row for row in plan)
+    assert full_scans(plan)
+
+
+def test_searches_and_subquery_scans_pass(app_context):
+    by_player = explain(select(T20Performance.id).where(T20Performance.player_name == 'x'))
+    perf = union_all(*[format_select(m) for m in FORMAT_MODELS]).subquery('performance_all')
+    per_format = explain(select(perf.c.match_type, func.count())
+                         .where(perf.c.player_name == 'x').group_by(perf.c.match_type))
+
+    assert full_scans(by_player) == []
+    assert full_scans(per_format) == []
+
+
+def test_declared_indexes_exist(app_context):
+    assert ensure_indexes() == []
@@ -0,0 +1,38 @@
+import time
+
+import startup
+
+
+def database_down(monkeypatch, failed_at):
+    """startup state after a failed init; monkeypatch restores the real state afterwards"""
+    attempts = []
+    monkeypatch.setattr(startup, '_db_ready', False)
+    monkeypatch.setattr(startup, '_db_error', 'connection refused')
+    monkeypatch.setattr(startup, '_db_failed_at', failed_at)
+    monkeypatch.setattr(startup, '_db_init_thread', None)
+    monkeypatch.setattr(startup, 'init_database', attempts.append)
+    return attempts
+
+
+def test_requests_get_503_without_retrying_inside_the_backoff(app, monkeypatch):
+    attempts = database_down(monkeypatch, failed_at=time.monotonic())
+    client = app.test_client()
+
+    responses = [client.get('/api/career', query_string={'player': 'x'}) for _ in range(5)]
+
+    assert [r.status_code for r in responses] == [503] * 5
+    assert responses[0].json['database'] == {'ready': False, 'error': 'connection refused'}
+    assert responses[0].headers['Retry-After'] == str(int(startup.DB_RETRY_SECONDS))
+    assert attempts == []
+    # Health probes still answer
+    assert client.get('/api/health/ready').json['ready'] is False
+
+
+def test_one_background_retry_after_the_backoff(app, monkeypatch):
+    attempts = database_down(monkeypatch, failed_at=time.monotonic() - startup.DB_RETRY_SECONDS - 1)
+    client = app.test_client()
+
+    assert client.get('/api/career', query_string={'player': 'x'}).status_code == 503
+    startup._db_init_thread.join(timeout=5)
+
+    assert attempts == [app]
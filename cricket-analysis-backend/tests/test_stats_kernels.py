@@ -0,0 +1,65 @@
+import pytest
+
+from models import db
+from player_aggregates import FORMATS
+from stats_kernels import balls_to_overs, overs_to_balls, summarize_bowling
+
+
+def test_overs_and_balls_round_trip():
+    assert overs_to_balls(9.3) == 57 and overs_to_balls(None) == 0
+    assert list(overs_to_balls([0.1, 4.0, 10.5])) == [1, 24, 65]
+    assert balls_to_overs(57) == 9.3 and balls_to_overs(overs_to_balls(49.5)) == 49.5
+
+
+def test_summarize_bowling_merges_groups_and_breaks_ties_by_first_meeting():
+    summary = summarize_bowling(
+        ['India', 'Kenya', 'India', 'Kenya'],  # Two groups per opposition (different overs)
+        [1, 1, 2, 1], [60, 24, 117, 30], [2, 3, 1, 0], [40, 20, 70, 15], [9, 4, 12, 5]
+    )
+    assert summary['matches'] == 5 and summary['wickets'] == 6 and summary['balls'] == 231
+    assert summary['overs'] == 38.3 and summary['economy'] == round(145 * 6 / 231, 2)
+    assert summary['oppositionWickets'] == {'India': 3, 'Kenya': 3}
+    assert summary['bestOpposition'] == 'Kenya'  # Tied on wickets, met first (id 4)
+    assert summarize_bowling([], [], [], [], [], []) is None
+
+
+def raw_bowling(spec, player_name, ground_name):
+    """/api/bowling/player-ground-stats computed from every raw row"""
+    model = spec['model']
+    wickets_col = spec['wickets']
+    records = db.session.query(model).filter(
+        model.player_name == player_name, model.ground == ground_name, getattr(model, wickets_col) > 0
+    ).order_by(model.id).all()
+    if not records:
+        return None
+    balls = sum(int(overs_to_balls(r.overs or 0.0)) for r in records)
+    wickets = sum(getattr(r, wickets_col) for r in records)
+    runs = sum(r.runs_conceded or 0 for r in records)
+    by_opposition = {}
+    for r in records:
+        by_opposition[r.opposition] = by_opposition.get(r.opposition, 0) + getattr(r, wickets_col)
+    return {
+        'matches': len(records), 'wickets': wickets, 'runsConceded': runs, 'balls': balls,
+        'economy': round(runs * 6 / balls, 2) if balls > 0 else 0,
+        'bestOpposition': max(by_opposition.items(), key=lambda x: x[1])[0],  # First max = met first
+        'oppositionWickets': by_opposition
+    }
+
+
+@pytest.mark.parametrize('match_type', list(FORMATS))
+def test_bowling_endpoint_matches_raw_rows(app_context, match_type):
+    spec = FORMATS[match_type]
+    model = spec['model']
+    client = app_context.test_client()
+    pairs = db.session.query(model.player_name, model.ground).filter(
+        getattr(model, spec['wickets']) > 0
+    ).distinct().limit(150).all()
+
+    for player_name, ground_name in pairs:
+        expected = raw_bowling(spec, player_name, ground_name)
+        response = client.get('/api/bowling/player-ground-stats', query_string={
+            'player': player_name, 'ground': ground_name, 'matchType': match_type
+        })
+        assert response.status_code == 200
+        actual = {key: response.json[key] for key in expected}
+        assert actual == expected, (player_name, ground_name)
@@ -0,0 +1,166 @@
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from xi_solver import BOWLING_ROLES, solve_xi
+
+ROLES = ['Wicket Keeper', 'Batsman', 'Allrounder', 'Bowler']
+TEAM_SIZE = 5  # Small teams keep the exhaustive search fast
+
+
+def brute_force(scores, roles, composition, team_size, min_bowling, required=(), excluded=()):
+    """Every valid team total, best first"""
+    totals = []
+    for team in itertools.combinations(range(len(scores)), team_size):
+        chosen = set(team)
+        if not set(required) <= chosen or chosen & set(excluded):
+            continue
+        counts = {role: sum(roles[i] == role for i in team) for role in ROLES}
+        if any(not lo <= counts[role] <= hi for role, (lo, hi) in composition.items()):
+            continue
+        if sum(roles[i] in BOWLING_ROLES for i in team) < min_bowling:
+            continue
+        totals.append(float(scores[list(team)].sum()))
+    return sorted(totals, reverse=True)
+
+
+def random_case(seed):
+    rng = np.random.default_rng(seed)
+    n_players = int(rng.integers(8, 12))
+    roles = np.array(rng.choice(ROLES, n_players), dtype=object)
+    # Rounded scores produce ties, which the top-K search must handle
+    scores = np.round(rng.random(n_players) * 20, 0)
+    composition = {}
+    for role in ROLES:
+        lo = int(rng.integers(0, 2))
+        composition[role] = (lo, lo + int(rng.integers(0, 4)))
+    min_bowling = int(rng.integers(0, 3))
+    return rng, scores, roles, composition, min_bowling
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_top_k_matches_brute_force(seed):
+    rng, scores, roles, composition, min_bowling = random_case(seed)
+    expected = brute_force(scores, roles, composition, TEAM_SIZE, min_bowling)
+
+    solutions = solve_xi(scores, roles, composition, team_size=TEAM_SIZE,
+                         min_bowling_options=min_bowling, top_k=5)
+
+    assert [round(total, 6) for total, _ in solutions] == [round(t, 6) for t in expected[:5]]
+    for total, indices in solutions:
+        assert len(set(indices)) == TEAM_SIZE
+        assert total == pytest.approx(scores[list(indices)].sum())
+    assert len({frozenset(indices) for _, indices in solutions}) == len(solutions)
+
+
+@pytest.mark.parametrize('seed', range(40, 70))
+def test_required_and_excluded_match_brute_force(seed):
+    rng, scores, roles, composition, min_bowling = random_case(seed)
+    players = rng.permutation(len(scores))
+    required, excluded = players[:2].tolist(), players[2:4].tolist()
+    expected = brute_force(scores, roles, composition, TEAM_SIZE, min_bowling, required, excluded)
+
+    solutions = solve_xi(scores, roles, composition, team_size=TEAM_SIZE, min_bowling_options=min_bowling,
+                         required=required, excluded=excluded, top_k=3)
+
+    assert [round(total, 6) for total, _ in solutions] == [round(t, 6) for t in expected[:3]]
+    for _, indices in solutions:
+        assert set(required) <= set(indices)
+        assert not set(excluded) & set(indices)
+
+
+# ------------------------------------------------------------------
+# solve_with_fallback (the composition the API uses, full-size XIs)
+# ------------------------------------------------------------------
+@pytest.fixture
+def squad():
+    """1 keeper, 10 batsmen, 10 bowlers, 5 allrounders"""
+    roles = np.array(['Wicket Keeper'] + ['Batsman'] * 10 + ['Bowler'] * 10 + ['Allrounder'] * 5, dtype=object)
+    scores = np.random.default_rng(0).random(len(roles)) * 100
+    return scores, roles
+
+
+def odi_composition():
+    from routes.best_xi import get_composition
+    return get_composition('Balanced', 'ODI')
+
+
+def test_fallback_without_the_only_keeper_picks_eleven(squad):
+    from routes.best_xi import solve_with_fallback
+    scores, roles = squad
+
+    (total, indices), = solve_with_fallback(scores, roles, odi_composition(), 5, excluded=[0])
+
+    assert len(indices) == 11 and 0 not in indices
+    assert sum(roles[i] in BOWLING_ROLES for i in indices) >= 5
+
+
+def test_fallback_with_required_overflow_picks_eleven(squad):
+    from routes.best_xi import solve_with_fallback
+    scores, roles = squad
+    required = list(range(1, 7))  # Six batsmen, the composition allows four
+
+    (total, indices), = solve_with_fallback(scores, roles, odi_composition(), 5, required=required)
+
+    assert len(indices) == 11 and set(required) <= set(indices)
+    assert sum(roles[i] in BOWLING_ROLES for i in indices) >= 5
+
+
+def test_fallback_rejects_squads_that_cannot_make_an_xi(squad):
+    from routes.best_xi import solve_with_fallback
+    scores, roles = squad
+
+    with pytest.raises(ValueError):
+        solve_with_fallback(scores[:9], roles[:9], odi_composition(), 5)
+    with pytest.raises(ValueError):
+        solve_with_fallback(scores, roles, odi_composition(), 5, excluded=range(16))
+    with pytest.raises(ValueError):
+        solve_with_fallback(scores, roles, odi_composition(), 5, required=range(12))
+
+
+def test_sweep_selection_pool_matches_inline(monkeypatch, squad):
+    import pandas as pd
+    from routes import best_xi
+    scores, roles = squad
+    scenarios = [(pitch, 'Sunny', 'India') for pitch in ('Flat', 'Green', 'Dusty', 'Bouncy')] * 3
+    rng = np.random.default_rng(1)
+    monkeypatch.setattr(best_xi, 'score_scenarios', lambda df, m, s: rng.random((len(s), len(roles))) * 100)
+    df_players = pd.DataFrame({'Player_Name': [f'P{i}' for i in range(len(roles))], 'Role': roles})
+
+    monkeypatch.setattr(best_xi, 'SWEEP_WORKERS', 2)
+    rng = np.random.default_rng(1)
+    _, _, pooled = best_xi.sweep_players(df_players, 'ODI', scenarios, workers=64)
+    rng = np.random.default_rng(1)
+    _, _, inline = best_xi.sweep_players(df_players, 'ODI', scenarios, workers=0)
+    best_xi.shutdown_selection_pool()
+
+    assert [r[4] for r in pooled] == [r[4] for r in inline]
+    assert all(len(r[4]) == 11 for r in pooled)
+
+
+def test_streamed_sweep_yields_each_scenario_as_it_is_picked(app_context, monkeypatch):
+    from routes import best_xi
+    scored = []
+    real_score = best_xi.score_scenarios
+
+    def score(df, match_type, scenarios):
+        scored.extend(scenarios)
+        return real_score(df, match_type, scenarios)
+    monkeypatch.setattr(best_xi, 'score_scenarios', score)
+    monkeypatch.setattr(best_xi, 'SWEEP_SCORE_BATCH', 2)
+    body = {'match_type': 'TEST', 'pitch_types': ['Green', 'Dusty'], 'weathers': ['Sunny', 'Cloudy'],
+            'oppositions': ['India']}
+    client = app_context.test_client()
+
+    response = client.post('/api/predict-team/sweep', json={**body, 'stream': True}, buffered=False)
+    lines = iter(response.response)
+    header, first = json.loads(next(lines)), json.loads(next(lines))
+
+    assert header['scenario_count'] == 4 and len(first['team']) == 11
+    assert len(scored) == 2  # Only the first batch is scored so far
+    streamed = [first] + [json.loads(line) for line in lines]
+    response.close()
+
+    assert streamed == client.post('/api/predict-team/sweep', json=body).json['scenarios']
@@ -0,0 +1,142 @@
+import heapq
+import numpy as np
+
+# ==========================================
+# Optimal XI under role-composition constraints
+# ==========================================
+TEAM_SIZE = 11
+BOWLING_ROLES = ('Allrounder', 'Bowler')
+
+def _normalize_ranges(composition, role_names, team_size):
+    """{role: count | (min, max)} -> [(min, max)] aligned with role_names"""
+    ranges = []
+    for role in role_names:
+        limits = composition.get(role, (0, team_size))
+        if isinstance(limits, (int, np.integer)):
+            limits = (limits, limits)
+        ranges.append((int(limits[0]), int(min(limits[1], team_size))))
+    return ranges
+
+class XISolver:
+    """
+    Exact best-XI solver on plain arrays.
+
+    For a fixed number of players per role the best choice is simply the top
+    scorers of each role, so the search runs over per-role counts with a
+    small DP (team size x bowling options). Required/excluded players are
+    handled by fixing them in or out; top-K alternatives come from Lawler's
+    partitioning, each branch solved exactly with the same DP.
+    """
+
+    def __init__(self, scores, roles, composition, team_size=TEAM_SIZE,
+                 min_bowling_options=0, bowling_roles=BOWLING_ROLES):
+        self.scores = np.asarray(scores, dtype=np.float64)
+        roles = np.asarray(roles, dtype=object)
+        self.team_size = team_size
+        self.min_bowling = max(0, int(min_bowling_options))
+
+        # Roles in composition order first, then any other role seen in the squad
+        self.role_names = list(composition) + sorted({str(r) for r in roles} - set(composition))
+        self.ranges = _normalize_ranges(composition, self.role_names, team_size)
+        self.is_bowling = [role in bowling_roles for role in self.role_names]
+
+        # Player indices per role, best score first (ties -> lower index)
+        order = np.lexsort((np.arange(len(self.scores)), -self.scores))
+        role_of = {role: i for i, role in enumerate(self.role_names)}
+        self.by_role = [[] for _ in self.role_names]
+        for idx in order:
+            self.by_role[role_of[str(roles[idx])]].append(int(idx))
+
+    def _solve(self, fixed_in, fixed_out):
+        """Best (score, indices) with fixed_in forced and fixed_out banned, or None"""
+        scores = self.scores
+        cap = self.min_bowling
+        dp = {(0, 0): (0.0, ())}
+
+        for r, members in enumerate(self.by_role):
+            forced = [i for i in members if i in fixed_in]
+            free = [i for i in members if i not in fixed_in and i not in fixed_out]
+            lo = max(self.ranges[r][0], len(forced))
+            hi = min(self.ranges[r][1], len(forced) + len(free))
+            if lo > hi:
+                return None
+
+            base = float(scores[forced].sum()) if forced else 0.0
+            prefix = np.concatenate(([0.0], np.cumsum(scores[free]))) if free else np.zeros(1)
+            bowling = self.is_bowling[r]
+
+            next_dp = {}
+            for (count, bowl), (value, choice) in dp.items():
+                for k in range(lo, min(hi, self.team_size - count) + 1):
+                    key = (count + k, min(cap, bowl + k) if bowling else bowl)
+                    total = value + base + prefix[k - len(forced)]
+                    if key not in next_dp or total > next_dp[key][0]:
+                        next_dp[key] = (total, choice + (k,))
+            dp = next_dp
+            if not dp:
+                return None
+
+        best = dp.get((self.team_size, cap))
+        if best is None:
+            return None
+
+        total, counts = best
+        selected = []
+        for members, k in zip(self.by_role, counts):
+            forced = [i for i in members if i in fixed_in]
+            free = [i for i in members if i not in fixed_in and i not in fixed_out]
+            selected.extend(forced + free[:k - len(forced)])
+        return total, tuple(selected)
+
+    def solve(self, required=(), excluded=(), top_k=1):
+        """
+        Up to top_k best XIs, best first, as (total_score, indices) tuples.
+
+        Indices are grouped by role in composition order, best score first
+        within a role. Returns [] when no XI satisfies the constraints.
+        """
+        required = frozenset(int(i) for i in required)
+        excluded = frozenset(int(i) for i in excluded) - required
+        first = self._solve(required, excluded)
+        if first is None:
+            return []
+
+        tie = 0
+        heap = [(-first[0], tie, first[1], required, excluded)]
+        results = []
+        while heap and len(results) < top_k:
+            neg_total, _, selected, fixed_in, fixed_out = heapq.heappop(heap)
+            results.append((-neg_total, selected))
+            if len(results) == top_k:
+                break
+
+            # Lawler partition: branch j keeps the first j free picks, bans pick j
+            free_picks = [i for i in selected if i not in fixed_in]
+            for j, banned in enumerate(free_picks):
+                branch_in = fixed_in | frozenset(free_picks[:j])
+                branch_out = fixed_out | {banned}
+                solution = self._solve(branch_in, branch_out)
+                if solution is not None:
+                    tie += 1
+                    heapq.heappush(heap, (-solution[0], tie, solution[1], branch_in, branch_out))
+        return results
+
+def solve_xi(scores, roles, composition, team_size=TEAM_SIZE, min_bowling_options=0,
+             bowling_roles=BOWLING_ROLES, required=(), excluded=(), top_k=1):
+    """
+    Maximize total predicted score of an XI under role constraints.
+
+    Args:
+        scores: Array of predicted scores, one per player
+        roles: Array of role labels, one per player
+        composition: {role: count} or {role: (min, max)}; roles not listed may
+            fill 0..team_size spots
+        min_bowling_options: Minimum number of players from bowling_roles
+        required / excluded: Player indices that must / must not be picked
+        top_k: Number of alternative XIs to return
+
+    Returns:
+        List of (total_score, indices) tuples, best first ([] if infeasible)
+    """
+    solver = XISolver(scores, roles, composition, team_size, min_bowling_options, bowling_roles)
+    return solver.solve(required, excluded, top_k)